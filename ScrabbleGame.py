@@ -1,6 +1,9 @@
 import csv
-import copy
 import json
+from board_layout import BoardLayout
+from compact_board import CompactBoard, CompactLayout
+from cross_scores import CrossScoreTable
+from tile_bag import TileBag
 
 
 class ScrabbleGame:
@@ -18,6 +21,11 @@ class ScrabbleGame:
         self.tileCounts = None
         self.tileBag = None
         self.emptyBoard = None
+        # dimensions, premium squares and starting square compiled from the empty board
+        self.boardLayout = None
+        
+        # compiled arrays for compact boards, built on first use from the data above
+        self.compactLayout = None
         
         self.FAILURE_MESSAGE = "No solution found. My bad"
 
@@ -34,15 +42,28 @@ class ScrabbleGame:
             self.moveScores = list(map(int, file.read().split()))
             
     def setEmptyBoard(self, boardFile: str = "board.csv") -> None:
-        """Reads the empty board from a CSV file and stores the board layout as a 2D list.
+        """Reads the empty board from a CSV file and stores the board layout as a 2D list, along with its compiled
+        dimensions, premium squares and starting square (see BoardLayout).
 
         Args:
             boardFile (str, optional): CSV file containing empty board layout. Defaults to "board.csv".
         """
         with open(boardFile, newline="", encoding='utf-8-sig') as csvfile:
             reader = csv.reader(csvfile)
-            self.emptyBoard = [row for row in reader]
-            self.currentBoard = copy.deepcopy(self.emptyBoard)
+            self.setEmptyBoardData([row for row in reader])
+
+    def setEmptyBoardData(self, emptyBoard: list[list[str]], boardLayout: BoardLayout = None) -> None:
+        """Sets an empty board layout already read, with its compiled layout, and resets the current board to it.
+
+        Args:
+            emptyBoard (list[list[str]]): 2d list of the empty board layout.
+            boardLayout (BoardLayout, optional): Layout already compiled from the empty board (e.g. shared by the
+                games of a packed corpus). Defaults to None (compiled here).
+        """
+        self.emptyBoard = emptyBoard
+        self.currentBoard = [row[:] for row in emptyBoard]
+        self.boardLayout = boardLayout or BoardLayout(emptyBoard)
+        self.compactLayout = None
             
     def setCompletedGame(self, gameFile: str = "Game1.csv") -> None:
         """Reads the completed game from a CSV file and stores it as a 2D list.
@@ -53,6 +74,7 @@ class ScrabbleGame:
         with open(gameFile, newline="", encoding='utf-8-sig') as csvfile:
             reader = csv.reader(csvfile)
             self.completedGame = [row for row in reader]
+        self.compactLayout = None
             
     def setTileInfo(self, tileFile: str = 'tileInfo.json') -> None:
         """Reads tile information from a JSON file and initializes tile values, counts, and the tile bag contents.
@@ -64,22 +86,46 @@ class ScrabbleGame:
         with open(tileFile, "r", encoding='utf-8') as file:
             tileInfo: dict[str, dict[str, int]] = json.load(file)   
         
+        self.setTileInfoData(tileInfo)
+    
+    def setTileInfoData(self, tileInfo: dict[str, dict[str, int]]) -> None:
+        """Initializes tile values, counts, and the tile bag contents from tile information already read.
+
+        Args:
+            tileInfo (dict[str, dict[str, int]]): Dictionary mapping each tile to a dict with "value" and "count" keys.
+        """
         self.tileValues = {letter: data["value"] for letter, data in tileInfo.items()}
         self.tileCounts = {letter: data["count"] for letter, data in tileInfo.items()}
 
         self.tileBag = [letter for letter, value in self.tileCounts.items() for _ in range(value)]
+        self.compactLayout = None
       
     
+    def setGameData(self, moveScores: list[int], completedGame: list[list[str]]) -> None:
+        """Sets the scores and completed board of a game already read (e.g. from a packed corpus), and resets the
+        current board to the empty board.
+
+        Args:
+            moveScores (list[int]): Score of each move.
+            completedGame (list[list[str]]): 2d list of the completed board.
+        """
+        self.moveScores = moveScores
+        self.completedGame = completedGame
+        self.currentBoard = [row[:] for row in self.emptyBoard]
+        self.compactLayout = None
+    
     def setBoardAndScores(self, scoresFile: str, tileFile: str, boardFile: str, gameFile: str = None) -> None:
         """Creates list of scores, empty board, completed game, tile values, tile counts, and tile bag from files.
 
         Args:
-            scoresFile (str): TXT file containing scores for each move.
+            scoresFile (str): TXT file containing scores for each move. If None, only the layout and tile info are read,
+                and a game can be loaded later.
             tileFile (str): JSON file containing tile values and counts.
             boardFile (str): CSV file containing the empty board layout.
             gameFile (str, optional): CSV file containing the completed board. Defaults to None.
         """
-        self.setScores(scoresFile)
+        if scoresFile:
+            self.setScores(scoresFile)
         self.setEmptyBoard(boardFile)
         
         if gameFile:
@@ -96,36 +142,135 @@ class ScrabbleGame:
         if not self.tileBag:
             return None
         
-        # create a copy of the tile bag
-        tileBag = copy.deepcopy(self.tileBag)
+        return self.getRemainingBag().toList()
+    
+    def getRemainingBag(self, board: list[list[str]] = None) -> TileBag:
+        """Counts the tiles not yet placed on the board, as a TileBag that can be updated as moves are applied and undone.
+
+        Args:
+            board (list[list[str]], optional): board whose placed tiles are removed from the bag. Defaults to the current board.
+
+        Returns:
+            TileBag: Counts of the tiles left, starting from the original tile counts.
+        """
+        if board is None:
+            board = self.currentBoard
         
+        tileBag = TileBag(self.tileCounts, self.tileValues)
         # remove tiles that are already placed on the board
-        for row in self.currentBoard:  
-            for tile in row:
-                if self.isTile(tile) and tile in tileBag:
-                    tileBag.remove(tile)
-                    
+        tileBag.removeTiles(tile for row in board for tile in row if self.isTile(tile))
         return tileBag
         
-    def countPlay(self, startPair: tuple, endPair: tuple, board: list[list[str]] = None, returnTilesPlayed: bool = False, returnBoard: bool = False):
+    def countPlay(self, startPair: tuple, endPair: tuple, board: list[list[str]] = None, returnTilesPlayed: bool = False, returnBoard: bool = False,
+                  crossScores: CrossScoreTable = None):
         """
-        Counts the score of a play given the start and end coordinates of the move,
-        the current board state, and the tile values.
+        Counts the score of a play given the start and end coordinates of the move and the board state.
+        If no board is given, the play is applied to the current board. If a board is given, it is left
+        unchanged, and a copy with the play applied is returned if returnBoard is True.
         
         Args:
             startPair (tuple): starting coordinates (x, y)
             endPair (tuple): ending coordinates (x, y)
-            currentBoard (list): current state of the board
-            tileValues (dict): dictionary mapping tile characters to their values
+            board (list[list[str]], optional): board to score the play on. Defaults to the current board.
+            returnTilesPlayed (bool, optional): also return the coordinates of the tiles placed. Defaults to False.
+            returnBoard (bool, optional): also return the board with the play applied. Defaults to False.
+            crossScores (CrossScoreTable, optional): cross-word scores of the board to read instead of walking it.
+                Only used when the play is scored on the given board without being applied. Defaults to None.
             
         Returns:
-            tuple: total score for the play and the updated board state TODO fix
+            int | tuple: score of the play (-1 if invalid), paired with the tiles placed or the
+            updated board if requested
         """
-        
         if board is None:
+            moveScore, tilesUsedList = self.applyMove(startPair, endPair)
             board = self.currentBoard
+        elif returnBoard:
+            board = [row[:] for row in board]
+            moveScore, tilesUsedList = self.applyMove(startPair, endPair, board)
         else:
-            board = copy.deepcopy(board)
+            moveScore, tilesUsedList = self.scorePlay(startPair, endPair, board, True, crossScores)
+        
+        if returnTilesPlayed:
+            return moveScore, tilesUsedList
+        if moveScore < 0:
+            return -1
+        if returnBoard:
+            return moveScore, board
+        return moveScore
+    
+    def applyMove(self, startPair: tuple, endPair: tuple, board: list[list[str]] = None, tileBag: TileBag = None,
+                  crossScores: CrossScoreTable = None) -> tuple[int, list[tuple]]:
+        """
+        Plays a move in place, placing the tiles of the completed game on the empty squares between the start
+        and end coordinates. The move can be reverted exactly with undoMove. Invalid moves leave the board unchanged.
+
+        Args:
+            startPair (tuple): starting coordinates (x, y)
+            endPair (tuple): ending coordinates (x, y)
+            board (list[list[str]], optional): board to play the move on. Defaults to the current board.
+            tileBag (TileBag, optional): bag of the tiles left for the board, updated with the tiles placed. Defaults to None.
+            crossScores (CrossScoreTable, optional): cross-word scores of the board, used to score the move and then
+                updated with the tiles placed. Defaults to None.
+
+        Returns:
+            tuple[int, list[tuple]]: score of the move (-1 if invalid) and the coordinates of the tiles placed
+        """
+        if board is None:
+            board = self.currentBoard
+        
+        moveScore, tilesUsedList = self.scorePlay(startPair, endPair, board, True, crossScores)
+        if moveScore < 0:
+            return -1, []
+        
+        for coords in tilesUsedList:
+            board[coords[0]][coords[1]] = self.completedGame[coords[0]][coords[1]]
+            if tileBag is not None:
+                tileBag.remove(board[coords[0]][coords[1]])
+        if crossScores is not None:
+            crossScores.update(tilesUsedList)
+        return moveScore, tilesUsedList
+    
+    def undoMove(self, tilesPlayed: list[tuple], board: list[list[str]] = None, tileBag: TileBag = None,
+                 crossScores: CrossScoreTable = None) -> None:
+        """
+        Reverts a move played with applyMove by restoring the empty board squares under the tiles it placed.
+
+        Args:
+            tilesPlayed (list[tuple]): coordinates of the tiles placed by the move
+            board (list[list[str]], optional): board the move was played on. Defaults to the current board.
+            tileBag (TileBag, optional): bag the move's tiles were removed from, which they are returned to. Defaults to None.
+            crossScores (CrossScoreTable, optional): cross-word scores of the board, updated with the tiles taken back.
+                Defaults to None.
+        """
+        if board is None:
+            board = self.currentBoard
+        
+        for coords in tilesPlayed:
+            if tileBag is not None:
+                tileBag.add(board[coords[0]][coords[1]])
+            board[coords[0]][coords[1]] = self.emptyBoard[coords[0]][coords[1]]
+        if crossScores is not None:
+            crossScores.update(tilesPlayed)
+    
+    def scorePlay(self, startPair: tuple, endPair: tuple, board: list[list[str]] = None, returnTilesPlayed: bool = False,
+                  crossScores: CrossScoreTable = None):
+        """
+        Scores a play without changing or copying the board. Tiles are taken from the completed game. Given the
+        cross-word scores of the board, the cross word of each new tile is read from them instead of counted.
+
+        Args:
+            startPair (tuple): starting coordinates (x, y)
+            endPair (tuple): ending coordinates (x, y)
+            board (list[list[str]], optional): board to score the play on. Defaults to the current board.
+            returnTilesPlayed (bool, optional): also return the coordinates of the tiles placed. Defaults to False.
+            crossScores (CrossScoreTable, optional): cross-word scores kept in step with the board. Defaults to None.
+
+        Returns:
+            int | tuple[int, list[tuple]]: score of the play (-1 if invalid), paired with the tiles placed if requested
+        """
+        if board is None:
+            board = self.currentBoard
+        layout = self.boardLayout
         
         # start scores at 0, tiles at 0, and multiplier at 1
         score = 0
@@ -136,11 +281,11 @@ class ScrabbleGame:
         
         # converts coordinates with vertical boolean (true for vertical, false for horizontal)
         vert, basis, start, end = self.coordsToVertBoolAndCoords(startPair, endPair)
+        # last row or column on the other axis, past which there are no squares beside the play
+        crossLimit = (layout.width if vert else layout.height) - 1
         
         # loop through each tile played
         for i in range(start, end+1):
-            # temp multiplier resets for each tile, so is used for letter scores or intersecting words
-            tempMultiplier = 1
             # sets current tile coordinates and gets tile from board
             coords = (i, basis) if vert else (basis, i)
             tile = board[coords[0]][coords[1]]
@@ -153,39 +298,36 @@ class ScrabbleGame:
             # tile is placed, so one more tile used, and need to check for intersections
             tilesUsed += 1
             tilesUsedList.append(coords)
-            adjacency1 = ((i, basis-1) if vert else (basis-1, i)) if basis > 0 else None
-            adjacency2 = ((i, basis+1) if vert else (basis+1, i)) if basis < 14 else None
             
-            # check for modifiers at placed tile (should be applied to current word and intersections)
-            mod = board[coords[0]][coords[1]]
             newTile = self.completedGame[coords[0]][coords[1]]
             
             if not self.isTile(newTile):
                 # if it is not a tile, it is an invalid move
                 return (-1, []) if returnTilesPlayed else -1
             
-            value = self.tileValues[newTile]
-            if 'd' in mod:
-                value *= 2
-            elif 't' in mod:
-                value *= 3
-            elif 's' in mod or '2' in mod:
-                tempMultiplier = 2
-            elif '3' in mod:
-                tempMultiplier = 3
+            # modifiers at the placed tile, applied to the current word and intersections: the letter multiplier to the
+            # tile, and the word multiplier (temp multiplier) to each word through it
+            index = coords[0] * layout.width + coords[1]
+            value = self.tileValues[newTile] * layout.letterMultipliers[index]
+            tempMultiplier = layout.wordMultipliers[index]
             multiplier *= tempMultiplier
-            if (adjacency1 and self.isTile(board[adjacency1[0]][adjacency1[1]])) or \
-                (adjacency2 and self.isTile(board[adjacency2[0]][adjacency2[1]])):
-                nonModifiedScore += tempMultiplier*(value + self.countWord(coords, not vert, board))
+            # cross words only run through the placed tile, so the board does not need to be updated to count them
+            if crossScores is not None:
+                crossScore = crossScores.get(coords, not vert)
+                if crossScore is not None:
+                    nonModifiedScore += tempMultiplier*(value + crossScore)
+            else:
+                adjacency1 = ((i, basis-1) if vert else (basis-1, i)) if basis > 0 else None
+                adjacency2 = ((i, basis+1) if vert else (basis+1, i)) if basis < crossLimit else None
+                if (adjacency1 and self.isTile(board[adjacency1[0]][adjacency1[1]])) or \
+                    (adjacency2 and self.isTile(board[adjacency2[0]][adjacency2[1]])):
+                    nonModifiedScore += tempMultiplier*(value + self.countWord(coords, not vert, board))
             score += value
 
-            board[coords[0]][coords[1]] = self.completedGame[coords[0]][coords[1]]
         bingo = 50 if tilesUsed > 6 else 0
         moveScore = score * multiplier + nonModifiedScore + bingo
         if returnTilesPlayed:
             return moveScore, tilesUsedList
-        if returnBoard:
-            return moveScore, board
         return moveScore
     
     def countWord(self, startCoords: tuple, vert: str, gameBoard: list[list[str]]) -> int:
@@ -202,6 +344,7 @@ class ScrabbleGame:
         """
         
         score = 0
+        height, width = self.boardLayout.height, self.boardLayout.width
         if vert:
             # loop descending and ascending from start coordinates and add values until a non-tile is reached
             for i in range(startCoords[0]-1, -1, -1):
@@ -209,7 +352,7 @@ class ScrabbleGame:
                 if not self.isTile(gameBoard[i][startCoords[1]]):
                     break
                 score += self.tileValues[gameBoard[i][startCoords[1]]]
-            for j in range(startCoords[0]+1, 15):
+            for j in range(startCoords[0]+1, height):
                 if not self.isTile(gameBoard[j][startCoords[1]]):
                     break
                 score += self.tileValues[gameBoard[j][startCoords[1]]]
@@ -219,7 +362,7 @@ class ScrabbleGame:
                 if not self.isTile(gameBoard[startCoords[0]][i]):
                     break
                 score += self.tileValues[gameBoard[startCoords[0]][i]]
-            for j in range(startCoords[1]+1, 15):
+            for j in range(startCoords[1]+1, width):
                 if not self.isTile(gameBoard[startCoords[0]][j]):
                     break
                 score += self.tileValues[gameBoard[startCoords[0]][j]]
@@ -227,19 +370,15 @@ class ScrabbleGame:
     
     def tileBagScore(self) -> int:
         """
-        Calculates the total score of tiles that haven't been played yet. 
+        Calculates the total score of tiles that haven't been played yet on the current board. 
         Assuming a two-player game, this value times two is added to the difference between scores
         upon a player using all their tiles, thus ending the game.
-        
-        Args:
-            tileValues (dict[str, int]): dictionary mapping tile characters to their values
-            tileBag (list[str]): list of tiles in the bag (with duplicates to represent quantities)
             
         Returns:
-            int: total score of the tiles in the bag based on their values
+            int: total score of the tiles left in the bag based on their values
         """
         
-        return sum(self.tileValues.get(tile, 0) for tile in self.tileBag)
+        return self.getRemainingBag().remainingValue
     
     def makeAntiBoard(self, board: list[list[str]]) -> list[list[str]]:
         antiBoard = []
@@ -283,7 +422,64 @@ class ScrabbleGame:
                 if self.isTile(board[i][j]):
                     tileSet.add((i, j))
         return tileSet
-        
+
+    def boardFingerprint(self, board: list[list[str]]) -> int:
+        """
+        Returns a compact fingerprint of the board as a bitmask of occupied squares, where square (x, y)
+        is bit x * width + y. Since every tile comes from the completed game, this identifies the board state.
+
+        Args:
+            board (list[list[str]]): current state of the board
+
+        Returns:
+            int: bitmask of squares that have a tile placed on them
+        """
+        fingerprint = 0
+        width = len(board[0])
+        for i in range(len(board)):
+            for j in range(width):
+                if self.isTile(board[i][j]):
+                    fingerprint |= 1 << (i * width + j)
+        return fingerprint
+
+    def getCompactLayout(self) -> CompactLayout:
+        """
+        Returns the compiled layout (premium multipliers, tile values and completed game tiles) used by compact boards,
+        building it on first use.
+
+        Returns:
+            CompactLayout: layout shared by the compact boards of this game
+        """
+        if self.compactLayout is None:
+            self.compactLayout = CompactLayout.fromGame(self)
+        return self.compactLayout
+
+    def toCompactBoard(self, board: list[list[str]] = None) -> CompactBoard:
+        """
+        Converts a board in the CSV layout to a compact board.
+
+        Args:
+            board (list[list[str]], optional): board to convert. Defaults to the current board.
+
+        Returns:
+            CompactBoard: board stored as a flat array of tile codes
+        """
+        if board is None:
+            board = self.currentBoard
+        return CompactBoard.fromRows(self.getCompactLayout(), board)
+
+    def fromCompactBoard(self, compactBoard: CompactBoard) -> list[list[str]]:
+        """
+        Converts a compact board back to the CSV layout.
+
+        Args:
+            compactBoard (CompactBoard): board stored as a flat array of tile codes
+
+        Returns:
+            list[list[str]]: 2d list of the board, with empty squares showing the empty board layout
+        """
+        return compactBoard.toRows()
+
 
     # HELPER FUNCTIONS
     @staticmethod
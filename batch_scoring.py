@@ -0,0 +1,156 @@
+import numpy as np
+
+
+class BatchScorer:
+    """
+    Scores every candidate segment of a board in one vectorized pass instead of one interpreted scorePlay call per
+    segment. The squares of each segment of the segment index are laid out once as rows of a padded array, alongside
+    the completed game's tile values and the letter and word multipliers of the layout, so a board only has to be
+    described by which squares hold a tile. Scoring follows ScrabbleGame.scorePlay: new tiles take their letter
+    multipliers, the word is multiplied by the word multipliers under new tiles, each new tile with a tile next to it
+    across the move scores its cross word, and placing more than 6 tiles adds the bingo bonus. Blanks score their
+    tile value (0) like any other tile. Requires NumPy.
+    """
+
+    def __init__(self, game):
+        """
+        Args:
+            game (ScrabbleTraceback): Game with its search data prepared (see ScrabbleTraceback.prepareSearch). Tiles on
+                the boards scored are taken from its completed game, as on every board the search reaches.
+        """
+        layout = game.getCompactLayout()
+        segmentIndex = game.segmentIndex
+        self.size = layout.size
+        # square indices are padded with one extra square that never holds a tile and is worth nothing
+        pad = self.size
+
+        completedTiles = np.frombuffer(layout.completedTiles, dtype=np.uint8)
+        self.values = np.zeros(self.size + 1, dtype=np.int64)
+        self.values[:pad] = np.asarray(layout.tileValues, dtype=np.int64)[completedTiles]
+        self.letterMultipliers = np.ones(self.size + 1, dtype=np.int64)
+        self.letterMultipliers[:pad] = np.frombuffer(layout.letterMultipliers, dtype=np.uint8)
+        self.wordMultipliers = np.ones(self.size + 1, dtype=np.int64)
+        self.wordMultipliers[:pad] = np.frombuffer(layout.wordMultipliers, dtype=np.uint8)
+
+        # squares of each row, then each column, padded on both ends (and to the longest line) so every square of a
+        # line has a square before and after it, with the value of the completed game's tile on each
+        lineLength = max(layout.height, layout.width)
+        lines = [[x * layout.width + y for y in range(layout.width)] for x in range(layout.height)]
+        lines += [[x * layout.width + y for x in range(layout.height)] for y in range(layout.width)]
+        self.lineSquares = np.array([[pad] + line + [pad] * (lineLength + 1 - len(line)) for line in lines], dtype=np.int64)
+        self.lineValues = self.values[self.lineSquares]
+        self.lineOffsets = np.arange(len(lines))[:, None] * (lineLength + 3)
+        # cross-word entry (square * 2 + orientation) of each square of a line, left out of the padding
+        self.lineEntries = self.lineSquares[:, 1:-1] * 2 + (np.arange(len(lines)) >= layout.height)[:, None]
+
+        # squares of each segment in line order, the squares next to it along its line and across it, the orientation
+        # of its cross words and whether it can open an empty board (see SegmentIndex.connects)
+        segments = segmentIndex.segments
+        length = max((segment.mask.bit_count() for segment in segments), default=1)
+        touchLength = max((segment.touchMask.bit_count() for segment in segments), default=1)
+        self.squares = np.full((len(segments), length), pad, dtype=np.int64)
+        self.flanks = np.full((len(segments), 2), pad, dtype=np.int64)
+        self.touches = np.full((len(segments), touchLength), pad, dtype=np.int64)
+        for i, segment in enumerate(segments):
+            for row, mask in ((self.squares, segment.mask), (self.flanks, segment.flankMask), (self.touches, segment.touchMask)):
+                squares = segmentIndex.squares(mask)
+                row[i, :len(squares)] = squares
+        self.inSegment = self.squares != pad
+        self.lengths = self.inSegment.sum(axis=1)
+
+        # rows counting the squares of each segment, the squares flanking it and the squares next to it, so one matrix
+        # product counts the tiles on all of them for every segment
+        self.countMatrix = np.zeros((3 * len(segments), self.size + 1), dtype=np.float32)
+        for part, squares in enumerate((self.squares, self.flanks, self.touches)):
+            rows = np.repeat(np.arange(len(segments)), squares.shape[1]) + part * len(segments)
+            self.countMatrix[rows, squares.ravel()] = 1
+        self.countMatrix[:, pad] = 0
+        # value of the completed game's tile on each square of each segment, as a tile already placed and as a new tile
+        # with the letter multiplier, the word multiplier under it as a new tile, and the index of its cross word entry
+        # in the flattened cross-word scores
+        self.tileValues = self.values[self.squares]
+        self.letterValues = self.tileValues * self.letterMultipliers[self.squares]
+        self.segmentWordMultipliers = self.wordMultipliers[self.squares]
+        crossVert = np.array([[segment.move[0][0] == segment.move[1][0]] for segment in segments], dtype=np.int64)
+        self.crossIndices = self.squares * 2 + crossVert
+        self.opensBoard = np.array([segmentIndex.connects(segment, 0) for segment in segments], dtype=bool)
+
+    def placedSquares(self, placedMask: int) -> np.ndarray:
+        """
+        Args:
+            placedMask (int): Bitmask of the squares holding a tile (see ScrabbleGame.boardFingerprint).
+
+        Returns:
+            np.ndarray: Whether each square holds a tile, with the padding square last (never holding one).
+        """
+        placedBytes = placedMask.to_bytes((self.size + 8) // 8, "little")
+        return np.unpackbits(np.frombuffer(placedBytes, dtype=np.uint8), count=self.size + 1, bitorder="little").astype(bool)
+
+    def candidates(self, placed: np.ndarray) -> np.ndarray:
+        """
+        Vectorized SegmentIndex.candidates: segments with a square left to fill, no tile on their flank squares, and a
+        square holding or next to a tile (on an empty board, covering the starting square instead).
+
+        Args:
+            placed (np.ndarray): Whether each square holds a tile (see placedSquares).
+
+        Returns:
+            np.ndarray: Indices of the candidate segments in the segment index.
+        """
+        squaresPlaced, flanksPlaced, touchesPlaced = (self.countMatrix @ placed.astype(np.float32)).reshape(3, -1)
+        return np.flatnonzero(
+            (squaresPlaced < self.lengths)
+            & (flanksPlaced == 0)
+            & (squaresPlaced + touchesPlaced > 0 if placed.any() else self.opensBoard)
+        )
+
+    def crossScores(self, placed: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized CrossScoreTable: the unmodified sum of the tiles next to each square along each orientation.
+
+        Args:
+            placed (np.ndarray): Whether each square holds a tile (see placedSquares).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Sum of the tiles next to each square along each orientation (False for
+            horizontal, True for vertical) at index square * 2 + orientation, and whether there is any such tile.
+        """
+        lineTiles = placed[self.lineSquares]
+        # runs of tiles along each line are numbered by the count of empty squares up to them, which is unique across
+        # lines once offset by the line
+        runIds = np.cumsum(~lineTiles, axis=1) + self.lineOffsets
+        runSums = np.bincount(runIds.ravel(), weights=(self.lineValues * lineTiles).ravel())
+        tileRunSums = runSums[runIds] * lineTiles
+
+        # the runs next to a square are the ones through the squares before and after it on its line
+        sums = np.zeros(2 * (self.size + 1), dtype=np.int64)
+        hasCross = np.zeros(2 * (self.size + 1), dtype=bool)
+        sums[self.lineEntries] = tileRunSums[:, :-2] + tileRunSums[:, 2:]
+        hasCross[self.lineEntries] = lineTiles[:, :-2] | lineTiles[:, 2:]
+        return sums, hasCross
+
+    def scoreSegments(self, placed: np.ndarray, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Scores segments as moves on a board, all at once.
+
+        Args:
+            placed (np.ndarray): Whether each square holds a tile (see placedSquares).
+            indices (np.ndarray): Indices of the segments to score in the segment index.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Score of each segment and the number of tiles it places.
+        """
+        squares = self.squares[indices]
+        newTiles = self.inSegment[indices] & ~placed[squares]
+        letterValues = np.where(newTiles, self.letterValues[indices], self.tileValues[indices])
+        wordMultipliers = np.where(newTiles, self.segmentWordMultipliers[indices], 1)
+        tilesPlaced = newTiles.sum(axis=1)
+
+        # cross words run across the move, through each new tile with a tile next to it
+        crossSums, hasCross = self.crossScores(placed)
+        crossIndices = self.crossIndices[indices]
+        crossWords = newTiles & hasCross[crossIndices]
+        crossScore = (crossWords * wordMultipliers * (letterValues + crossSums[crossIndices])).sum(axis=1)
+
+        bingo = np.where(tilesPlaced > 6, 50, 0)
+        return letterValues.sum(axis=1) * wordMultipliers.prod(axis=1) + crossScore + bingo, tilesPlaced
@@ -0,0 +1,240 @@
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from typing import Iterator, TextIO
+
+from game_traceback import ScrabbleTraceback
+from results_log import moveDetails, openResultSink
+
+# Games searched by this worker process, one per tile info file, set by initBatchWorker when the process starts
+workerTemplates = None
+
+
+def discoverGames(directory: str) -> list[dict]:
+    """
+    Finds the games in a directory, pairing each completed board <name>.csv with its scores file <name>_scores.txt
+    (the layout written by benchmarks.synthetic_game.writeGame). Boards without a scores file are skipped.
+
+    Args:
+        directory (str): Directory to search.
+
+    Returns:
+        list[dict]: Games sorted by name, each with name, gameFile and scoresFile keys.
+    """
+    games = []
+    for fileName in sorted(os.listdir(directory)):
+        name, extension = os.path.splitext(fileName)
+        scoresFile = os.path.join(directory, f"{name}_scores.txt")
+        if extension == ".csv" and os.path.isfile(scoresFile):
+            games.append({"name": name, "gameFile": os.path.join(directory, fileName), "scoresFile": scoresFile})
+    return games
+
+
+def loadManifest(manifestFile: str) -> list[dict]:
+    """
+    Reads a JSON Lines manifest with one game per line, as an object with "game" (completed board CSV) and "scores"
+    keys, and optional "tiles" (tile info JSON) and "name" keys. Relative paths are taken from the manifest's directory.
+
+    Args:
+        manifestFile (str): Path of the manifest.
+
+    Returns:
+        list[dict]: Games in manifest order, each with name, gameFile, scoresFile and tileFile (None if not given) keys.
+    """
+    directory = os.path.dirname(os.path.abspath(manifestFile))
+    games = []
+    with open(manifestFile, "r", encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            gameFile = os.path.join(directory, entry["game"])
+            games.append({
+                "name": entry.get("name", os.path.splitext(os.path.basename(gameFile))[0]),
+                "gameFile": gameFile,
+                "scoresFile": os.path.join(directory, entry["scores"]),
+                "tileFile": os.path.join(directory, entry["tiles"]) if entry.get("tiles") else None,
+            })
+    return games
+
+
+def prepareTemplates(tileFiles: set[str], boardFile: str) -> dict[str, ScrabbleTraceback]:
+    """
+    Reads the shared board layout once and each distinct tile info file once, giving one game object per tile info
+    file to load individual games into (see ScrabbleTraceback.loadGame).
+
+    Args:
+        tileFiles (set[str]): Tile info JSON files used by the games.
+        boardFile (str): CSV file containing the empty board layout.
+
+    Returns:
+        dict[str, ScrabbleTraceback]: Game object for each tile info file, with no game loaded.
+    """
+    templates = {}
+    first = None
+    for tileFile in sorted(tileFiles):
+        if first is None:
+            first = template = ScrabbleTraceback(None, tileFile, boardFile, None)
+        else:
+            # copies share the layout already read (copying goes through __getstate__, so each gets its own memo)
+            template = copy.copy(first)
+            template.setTileInfo(tileFile)
+        templates[tileFile] = template
+    return templates
+
+
+def initBatchWorker(templates: dict[str, ScrabbleTraceback], collectStats: bool) -> None:
+    """
+    Stores the game objects used by this worker process.
+
+    Args:
+        templates (dict[str, ScrabbleTraceback]): Game object for each tile info file (see prepareTemplates).
+        collectStats (bool): Whether to collect search stats for each game.
+    """
+    global workerTemplates
+    workerTemplates = templates
+    if collectStats:
+        for template in workerTemplates.values():
+            template.enableStats()
+
+
+def searchGame(traceback: ScrabbleTraceback, timeout: float = None, maxMoveSeqs: int = 1, details: bool = False) -> dict:
+    """
+    Counts every reconstruction of the game loaded in a game object through the solution DAG.
+
+    Args:
+        traceback (ScrabbleTraceback): Game object with the game loaded.
+        timeout (float, optional): Seconds allowed for the search. Defaults to None (no time limit).
+        maxMoveSeqs (int, optional): Number of move sequences to include in the result. Defaults to 1.
+        details (bool, optional): Include the score and tiles of each move of the sequences (see
+            results_log.moveDetails). Defaults to False.
+
+    Returns:
+        dict: The status of the search ("solved", "no_solution" or "timeout"), the number of solutions found, the first
+        maxMoveSeqs move sequences, their move details if requested and the search stats if collected.
+    """
+    dag = traceback.solutionDag(timeout)
+    if not dag.complete:
+        status = "timeout"
+    else:
+        status = "solved" if dag.count() else "no_solution"
+    result = {
+        "status": status,
+        "solutions": dag.count(),
+        "moves": [[list(map(list, move)) for move in moveSeq] for moveSeq in islice(dag.paths(), maxMoveSeqs)],
+    }
+    if details:
+        result["moveDetails"] = [moveDetails(traceback, moveSeq) for moveSeq in result["moves"]]
+    if traceback.stats is not None:
+        result["stats"] = traceback.stats.toDict()
+    return result
+
+
+def runGame(game: dict, timeout: float = None, maxMoveSeqs: int = 1, details: bool = False) -> dict:
+    """
+    Reconstructs one game in a worker process. Every reconstruction is counted through the solution DAG, and the first
+    maxMoveSeqs of them are returned.
+
+    Args:
+        game (dict): Game with name, gameFile, scoresFile and tileFile keys.
+        timeout (float, optional): Seconds allowed for the game. Defaults to None (no time limit).
+        maxMoveSeqs (int, optional): Number of move sequences to include in the result. Defaults to 1.
+        details (bool, optional): Include the score and tiles of each move of the sequences. Defaults to False.
+
+    Returns:
+        dict: Result with the name and files of the game, its status ("solved", "no_solution", "timeout" or "error"),
+        the number of solutions found, the move sequences, the seconds taken and the search stats if collected.
+    """
+    result = {"name": game["name"], "gameFile": game["gameFile"], "scoresFile": game["scoresFile"]}
+    start = time.perf_counter()
+    try:
+        traceback = workerTemplates[game["tileFile"]]
+        traceback.loadGame(game["scoresFile"], game["gameFile"])
+        result.update(searchGame(traceback, timeout, maxMoveSeqs, details))
+    except Exception as error:
+        result.update({"status": "error", "error": f"{type(error).__name__}: {error}"})
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def batchTraceback(games: list[dict], output: TextIO, boardFile: str = "board.csv", tileFile: str = "tileInfo.json",
+                   workers: int = None, timeout: float = None, maxMoveSeqs: int = 1, collectStats: bool = False,
+                   logFile: str = None) -> dict[str, int]:
+    """
+    Reconstructs a corpus of games over a pool of worker processes, writing one JSON line per game to the output as
+    soon as the game finishes. The board layout and tile info files are read once, not once per game.
+
+    Args:
+        games (list[dict]): Games to run (see discoverGames and loadManifest).
+        output (TextIO): Stream to write the results to.
+        boardFile (str, optional): CSV file containing the empty board layout. Defaults to "board.csv".
+        tileFile (str, optional): Tile info JSON file for games that do not name one. Defaults to "tileInfo.json".
+        workers (int, optional): Number of worker processes. Defaults to None (one per CPU).
+        timeout (float, optional): Seconds allowed for each game. Defaults to None (no time limit).
+        maxMoveSeqs (int, optional): Number of move sequences to include for each game. Defaults to 1.
+        collectStats (bool, optional): Include the search stats of each game. Defaults to False.
+        logFile (str, optional): CSV or XLSX log to append the moves of each solved game to (see
+            results_log.openResultSink). Defaults to None (no log).
+
+    Returns:
+        dict[str, int]: Number of games with each status.
+    """
+    games = [{**game, "tileFile": game.get("tileFile") or tileFile} for game in games]
+    templates = prepareTemplates({game["tileFile"] for game in games}, boardFile)
+    statusCounts = {}
+
+    sink = openResultSink(logFile) if logFile else None
+    try:
+        with ProcessPoolExecutor(workers, initializer=initBatchWorker, initargs=(templates, collectStats)) as executor:
+            futures = [executor.submit(runGame, game, timeout, maxMoveSeqs, sink is not None) for game in games]
+            for future in as_completed(futures):
+                result = future.result()
+                statusCounts[result["status"]] = statusCounts.get(result["status"], 0) + 1
+                if sink is not None and result["status"] == "solved":
+                    sink.addResult(result)
+                output.write(json.dumps({key: value for key, value in result.items() if key != "moveDetails"}) + "\n")
+                output.flush()
+    finally:
+        if sink is not None:
+            sink.close()
+
+    return statusCounts
+
+
+def iterGames(source: str) -> Iterator[dict]:
+    """
+    Args:
+        source (str): Directory of games or JSON Lines manifest.
+
+    Yields:
+        dict: Games found in the source.
+    """
+    yield from discoverGames(source) if os.path.isdir(source) else loadManifest(source)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconstruct a corpus of completed games, writing one JSON line per game.")
+    parser.add_argument("source", help="directory of <name>.csv / <name>_scores.txt games, or JSON Lines manifest")
+    parser.add_argument("--board", default="board.csv", help="empty board layout CSV file")
+    parser.add_argument("--tiles", default="tileInfo.json", help="tile info JSON file for games that do not name one")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds allowed for each game")
+    parser.add_argument("--max-moves", type=int, default=1, help="move sequences to include for each game")
+    parser.add_argument("--stats", action="store_true", help="include search stats for each game")
+    parser.add_argument("--output", default=None, help="JSON Lines file to write the results to (default: stdout)")
+    parser.add_argument("--log", default=None, help="CSV or XLSX log (.xlsx) to append the moves of each solved game to")
+    args = parser.parse_args()
+
+    outputFile = open(args.output, "w", encoding='utf-8') if args.output else sys.stdout
+    try:
+        counts = batchTraceback(list(iterGames(args.source)), outputFile, args.board, args.tiles, args.workers,
+                                args.timeout, args.max_moves, args.stats, args.log)
+    finally:
+        if args.output:
+            outputFile.close()
+    print(", ".join(f"{count} {status}" for status, count in sorted(counts.items())), file=sys.stderr)
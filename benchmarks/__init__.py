@@ -0,0 +1,6 @@
+"""
+Benchmarks for the scoring and traceback engine, run on synthetic completed games.
+
+Run from the repository root with:
+    python -m benchmarks.run_benchmarks --games 5 --moves 20 --output bench_results.json
+"""
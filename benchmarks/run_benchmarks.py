@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+
+from game_traceback import ScrabbleTraceback
+from benchmarks.synthetic_game import generateGame, writeGame
+
+
+def timeCalls(function, calls: list[tuple]) -> dict:
+    """
+    Times a function over a list of argument tuples.
+
+    Args:
+        function (Callable): Function to time.
+        calls (list[tuple]): Positional arguments for each call.
+
+    Returns:
+        dict: Number of calls, total seconds and microseconds per call.
+    """
+    start = time.perf_counter()
+    for args in calls:
+        function(*args)
+    seconds = time.perf_counter() - start
+    return {"calls": len(calls), "seconds": seconds, "usPerCall": seconds / len(calls) * 1e6 if calls else 0.0}
+
+
+def replayBoards(traceback: ScrabbleTraceback, moves: list[tuple[tuple[int, int], tuple[int, int]]]) -> list[list[list[str]]]:
+    """
+    Args:
+        traceback (ScrabbleTraceback): Game the moves belong to.
+        moves (list[tuple[tuple[int, int], tuple[int, int]]]): Moves of the game, in order.
+
+    Returns:
+        list[list[list[str]]]: Board before each move.
+    """
+    board = [row[:] for row in traceback.emptyBoard]
+    boards = []
+    for move in moves:
+        boards.append([row[:] for row in board])
+        traceback.applyMove(move[0], move[1], board)
+    return boards
+
+
+def benchmarkGame(traceback: ScrabbleTraceback, moves: list[tuple[tuple[int, int], tuple[int, int]]], timeout: float, repeat: int) -> dict:
+    """
+    Times countPlay, searchMoves, getTileBag and the full traceback on one game.
+
+    Args:
+        traceback (ScrabbleTraceback): Game to benchmark.
+        moves (list[tuple[tuple[int, int], tuple[int, int]]]): Moves the game was generated with.
+        timeout (float): Seconds allowed for each traceback.
+        repeat (int): Number of times the per-call benchmarks go over the game.
+
+    Returns:
+        dict: Results of each benchmark.
+    """
+    boards = replayBoards(traceback, moves)
+    scores = traceback.moveScores
+
+    # every candidate segment on every board reached by the game
+    countPlayCalls = [
+        (segment.move[0], segment.move[1], board)
+        for board in boards
+        for segment in traceback.segmentIndex.candidates(traceback.boardFingerprint(board))
+    ] * repeat
+    searchMovesCalls = [(board, scores[i]) for i, board in enumerate(boards)] * repeat
+
+    def tileBag(board: list[list[str]]) -> list[str]:
+        traceback.currentBoard = board
+        return traceback.getTileBag()
+
+    results = {
+        "countPlay": timeCalls(traceback.countPlay, countPlayCalls),
+        "searchMoves": timeCalls(traceback.searchMoves, searchMovesCalls),
+        "getTileBag": timeCalls(tileBag, [(board,) for board in boards] * repeat),
+    }
+    traceback.currentBoard = [row[:] for row in traceback.emptyBoard]
+
+    traceback.enableStats()
+    start = time.perf_counter()
+    next(traceback.iterTraceback(timeout=timeout), None)
+    results["firstSolution"] = {"seconds": time.perf_counter() - start, "timedOut": traceback.timedOut}
+
+    start = time.perf_counter()
+    solutions = sum(1 for _ in traceback.iterTraceback(timeout=timeout))
+    results["traceback"] = {
+        "seconds": time.perf_counter() - start,
+        "solutions": solutions,
+        "timedOut": traceback.timedOut,
+        "stats": traceback.stats.toDict(),
+    }
+    traceback.disableStats()
+    return results
+
+
+def runBenchmarks(numGames: int, numMoves: int, ambiguity: float, seed: int, timeout: float, repeat: int,
+                  tileFile: str = "tileInfo.json", boardFile: str = "board.csv", gameDirectory: str = None) -> dict:
+    """
+    Generates synthetic games and benchmarks each of them.
+
+    Args:
+        numGames (int): Number of games to generate.
+        numMoves (int): Number of moves per game.
+        ambiguity (float): Probability of drawing one point tiles (see generateGame).
+        seed (int): Seed of the first game; game i uses seed + i.
+        timeout (float): Seconds allowed for each traceback.
+        repeat (int): Number of times the per-call benchmarks go over each game.
+        tileFile (str, optional): JSON file containing tile values and counts. Defaults to "tileInfo.json".
+        boardFile (str, optional): CSV file containing the empty board layout. Defaults to "board.csv".
+        gameDirectory (str, optional): Directory to keep the generated games in. Defaults to a temporary directory.
+
+    Returns:
+        dict: Benchmark parameters, environment and per game results.
+    """
+    results = {
+        "parameters": {"games": numGames, "moves": numMoves, "ambiguity": ambiguity, "seed": seed, "timeout": timeout, "repeat": repeat},
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "games": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tempDirectory:
+        directory = gameDirectory or tempDirectory
+        for i in range(numGames):
+            traceback = ScrabbleTraceback(tileFile=tileFile, boardFile=boardFile)
+            completedGame, moveScores, moves = generateGame(traceback, numMoves, ambiguity, seed + i)
+            gameFile, scoresFile = writeGame(directory, f"synthetic{seed + i}", completedGame, moveScores)
+
+            traceback = ScrabbleTraceback(scoresFile, tileFile, boardFile, gameFile)
+            gameResults = benchmarkGame(traceback, moves, timeout, repeat)
+            gameResults.update({"seed": seed + i, "moves": len(moves), "segments": len(traceback.segmentIndex.segments)})
+            results["games"].append(gameResults)
+            print(f"game {i + 1}/{numGames}: {len(moves)} moves, {gameResults['traceback']['solutions']} solutions, "
+                  f"{gameResults['traceback']['seconds']:.3f}s")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scoring and traceback engine on synthetic games.")
+    parser.add_argument("--games", type=int, default=5, help="number of games to generate")
+    parser.add_argument("--moves", type=int, default=20, help="moves per game")
+    parser.add_argument("--ambiguity", type=float, default=0.5, help="probability of drawing one point tiles (0-1)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds allowed for each traceback")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over each game for the per-call benchmarks")
+    parser.add_argument("--tiles", default="tileInfo.json", help="tile info JSON file")
+    parser.add_argument("--board", default="board.csv", help="empty board layout CSV file")
+    parser.add_argument("--keep-games", default=None, help="directory to keep the generated games in")
+    parser.add_argument("--output", default="bench_results.json", help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    benchmarkResults = runBenchmarks(args.games, args.moves, args.ambiguity, args.seed, args.timeout, args.repeat,
+                                     args.tiles, args.board, args.keep_games)
+    with open(args.output, "w", encoding='utf-8') as file:
+        json.dump(benchmarkResults, file, indent=4)
+    print(f"Results written to {os.path.abspath(args.output)}")
@@ -0,0 +1,183 @@
+import csv
+import os
+import random
+
+from ScrabbleGame import ScrabbleGame
+
+
+def drawTile(bag: list[str], tileValues: dict[str, int], ambiguity: float, rng: random.Random) -> str:
+    """
+    Draws a tile from the bag. With probability ambiguity, a one point tile is drawn if any are left, which makes
+    more segments score the same and the traceback harder.
+
+    Args:
+        bag (list[str]): Tiles left in the bag (the drawn tile is removed).
+        tileValues (dict[str, int]): Dictionary mapping tile characters to their values.
+        ambiguity (float): Probability of drawing a one point tile.
+        rng (random.Random): Random number generator.
+
+    Returns:
+        str: The tile drawn.
+    """
+    if rng.random() < ambiguity:
+        onePointIndices = [i for i, tile in enumerate(bag) if tileValues[tile] == 1]
+        if onePointIndices:
+            return bag.pop(rng.choice(onePointIndices))
+    return bag.pop(rng.randrange(len(bag)))
+
+
+def lineRun(board: list[list[str]], coords: tuple[int, int], vert: bool, newSquares: set[tuple[int, int]]) -> tuple[tuple[int, int], tuple[int, int]]:
+    """
+    Finds the run of tiles through a square along one orientation, counting squares about to be filled as tiles.
+
+    Args:
+        board (list[list[str]]): 2d list representing the board before the move.
+        coords (tuple[int, int]): Square the run goes through.
+        vert (bool): True to follow the column, False to follow the row.
+        newSquares (set[tuple[int, int]]): Squares the move is filling.
+
+    Returns:
+        tuple[tuple[int, int], tuple[int, int]]: Start and end coordinates of the run.
+    """
+    dx, dy = (1, 0) if vert else (0, 1)
+
+    def filled(x: int, y: int) -> bool:
+        return 0 <= x < len(board) and 0 <= y < len(board[0]) and ((x, y) in newSquares or ScrabbleGame.isTile(board[x][y]))
+
+    start = coords
+    while filled(start[0] - dx, start[1] - dy):
+        start = (start[0] - dx, start[1] - dy)
+    end = coords
+    while filled(end[0] + dx, end[1] + dy):
+        end = (end[0] + dx, end[1] + dy)
+    return start, end
+
+
+def randomPlay(game: ScrabbleGame, board: list[list[str]], startCoords: tuple[int, int], rng: random.Random) -> tuple[tuple[tuple[int, int], tuple[int, int]], list[tuple[int, int]]] | None:
+    """
+    Picks the squares of a random legal play: 1 to 7 new tiles in one row or column, forming one unbroken run that
+    covers the start square (first move) or touches a tile already on the board.
+
+    Args:
+        game (ScrabbleGame): Game providing the board dimensions.
+        board (list[list[str]]): 2d list representing the board before the move.
+        startCoords (tuple[int, int]): Coordinates of the starting square.
+        rng (random.Random): Random number generator.
+
+    Returns:
+        tuple | None: The move (start and end coordinates of the whole run played) and the squares of the new tiles,
+        or None if the attempt failed.
+    """
+    height, width = len(board), len(board[0])
+    tileSet = game.getTileSet(board)
+    if tileSet:
+        # empty squares next to a tile on the board
+        anchors = sorted({
+            (x + dx, y + dy) for x, y in tileSet for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+            if 0 <= x + dx < height and 0 <= y + dy < width and (x + dx, y + dy) not in tileSet
+        })
+        anchor = rng.choice(anchors)
+    else:
+        anchor = startCoords
+
+    vert = rng.random() < 0.5
+    numTiles = rng.choice((1, 1, 2, 2, 3, 3, 4, 4, 5, 6, 7))
+    dx, dy = (1, 0) if vert else (0, 1)
+
+    # place some of the new tiles before the anchor and the rest after it, skipping over tiles on the board
+    before = rng.randrange(numTiles)
+    newSquares = [anchor]
+    for direction, count in ((-1, before), (1, numTiles - 1 - before)):
+        x, y = anchor
+        while count:
+            x, y = x + direction * dx, y + direction * dy
+            if not (0 <= x < height and 0 <= y < width):
+                break
+            if not ScrabbleGame.isTile(board[x][y]):
+                newSquares.append((x, y))
+                count -= 1
+
+    newSquareSet = set(newSquares)
+    if not tileSet and len(newSquares) < 2:
+        return None
+
+    move = lineRun(board, anchor, vert, newSquareSet)
+    if move[0] == move[1]:
+        # a single new tile is played along whichever orientation makes a word
+        move = lineRun(board, anchor, not vert, newSquareSet)
+        if move[0] == move[1]:
+            return None
+    return move, sorted(newSquares)
+
+
+def generateGame(game: ScrabbleGame, numMoves: int, ambiguity: float = 0.0, seed: int = None, startCoords: tuple[int, int] = None) -> tuple[list[list[str]], list[int], list[tuple[tuple[int, int], tuple[int, int]]]]:
+    """
+    Generates a random legal completed game on the game's empty board using its tile set. Letters are random (there is
+    no dictionary), and each move's score comes from ScrabbleGame.countPlay. The score list ends with the deduction for
+    the tiles left unplayed, followed by the matching bonus, as in scores1.txt. The game's completedGame and currentBoard
+    are overwritten.
+
+    Args:
+        game (ScrabbleGame): Game with the empty board and tile info set.
+        numMoves (int): Number of moves to play (fewer if the bag runs low or no play is found).
+        ambiguity (float, optional): Probability of drawing a one point tile, making scores collide more. Defaults to 0.0.
+        seed (int, optional): Seed for the random number generator. Defaults to None.
+        startCoords (tuple[int, int], optional): Coordinates of the starting square. Defaults to None (the starting
+            square of the game's board layout).
+
+    Returns:
+        tuple: The completed board (2d list with 'x' for empty squares), the score of each move and the moves played.
+    """
+    rng = random.Random(seed)
+    if startCoords is None:
+        startCoords = game.boardLayout.startCoords
+    game.completedGame = [["x"] * len(row) for row in game.emptyBoard]
+    game.currentBoard = [row[:] for row in game.emptyBoard]
+    game.compactLayout = None
+    bag = list(game.tileBag)
+
+    moveScores = []
+    moves = []
+    # at least a full rack is always left in the bag, so the final deduction is never zero
+    while len(moves) < numMoves:
+        for _ in range(200):
+            play = randomPlay(game, game.currentBoard, startCoords, rng)
+            if play and len(play[1]) <= len(bag) - 7:
+                break
+        else:
+            break
+
+        move, newSquares = play
+        for x, y in newSquares:
+            game.completedGame[x][y] = drawTile(bag, game.tileValues, ambiguity, rng)
+        moveScores.append(game.countPlay(*move))
+        moves.append(move)
+
+    # the player left holding tiles loses their value, which is added to the other player's score
+    deduction = sum(game.tileValues[tile] for tile in bag)
+    moveScores.extend((-deduction, deduction))
+    game.compactLayout = None
+    return game.completedGame, moveScores, moves
+
+
+def writeGame(directory: str, name: str, completedGame: list[list[str]], moveScores: list[int]) -> tuple[str, str]:
+    """
+    Writes a generated game in the same formats as Game1.csv and scores1.txt.
+
+    Args:
+        directory (str): Directory to write the files to (created if missing).
+        name (str): Base name of the files.
+        completedGame (list[list[str]]): 2d list of the completed board.
+        moveScores (list[int]): Score of each move.
+
+    Returns:
+        tuple[str, str]: Paths of the game CSV file and the scores file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    gameFile = os.path.join(directory, f"{name}.csv")
+    scoresFile = os.path.join(directory, f"{name}_scores.txt")
+    with open(gameFile, "w", newline="", encoding='utf-8') as csvfile:
+        csv.writer(csvfile).writerows(completedGame)
+    with open(scoresFile, "w", encoding='utf-8') as file:
+        file.write(" ".join(map(str, moveScores)))
+    return gameFile, scoresFile
@@ -0,0 +1,194 @@
+import time
+from itertools import combinations
+
+
+def boardFromMask(game, placedMask: int) -> list[list[str]]:
+    """
+    Args:
+        game (ScrabbleTraceback): Game being searched.
+        placedMask (int): Bitmask of the squares holding a tile (see ScrabbleGame.boardFingerprint).
+
+    Returns:
+        list[list[str]]: Board with the completed game's tiles on those squares and the empty board elsewhere.
+    """
+    width = game.segmentIndex.width
+    return [
+        [game.completedGame[x][y] if placedMask >> (x * width + y) & 1 else game.emptyBoard[x][y] for y in range(width)]
+        for x in range(game.segmentIndex.height)
+    ]
+
+
+def unplayMoves(game, placedMask: int, moveIndex: int, maxTilesPlaced: list[int]) -> list[tuple[int, tuple[tuple[int, int], tuple[int, int]]]]:
+    """
+    Finds every way the move at moveIndex - 1 could have been the last one played to reach a board. The move is a
+    segment of placed squares whose flank squares are empty, since it formed the whole run along its line, and the
+    tiles it placed are a subset of its squares. Taking them back must leave a board that legal moves can reach
+    (connected through the starting square, or empty before the first move) and that the segment touches. Playing the
+    segment on that board must score the target.
+
+    Args:
+        game (ScrabbleTraceback): Game being searched.
+        placedMask (int): Bitmask of the squares holding a tile after the move.
+        moveIndex (int): Index of the moveScores attribute list for the move after the one taken back.
+        maxTilesPlaced (list[int]): Most tiles the moves before each index can have placed.
+
+    Returns:
+        list[tuple[int, tuple[tuple[int, int], tuple[int, int]]]]: Bitmask of the board before the move, and the move.
+    """
+    segmentIndex = game.segmentIndex
+    targetScore = game.moveScores[moveIndex - 1]
+    maxTiles = 7 if targetScore >= 50 else 6
+    board = boardFromMask(game, placedMask)
+    emptyBoard = game.emptyBoard
+    width = segmentIndex.width
+    neighbourMasks = segmentIndex.neighbourMasks
+
+    # tiles that can no longer reach the starting square if the tile on a square is taken back by itself
+    cutOffMasks = {}
+
+    def cutOffMask(square: int) -> int:
+        if square not in cutOffMasks:
+            remainingMask = placedMask & ~(1 << square)
+            cutOffMasks[square] = remainingMask & ~segmentIndex.reachableMask(remainingMask)
+        return cutOffMasks[square]
+
+    predecessors = []
+    for segment in segmentIndex.segments:
+        if segment.mask & ~placedMask or segment.flankMask & placedMask or game.scoreBounds[segment.move] < targetScore:
+            continue
+        squares = segmentIndex.squares(segment.mask)
+        allPositions = (1 << len(squares)) - 1
+        # positions along the segment (in line order) of the squares with a tile next to them outside the segment
+        supported = 0
+        # positions of the squares whose tile cannot be taken back, since that cuts off tiles outside the segment
+        pinned = 0
+        for position, square in enumerate(squares):
+            if neighbourMasks[square] & placedMask & ~segment.mask or 1 << square & segmentIndex.startMask:
+                supported |= 1 << position
+            if moveIndex > 1 and cutOffMask(square) & ~segment.mask:
+                pinned |= 1 << position
+
+        freePositions = [position for position in range(len(squares)) if not pinned >> position & 1]
+        for numTiles in range(1, min(maxTiles, len(freePositions)) + 1):
+            for positions in combinations(freePositions, numTiles):
+                removed = sum(1 << position for position in positions)
+                tiles = [squares[position] for position in positions]
+                tilesMask = sum(1 << square for square in tiles)
+                previousMask = placedMask & ~tilesMask
+                tilesBefore = previousMask.bit_count()
+                if moveIndex == 1:
+                    # the first move is played on an empty board and covers the starting square
+                    if previousMask or not segment.mask & segmentIndex.startMask:
+                        continue
+                else:
+                    if (tilesBefore < moveIndex or tilesBefore > maxTilesPlaced[moveIndex - 1]
+                            or not (segment.mask | segment.touchMask) & previousMask):
+                        continue
+                    # each piece of the segment left on the board must hold on to the rest of it through a square with
+                    # a tile next to it, which is checked along the segment before the full check of the board
+                    kept = allPositions & ~removed
+                    reached = kept & supported
+                    while True:
+                        grown = reached | ((reached << 1) | (reached >> 1)) & kept
+                        if grown == reached:
+                            break
+                        reached = grown
+                    if reached != kept or not segmentIndex.isConnected(previousMask):
+                        continue
+
+                # take the tiles back, score the segment, then put them back
+                for square in tiles:
+                    board[square // width][square % width] = emptyBoard[square // width][square % width]
+                score = game.scorePlay(segment.move[0], segment.move[1], board)
+                for square in tiles:
+                    board[square // width][square % width] = game.completedGame[square // width][square % width]
+                if score == targetScore:
+                    predecessors.append((previousMask, segment.move))
+    return predecessors
+
+
+def backwardFrontier(game, meetIndex: int) -> dict[int, list[tuple]] | None:
+    """
+    Searches backward from the completed board, taking back one move at a time from the last, down to the boards
+    reached after meetIndex moves. Boards reached through different orders of the last moves are merged by
+    fingerprint at each level.
+
+    Args:
+        game (ScrabbleTraceback): Game being searched.
+        meetIndex (int): Number of moves before the boards to stop at.
+
+    Returns:
+        dict[int, list[tuple]] | None: For each board fingerprint after meetIndex moves, the sequences of the remaining
+        moves that lead from it to the completed board. None if the search stopped early.
+    """
+    lastMove = next(i for i, score in enumerate(game.moveScores) if score < 0)
+    maxTilesPlaced = [0] * (lastMove + 1)
+    for i in range(lastMove):
+        maxTilesPlaced[i + 1] = maxTilesPlaced[i] + (7 if game.moveScores[i] >= 50 else 6)
+
+    # the deduction only depends on the completed board
+    if game.getRemainingBag(game.completedGame).remainingValue != -game.moveScores[lastMove]:
+        return {}
+
+    stats = game.stats
+    level = {game.segmentIndex.completedMask: [()]}
+    for moveIndex in range(lastMove, meetIndex, -1):
+        previousLevel = {}
+        for placedMask, suffixes in level.items():
+            if game.searchExpired():
+                return None
+            if stats is not None:
+                stats.nodesPerDepth[moveIndex] += 1
+            for previousMask, move in unplayMoves(game, placedMask, moveIndex, maxTilesPlaced):
+                if not game.isFeasible(previousMask, moveIndex - 1):
+                    if stats is not None:
+                        stats.nodesPruned += 1
+                    continue
+                previousLevel.setdefault(previousMask, []).extend((move,) + suffix for suffix in suffixes)
+        level = previousLevel
+    return level
+
+
+def bidirectionalTraceback(game, meetIndex: int = None, limit: int = None, timeout: float = None) -> list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]:
+    """
+    Runs the traceback from both ends (see ScrabbleTraceback.bidirectionalTraceback). The backward search collects
+    the boards after meetIndex moves from which the completed board can be reached, then the forward search runs the
+    first meetIndex moves as usual and joins each board it reaches at meetIndex on its fingerprint.
+
+    Args:
+        game (ScrabbleTraceback): Game to search.
+        meetIndex (int, optional): Move index where the searches meet. Defaults to None (half of the moves).
+        limit (int, optional): Maximum number of move sequences to find. Defaults to None (find all).
+        timeout (float, optional): Seconds after which the search stops, for both halves. Defaults to None (no time limit).
+
+    Returns:
+        list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]: Move sequences found.
+    """
+    lastMove = next(i for i, score in enumerate(game.moveScores) if score < 0)
+    if meetIndex is None:
+        meetIndex = lastMove // 2
+    meetIndex = max(0, min(meetIndex, lastMove))
+
+    start = time.monotonic()
+    game.timedOut = False
+    game.searchStopped = False
+    game.deadline = start + timeout if timeout is not None else None
+    if game.stats is not None:
+        game.stats.reset()
+
+    frontier = backwardFrontier(game, meetIndex)
+    if frontier is None:
+        return []
+
+    game.meetIndex, game.meetFrontier = meetIndex, frontier
+    try:
+        remaining = timeout - (time.monotonic() - start) if timeout is not None else None
+        stats = game.stats
+        # the forward search resets the stats, so keep the backward counts and add them back
+        backwardStats = stats.toDict() if stats is not None else None
+        moveSeqs = list(game.iterTraceback(limit, remaining))
+        if backwardStats is not None:
+            stats.merge(backwardStats)
+    finally:
+        game.meetIndex, game.meetFrontier = None, None
+    return moveSeqs
@@ -0,0 +1,82 @@
+import csv
+
+# letter and word multipliers of each premium marker of a layout file, checked in this order so the first marker found
+# in a square wins
+PREMIUM_SQUARES: dict[str, tuple[int, int]] = {
+    "d": (2, 1),
+    "t": (3, 1),
+    "s": (1, 2),
+    "2": (1, 2),
+    "3": (1, 3),
+}
+# marker of the starting square, which the first move must cover
+START_MARKER = "s"
+
+
+class BoardLayout:
+    """
+    Geometry and premium squares of an empty board, compiled once from the layout file: its dimensions, the letter and
+    word multiplier of each square and the starting square. Scoring and search code read the multipliers by square
+    index (x * width + y) instead of inspecting the layout strings, so boards of any size and premium arrangement
+    (e.g. 21x21 variants) are handled the same way.
+    """
+
+    def __init__(self, emptyBoard: list[list[str]], premiums: dict[str, tuple[int, int]] = PREMIUM_SQUARES,
+                 startMarker: str = START_MARKER):
+        """
+        Args:
+            emptyBoard (list[list[str]]): 2d list of the empty board layout (as read from board.csv).
+            premiums (dict[str, tuple[int, int]], optional): Letter and word multipliers of each premium marker.
+                Defaults to PREMIUM_SQUARES.
+            startMarker (str, optional): Marker of the starting square. Defaults to START_MARKER.
+
+        Raises:
+            ValueError: If the layout is empty or not rectangular, or has more than one starting square.
+        """
+        if not emptyBoard or not emptyBoard[0] or any(len(row) != len(emptyBoard[0]) for row in emptyBoard):
+            raise ValueError("Board layout must be a non-empty grid with rows of equal length")
+        self.emptyBoard = emptyBoard
+        self.height = len(emptyBoard)
+        self.width = len(emptyBoard[0])
+        self.size = self.height * self.width
+
+        letterMultipliers = bytearray(b"\x01" * self.size)
+        wordMultipliers = bytearray(b"\x01" * self.size)
+        startSquares = []
+        for i, mod in enumerate(square for row in emptyBoard for square in row):
+            for marker, (letterMultiplier, wordMultiplier) in premiums.items():
+                if marker in mod:
+                    letterMultipliers[i] = letterMultiplier
+                    wordMultipliers[i] = wordMultiplier
+                    break
+            if startMarker in mod:
+                startSquares.append(divmod(i, self.width))
+        self.letterMultipliers = bytes(letterMultipliers)
+        self.wordMultipliers = bytes(wordMultipliers)
+
+        if len(startSquares) > 1:
+            raise ValueError(f"Board layout has {len(startSquares)} starting squares")
+        # layouts without a marked starting square start in the center
+        self.startCoords: tuple[int, int] = startSquares[0] if startSquares else (self.height // 2, self.width // 2)
+
+    @classmethod
+    def fromFile(cls, boardFile: str = "board.csv") -> "BoardLayout":
+        """
+        Args:
+            boardFile (str, optional): CSV file containing the empty board layout. Defaults to "board.csv".
+
+        Returns:
+            BoardLayout: Compiled layout of the file.
+        """
+        with open(boardFile, newline="", encoding='utf-8-sig') as csvfile:
+            return cls([row for row in csv.reader(csvfile)])
+
+    def index(self, coords: tuple[int, int]) -> int:
+        """
+        Args:
+            coords (tuple[int, int]): Coordinates of a square (x, y).
+
+        Returns:
+            int: Index of the square in the compiled arrays.
+        """
+        return coords[0] * self.width + coords[1]
@@ -0,0 +1,258 @@
+from array import array
+
+from board_layout import BoardLayout
+
+# tile codes stored in a compact board: 0 for an empty square, 1-26 for letters and 27 for a blank ('_')
+CODE_TILES = " ABCDEFGHIJKLMNOPQRSTUVWXYZ_"
+TILE_CODES = {tile: code for code, tile in enumerate(CODE_TILES) if code}
+EMPTY = 0
+
+
+class CompactLayout:
+    """
+    Precompiled data shared by every compact board of a game: board dimensions, letter and word multipliers
+    for each square and the starting square (from the game's BoardLayout), tile values by code and the tiles of the
+    completed game. Squares are indexed as x * width + y.
+    """
+
+    def __init__(self, emptyBoard: list[list[str]], tileValues: dict[str, int], completedGame: list[list[str]] = None,
+                 boardLayout: BoardLayout = None):
+        """
+        Args:
+            emptyBoard (list[list[str]]): 2d list of the empty board layout (as read from board.csv).
+            tileValues (dict[str, int]): Dictionary mapping tile characters to their values.
+            completedGame (list[list[str]], optional): 2d list of the completed board. Defaults to None.
+            boardLayout (BoardLayout, optional): Layout already compiled from the empty board. Defaults to None
+                (compiled here).
+        """
+        boardLayout = boardLayout or BoardLayout(emptyBoard)
+        self.height = boardLayout.height
+        self.width = boardLayout.width
+        self.size = boardLayout.size
+        self.emptyBoard = emptyBoard
+        self.letterMultipliers = boardLayout.letterMultipliers
+        self.wordMultipliers = boardLayout.wordMultipliers
+        self.startCoords = boardLayout.startCoords
+
+        self.tileValues = array('i', [tileValues.get(tile, 0) for tile in CODE_TILES])
+        self.completedTiles = self.encodeRows(completedGame) if completedGame else None
+
+    @classmethod
+    def fromGame(cls, game) -> "CompactLayout":
+        """
+        Builds the layout from the data loaded into a ScrabbleGame.
+
+        Args:
+            game (ScrabbleGame): Game with its empty board, tile values and (optionally) completed game set.
+
+        Returns:
+            CompactLayout: Layout for the game.
+        """
+        return cls(game.emptyBoard, game.tileValues, game.completedGame, game.boardLayout)
+
+    def encodeRows(self, rows: list[list[str]]) -> bytes:
+        """
+        Args:
+            rows (list[list[str]]): 2d list in the CSV board layout.
+
+        Returns:
+            bytes: Tile code of each square, 0 where there is no tile.
+        """
+        return bytes(TILE_CODES.get(square, EMPTY) for row in rows for square in row)
+
+    def decodeTiles(self, tiles: bytes | bytearray | memoryview) -> list[list[str]]:
+        """
+        Args:
+            tiles (bytes | bytearray | memoryview): Tile code of each square.
+
+        Returns:
+            list[list[str]]: 2d list in the CSV board layout, with empty squares showing the empty board layout.
+        """
+        return [
+            [CODE_TILES[tiles[i * self.width + j]] if tiles[i * self.width + j] else self.emptyBoard[i][j] for j in range(self.width)]
+            for i in range(self.height)
+        ]
+
+
+class CompactBoard:
+    """
+    Board state stored as a flat bytearray of tile codes, with scoring that runs on the precompiled arrays of a
+    CompactLayout. Mirrors the board methods of ScrabbleGame.
+    """
+
+    def __init__(self, layout: CompactLayout, tiles: bytes | bytearray | memoryview = None):
+        """
+        Args:
+            layout (CompactLayout): Layout shared by every board of the game.
+            tiles (bytes | bytearray | memoryview, optional): Tile code of each square. Defaults to an empty board.
+        """
+        self.layout = layout
+        self.tiles = bytearray(tiles) if tiles is not None else bytearray(layout.size)
+
+    @classmethod
+    def fromRows(cls, layout: CompactLayout, rows: list[list[str]]) -> "CompactBoard":
+        """
+        Args:
+            layout (CompactLayout): Layout shared by every board of the game.
+            rows (list[list[str]]): 2d list in the CSV board layout.
+
+        Returns:
+            CompactBoard: Board holding the same tiles.
+        """
+        return cls(layout, layout.encodeRows(rows))
+
+    def toRows(self) -> list[list[str]]:
+        """
+        Returns:
+            list[list[str]]: 2d list in the CSV board layout, as used by ScrabbleGame.
+        """
+        return self.layout.decodeTiles(self.tiles)
+
+    def copy(self) -> "CompactBoard":
+        return CompactBoard(self.layout, self.tiles)
+
+    def key(self) -> bytes:
+        """
+        Returns:
+            bytes: Immutable copy of the tiles, usable as a dictionary key for the board state.
+        """
+        return bytes(self.tiles)
+
+    def fingerprint(self) -> int:
+        """
+        Returns:
+            int: Bitmask of occupied squares, the same as ScrabbleGame.boardFingerprint for the equivalent board.
+        """
+        fingerprint = 0
+        for i in self.getTileSet():
+            fingerprint |= 1 << i
+        return fingerprint
+
+    def countPlay(self, startPair: tuple, endPair: tuple, returnTilesPlayed: bool = False):
+        """
+        Scores a play without changing the board, taking the tiles from the completed game.
+
+        Args:
+            startPair (tuple): starting coordinates (x, y)
+            endPair (tuple): ending coordinates (x, y)
+            returnTilesPlayed (bool, optional): also return the square indices of the tiles placed. Defaults to False.
+
+        Returns:
+            int | tuple[int, list[int]]: score of the play (-1 if invalid), paired with the tiles placed if requested
+        """
+        layout = self.layout
+        tiles = self.tiles
+        width = layout.width
+        values = layout.tileValues
+
+        # a play is horizontal if both ends are on the same row
+        vert = startPair[0] != endPair[0]
+        step = width if vert else 1
+        crossStep = 1 if vert else width
+        # perpendicular position of the play, used to check for squares beside it at the board edges
+        basis = startPair[1] if vert else startPair[0]
+        crossLimit = width - 1 if vert else layout.height - 1
+
+        score = 0
+        nonModifiedScore = 0
+        multiplier = 1
+        tilesUsedList = []
+
+        for i in range(startPair[0] * width + startPair[1], endPair[0] * width + endPair[1] + 1, step):
+            tile = tiles[i]
+            if tile:
+                score += values[tile]
+                continue
+
+            newTile = layout.completedTiles[i]
+            if not newTile:
+                return (-1, []) if returnTilesPlayed else -1
+            tilesUsedList.append(i)
+
+            value = values[newTile] * layout.letterMultipliers[i]
+            wordMultiplier = layout.wordMultipliers[i]
+            multiplier *= wordMultiplier
+            if (basis > 0 and tiles[i - crossStep]) or (basis < crossLimit and tiles[i + crossStep]):
+                nonModifiedScore += wordMultiplier * (value + self.countWord(i, not vert))
+            score += value
+
+        bingo = 50 if len(tilesUsedList) > 6 else 0
+        moveScore = score * multiplier + nonModifiedScore + bingo
+        if returnTilesPlayed:
+            return moveScore, tilesUsedList
+        return moveScore
+
+    def countWord(self, index: int, vert: bool) -> int:
+        """
+        Counts the unmodified score of the tiles on either side of a square along one orientation.
+
+        Args:
+            index (int): Square index (x * width + y).
+            vert (bool): Orientation of the word being counted.
+
+        Returns:
+            int: Unmodified score of the word, excluding the square itself
+        """
+        layout = self.layout
+        tiles = self.tiles
+        values = layout.tileValues
+        width = layout.width
+
+        if vert:
+            step = width
+            low = index % width
+            high = layout.size
+        else:
+            step = 1
+            low = index - index % width
+            high = low + width
+
+        score = 0
+        i = index - step
+        while i >= low and tiles[i]:
+            score += values[tiles[i]]
+            i -= step
+        i = index + step
+        while i < high and tiles[i]:
+            score += values[tiles[i]]
+            i += step
+        return score
+
+    def applyMove(self, startPair: tuple, endPair: tuple) -> tuple[int, list[int]]:
+        """
+        Plays a move in place. Invalid moves leave the board unchanged.
+
+        Args:
+            startPair (tuple): starting coordinates (x, y)
+            endPair (tuple): ending coordinates (x, y)
+
+        Returns:
+            tuple[int, list[int]]: score of the move (-1 if invalid) and the square indices of the tiles placed
+        """
+        moveScore, tilesUsedList = self.countPlay(startPair, endPair, True)
+        for i in tilesUsedList:
+            self.tiles[i] = self.layout.completedTiles[i]
+        return moveScore, tilesUsedList
+
+    def undoMove(self, tilesPlayed: list[int]) -> None:
+        """
+        Args:
+            tilesPlayed (list[int]): square indices of the tiles placed by the move being reverted
+        """
+        for i in tilesPlayed:
+            self.tiles[i] = EMPTY
+
+    def getTileSet(self) -> set[int]:
+        """
+        Returns:
+            set[int]: square indices of the tiles currently placed on the board
+        """
+        return {i for i, tile in enumerate(self.tiles) if tile}
+
+    def makeAntiBoard(self) -> "CompactBoard":
+        """
+        Returns:
+            CompactBoard: board holding only the tiles of the completed game that are not yet placed
+        """
+        completedTiles = self.layout.completedTiles
+        return CompactBoard(self.layout, bytes(0 if tile else completedTiles[i] for i, tile in enumerate(self.tiles)))
@@ -0,0 +1,96 @@
+class CrossScoreTable:
+    """
+    Cross-word scores of a board, kept for every square and orientation: the unmodified sum of the tiles directly above
+    and below the square (vertical) or to its left and right (horizontal), or None if the square has no tile next to it
+    along that orientation. Placing a tile on an empty square scores its cross word as the square's value plus this sum,
+    so scoring a play reads one entry per new tile instead of walking the board. As tiles are placed or taken back, only
+    the empty squares at the ends of the runs through the changed squares are recomputed.
+    """
+
+    def __init__(self, game, board: list[list[str]]):
+        """
+        Args:
+            game (ScrabbleGame): Game providing the tile values.
+            board (list[list[str]]): 2d list representing the board the table follows. The table must be updated
+                with update whenever tiles are placed on or taken back off it.
+        """
+        self.game = game
+        self.board = board
+        self.height = len(board)
+        self.width = len(board[0])
+        self.updates = 0
+
+        # indexed by orientation (False for horizontal, True for vertical), then by square (x * width + y)
+        self.scores: tuple[list[int | None], list[int | None]] = (
+            [None] * (self.height * self.width),
+            [None] * (self.height * self.width),
+        )
+        for x in range(self.height):
+            for y in range(self.width):
+                if not game.isTile(board[x][y]):
+                    self.scores[False][x * self.width + y] = self.computeScore(x, y, False)
+                    self.scores[True][x * self.width + y] = self.computeScore(x, y, True)
+
+    def get(self, coords: tuple[int, int], vert: bool) -> int | None:
+        """
+        Args:
+            coords (tuple[int, int]): Coordinates of an empty square.
+            vert (bool): Orientation of the cross word (True for vertical).
+
+        Returns:
+            int | None: Unmodified score of the tiles next to the square along the orientation, or None if there are none.
+        """
+        return self.scores[vert][coords[0] * self.width + coords[1]]
+
+    def computeScore(self, x: int, y: int, vert: bool) -> int | None:
+        """
+        Walks the board outward from an empty square to sum the tiles next to it along one orientation.
+
+        Args:
+            x (int): Row of the square.
+            y (int): Column of the square.
+            vert (bool): Orientation to walk along (True for vertical).
+
+        Returns:
+            int | None: Unmodified score of the tiles next to the square, or None if there are none.
+        """
+        board = self.board
+        tileValues = self.game.tileValues
+        dx, dy = (1, 0) if vert else (0, 1)
+        score = 0
+        found = False
+        for direction in (-1, 1):
+            i, j = x + direction * dx, y + direction * dy
+            while 0 <= i < self.height and 0 <= j < self.width and self.game.isTile(board[i][j]):
+                score += tileValues[board[i][j]]
+                found = True
+                i, j = i + direction * dx, j + direction * dy
+        return score if found else None
+
+    def update(self, squares: list[tuple[int, int]]) -> None:
+        """
+        Recomputes the entries affected by tiles having been placed on or taken back off some squares of the board.
+        Along each orientation, these are the changed squares themselves and the first empty square past either end of
+        the run of tiles through each of them.
+
+        Args:
+            squares (list[tuple[int, int]]): Coordinates of the squares that changed.
+        """
+        board = self.board
+        isTile = self.game.isTile
+        for vert in (False, True):
+            dx, dy = (1, 0) if vert else (0, 1)
+            dirty = set()
+            for x, y in squares:
+                dirty.add((x, y))
+                for direction in (-1, 1):
+                    i, j = x + direction * dx, y + direction * dy
+                    while 0 <= i < self.height and 0 <= j < self.width and isTile(board[i][j]):
+                        i, j = i + direction * dx, j + direction * dy
+                    if 0 <= i < self.height and 0 <= j < self.width:
+                        dirty.add((i, j))
+
+            scores = self.scores[vert]
+            for x, y in dirty:
+                self.updates += 1
+                scores[x * self.width + y] = None if isTile(board[x][y]) else self.computeScore(x, y, vert)
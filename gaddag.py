@@ -0,0 +1,226 @@
+import argparse
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator
+
+MAGIC = b"GDAG"
+FORMAT_VERSION = 1
+
+# magic, format version, number of nodes, number of edges
+HEADER = struct.Struct("<4sHII")
+
+# label of the edge between the reversed part of a word (read leftward from the square a play starts from) and the
+# rest of it (read rightward)
+SEPARATOR = "+"
+SEPARATOR_LABEL = ord(SEPARATOR)
+
+
+class Gaddag:
+    """
+    GADDAG of a word list: every word is stored once per letter, as the letters up to that one reversed, the separator,
+    then the letters after it, so a play can be read outward from any square of it. The graph is minimized (identical
+    subgraphs are stored once) and kept in flat arrays: the edges of each node are a contiguous range of labels and
+    targets, found with a byte search, and node 0 is the root. The arrays are written to and read from disk as is.
+    """
+
+    def __init__(self, firstEdges: array, terminals: bytes, labels: bytes, targets: array):
+        """
+        Args:
+            firstEdges (array): Index of the first edge of each node, with the number of edges last (unsigned 32 bit).
+            terminals (bytes): 1 for each node that ends a word, otherwise 0.
+            labels (bytes): Label of each edge (an uppercase letter or the separator).
+            targets (array): Node each edge leads to (unsigned 32 bit).
+        """
+        self.firstEdges = firstEdges
+        self.terminals = terminals
+        self.labels = labels
+        self.targets = targets
+
+    def __len__(self) -> int:
+        return len(self.terminals)
+
+    @classmethod
+    def fromWords(cls, words: Iterable[str]) -> "Gaddag":
+        """
+        Builds the GADDAG of some words, adding the paths in sorted order and merging each finished subgraph with an
+        identical one already built (incremental construction of a minimal automaton from sorted input).
+
+        Args:
+            words (Iterable[str]): Words to store. They are uppercased, and words of fewer than 2 letters or with
+                characters other than letters are skipped.
+
+        Returns:
+            Gaddag: GADDAG of the words.
+        """
+        paths = sorted({
+            word[:i][::-1] + SEPARATOR + word[i:]
+            for word in (word.strip().upper() for word in words)
+            if len(word) > 1 and word.isascii() and word.isalpha()
+            for i in range(1, len(word) + 1)
+        })
+
+        # nodes being built, as whether they end a word and their edges by label
+        terminals = [False]
+        edges: list[dict[str, int] | None] = [{}]
+        # finished nodes by their ending flag and edges, so that an identical node is stored once
+        register: dict[tuple, int] = {}
+        # edges on the path of the last word added whose target may still change, as (parent, label, child)
+        unchecked: list[tuple[int, str, int]] = []
+
+        def minimize(depth: int) -> None:
+            while len(unchecked) > depth:
+                parent, label, child = unchecked.pop()
+                key = (terminals[child], tuple(sorted(edges[child].items())))
+                if key in register:
+                    edges[parent][label] = register[key]
+                    edges[child] = None
+                else:
+                    register[key] = child
+
+        previous = ""
+        for path in paths:
+            common = 0
+            while common < min(len(path), len(previous)) and path[common] == previous[common]:
+                common += 1
+            minimize(common)
+            node = unchecked[-1][2] if unchecked else 0
+            for label in path[common:]:
+                terminals.append(False)
+                edges.append({})
+                edges[node][label] = len(edges) - 1
+                unchecked.append((node, label, len(edges) - 1))
+                node = len(edges) - 1
+            terminals[node] = True
+            previous = path
+        minimize(0)
+
+        # number the nodes still reachable from the root in breadth-first order and lay them out flat
+        numbers = {0: 0}
+        order = [0]
+        for node in order:
+            for label, child in sorted(edges[node].items()):
+                if child not in numbers:
+                    numbers[child] = len(order)
+                    order.append(child)
+        firstEdges = array("I")
+        labels = bytearray()
+        targets = array("I")
+        for node in order:
+            firstEdges.append(len(labels))
+            for label, child in sorted(edges[node].items()):
+                labels.append(ord(label))
+                targets.append(numbers[child])
+        firstEdges.append(len(labels))
+        return cls(firstEdges, bytes(terminals[node] for node in order), bytes(labels), targets)
+
+    @classmethod
+    def fromWordList(cls, wordFile: str) -> "Gaddag":
+        """
+        Args:
+            wordFile (str): Text file with one word per line.
+
+        Returns:
+            Gaddag: GADDAG of the words in the file.
+        """
+        with open(wordFile, "r", encoding="utf-8") as file:
+            return cls.fromWords(file)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the GADDAG to a binary file: a header, then the edge offsets, ending flags, labels and targets.
+
+        Args:
+            path (str): Path of the file to write.
+        """
+        firstEdges, targets = array("I", self.firstEdges), array("I", self.targets)
+        if sys.byteorder == "big":
+            firstEdges.byteswap()
+            targets.byteswap()
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(self.terminals), len(self.labels)))
+            file.write(firstEdges.tobytes())
+            file.write(self.terminals)
+            file.write(self.labels)
+            file.write(targets.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Gaddag":
+        """
+        Args:
+            path (str): Path of a file written by save.
+
+        Returns:
+            Gaddag: GADDAG read from the file.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, numNodes, numEdges = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a GADDAG file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported GADDAG format version {version}")
+
+        offset = HEADER.size
+        firstEdges = array("I")
+        firstEdges.frombytes(data[offset:offset + 4 * (numNodes + 1)])
+        offset += 4 * (numNodes + 1)
+        terminals = data[offset:offset + numNodes]
+        offset += numNodes
+        labels = data[offset:offset + numEdges]
+        offset += numEdges
+        targets = array("I")
+        targets.frombytes(data[offset:offset + 4 * numEdges])
+        if sys.byteorder == "big":
+            firstEdges.byteswap()
+            targets.byteswap()
+        return cls(firstEdges, terminals, labels, targets)
+
+    def child(self, node: int, label: int) -> int:
+        """
+        Args:
+            node (int): Node to follow an edge from.
+            label (int): Label of the edge (ord of a letter or of the separator).
+
+        Returns:
+            int: Node the edge leads to, or -1 if the node has no such edge.
+        """
+        i = self.labels.find(label, self.firstEdges[node], self.firstEdges[node + 1])
+        return self.targets[i] if i >= 0 else -1
+
+    def edges(self, node: int) -> Iterator[tuple[int, int]]:
+        """
+        Args:
+            node (int): Node to list the edges of.
+
+        Yields:
+            tuple[int, int]: Label and target of each edge, in label order.
+        """
+        for i in range(self.firstEdges[node], self.firstEdges[node + 1]):
+            yield self.labels[i], self.targets[i]
+
+    def isWord(self, word: str) -> bool:
+        """
+        Args:
+            word (str): Uppercase word.
+
+        Returns:
+            bool: True if the word is in the word list.
+        """
+        node = 0
+        for label in word[:1] + SEPARATOR + word[1:]:
+            node = self.child(node, ord(label))
+            if node < 0:
+                return False
+        return bool(self.terminals[node])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a GADDAG file from a word list.")
+    parser.add_argument("wordFile", help="text file with one word per line")
+    parser.add_argument("output", help="GADDAG file to write")
+    args = parser.parse_args()
+
+    gaddag = Gaddag.fromWordList(args.wordFile)
+    gaddag.save(args.output)
+    print(f"{len(gaddag)} nodes, {len(gaddag.labels)} edges", file=sys.stderr)
@@ -1,5 +1,24 @@
 from ScrabbleGame import ScrabbleGame
+from compact_board import CompactBoard
+from transposition_table import TranspositionTable
+from search_stats import SearchStats
+from segment_index import SegmentIndex
+from placement_dag import PlacementDag
+from score_table import SegmentScoreTable
+from cross_scores import CrossScoreTable
+from solution_dag import SolutionDag
+from move_ordering import FIRST_SOLUTION_ORDERING
+try:
+    from batch_scoring import BatchScorer
+except ImportError:
+    # NumPy is optional, and only needed for batch scoring
+    BatchScorer = None
+import parallel_traceback
+import iterative_traceback
+import bidirectional_traceback
 from collections import deque
+from typing import Callable, Iterator
+import time
 
 
 class ScrabbleTraceback(ScrabbleGame):
@@ -8,25 +27,231 @@ class ScrabbleTraceback(ScrabbleGame):
     ScrabbleGame to utilize its methods for reading game data and scoring.
     """
     
-    def __init__(self, scoresFile: str = "scores1.txt", tileFile: str = "tileInfo.json", boardFile: str = "board.csv", gameFile: str = "Game1.csv"):
+    def __init__(self, scoresFile: str = "scores1.txt", tileFile: str = "tileInfo.json", boardFile: str = "board.csv", gameFile: str = "Game1.csv", memoSize: int = 200000):
         super().__init__()
+        
+        # Search data derived from the game by prepareSearch
+        self.segmentIndex = None
+        self.placementDag = None
+        self.batchScorer = None
+        self.scoreBounds = None
+        self.segmentsByBound = None
+        self.movesRemaining = None
+        self.maxTilesRemaining = None
+        self.maxTargetRemaining = None
+        
         self.setBoardAndScores(scoresFile, tileFile, boardFile, gameFile)
+        
+        # Memo of searched states (board fingerprint and move index) to their solution suffixes
+        self.memo = TranspositionTable(memoSize)
+        
+        # Deadline (time.monotonic) of the running search, and whether the search stopped because of it
+        self.deadline = None
+        self.timedOut = False
+        # Optional event (e.g. multiprocessing.Event) that stops the search when set, and whether the search was stopped early
+        self.stopEvent = None
+        self.searchStopped = False
+        
+        # Tiles left for the board being searched, its cross-word scores and the scores of its open segments, updated as
+        # moves are applied and undone
+        self.searchBag = None
+        self.crossScores = None
+        self.scoreTable = None
+        self.useScoreTable = True
+        # Scores the candidates of boards without a score table in one vectorized pass (needs NumPy, see batch_scoring)
+        self.useBatchScoring = BatchScorer is not None
+        
+        # Boards after meetIndex moves found by the backward half of bidirectionalTraceback, mapped to the sequences of
+        # moves that complete them, which the forward search joins on instead of searching further
+        self.meetIndex = None
+        self.meetFrontier = None
+        
+        # Optional order to try the moves of each node in (see move_ordering.MoveOrdering), None to try them as found
+        self.moveOrdering = None
+        
+        # Opt-in search instrumentation (see enableStats)
+        self.stats = None
+        
+    def __getstate__(self) -> dict:
+        """Drops the memo contents and the stop event when pickling (e.g. to send the game to worker processes)."""
+        state = self.__dict__.copy()
+        state["memo"] = TranspositionTable(self.memo.maxSize)
+        state["stopEvent"] = None
+        state["crossScores"] = None
+        state["scoreTable"] = None
+        return state
+        
+
+    def enableStats(self, emitInterval: float = None, emitCallback: Callable[[str], None] = None) -> SearchStats:
+        """
+        Turns on search instrumentation. The stats are reset at the start of each traceback and are available in the
+        stats attribute.
+
+        Args:
+            emitInterval (float, optional): Seconds between periodic emissions of the stats during a search. Defaults to None (never emit).
+            emitCallback (Callable[[str], None], optional): Function receiving the JSON stats on each emission. Defaults to print.
+
+        Returns:
+            SearchStats: The stats object being updated by the search.
+        """
+        self.stats = SearchStats(emitInterval, emitCallback)
+        return self.stats
+
+    def disableStats(self) -> None:
+        """Turns off search instrumentation."""
+        self.stats = None
+
+    def setBoardAndScores(self, scoresFile: str, tileFile: str, boardFile: str, gameFile: str = None) -> None:
+        """Reads the game data from files (see ScrabbleGame.setBoardAndScores) and prepares the search data for it.
+
+        Args:
+            scoresFile (str): TXT file containing scores for each move.
+            tileFile (str): JSON file containing tile values and counts.
+            boardFile (str): CSV file containing the empty board layout.
+            gameFile (str, optional): CSV file containing the completed board. Defaults to None.
+        """
+        super().setBoardAndScores(scoresFile, tileFile, boardFile, gameFile)
+        if self.completedGame:
+            self.prepareSearch()
+
+    def loadGame(self, scoresFile: str, gameFile: str) -> None:
+        """
+        Replaces the game being reconstructed, keeping the board layout and tile info already read. Used to run many
+        games on one object without reading the shared files again.
+
+        Args:
+            scoresFile (str): TXT file containing scores for each move.
+            gameFile (str): CSV file containing the completed board.
+        """
+        self.setScores(scoresFile)
+        self.setCompletedGame(gameFile)
+        self.setGameData(self.moveScores, self.completedGame)
+
+    def setGameData(self, moveScores: list[int], completedGame: list[list[str]]) -> None:
+        """Sets the game data (see ScrabbleGame.setGameData) and prepares the search data for it.
+
+        Args:
+            moveScores (list[int]): Score of each move.
+            completedGame (list[list[str]]): 2d list of the completed board.
+        """
+        super().setGameData(moveScores, completedGame)
+        self.memo.clear()
+        self.prepareSearch()
+
+    def prepareSearch(self) -> None:
+        """
+        Builds the data the search derives from the game: the index of candidate segments without the ones the order
+        constraints of the completed board rule out, an upper bound on the score of each segment, and for each move index the number of moves left, the most tiles they can place and the highest
+        score among them. Must be called again if the game data is changed through the individual setters.
+        """
         self.numMoves = len(self.moveScores)
-        self.START_COORDS = (7, 7) # Assuming the center of the board is (7, 7)
+        self.segmentIndex = SegmentIndex(self.completedGame, self.boardLayout.startCoords)
+        self.placementDag = PlacementDag(self.segmentIndex)
+        self.segmentIndex.removeSegments(self.placementDag.deadMoves)
+        # built on first use (see getBatchScorer)
+        self.batchScorer = None
+        
+        # Upper bound on the score of each segment, and the segments from highest to lowest bound
+        self.scoreBounds = {segment.move: self.segmentScoreBound(segment.move) for segment in self.segmentIndex.segments}
+        self.segmentsByBound = sorted(self.segmentIndex.segments, key=lambda segment: self.scoreBounds[segment.move], reverse=True)
         
+        # Tables for the moves from each index up to the deduction entry
+        # (at most 7 tiles per move, and at most 6 for a score too low to include the 50 point bingo bonus)
+        self.movesRemaining = [0] * (self.numMoves + 1)
+        self.maxTilesRemaining = [0] * (self.numMoves + 1)
+        self.maxTargetRemaining = [0] * (self.numMoves + 1)
+        lastMove = next((i for i, score in enumerate(self.moveScores) if score < 0), self.numMoves)
+        for i in range(lastMove - 1, -1, -1):
+            score = self.moveScores[i]
+            self.movesRemaining[i] = self.movesRemaining[i + 1] + 1
+            self.maxTilesRemaining[i] = self.maxTilesRemaining[i + 1] + (7 if score >= 50 else 6)
+            self.maxTargetRemaining[i] = max(self.maxTargetRemaining[i + 1], score)
 
-    def traceback(self) -> list[deque[tuple[tuple[int, int], tuple[int, int]]]] | None:
+    def getBatchScorer(self) -> "BatchScorer":
+        """
+        Returns the vectorized scorer of the segments of this game, building it on first use.
+
+        Returns:
+            BatchScorer: Scorer for the segment index built by prepareSearch.
+        """
+        if self.batchScorer is None:
+            self.batchScorer = BatchScorer(self)
+        return self.batchScorer
+
+    def segmentScoreBound(self, move: tuple[tuple[int, int], tuple[int, int]]) -> int:
+        """
+        Upper bound on the score of a segment on any board, found by scoring it as if every square were a newly placed
+        tile, with the full perpendicular runs of the completed game as cross words and the bingo bonus if it is long enough.
+
+        Args:
+            move (tuple[tuple[int, int], tuple[int, int]]): Start and end coordinates of the segment.
+
+        Returns:
+            int: Highest score the segment can be worth.
+        """
+        layout = self.getCompactLayout()
+        completedBoard = CompactBoard(layout, layout.completedTiles)
+        width = layout.width
+        vert, basis, start, end = self.coordsToVertBoolAndCoords(*move)
+        crossStep = 1 if vert else width
+        crossLimit = width - 1 if vert else layout.height - 1
+        
+        score = 0
+        crossScore = 0
+        multiplier = 1
+        for i in range(start, end + 1):
+            index = i * width + basis if vert else basis * width + i
+            value = layout.tileValues[layout.completedTiles[index]] * layout.letterMultipliers[index]
+            wordMultiplier = layout.wordMultipliers[index]
+            multiplier *= wordMultiplier
+            score += value
+            if (basis > 0 and layout.completedTiles[index - crossStep]) or (basis < crossLimit and layout.completedTiles[index + crossStep]):
+                crossScore += wordMultiplier * (value + completedBoard.countWord(index, not vert))
+        
+        bingo = 50 if end - start + 1 > 6 else 0
+        return score * multiplier + crossScore + bingo
+
+    def isFeasible(self, placedMask: int, moveIndex: int) -> bool:
+        """
+        Cheap check of whether the game can still be completed from a board. The tiles left to place must fit in the
+        moves left (at least 1 and at most 7 each), and some segment with squares left to fill must be able to reach
+        the highest score among the moves left. Segments with a tile on a flank square are left out, as they can no longer
+        be played.
+
+        Args:
+            placedMask (int): Bitmask of squares that already have a tile (see ScrabbleGame.boardFingerprint).
+            moveIndex (int): Index of the moveScores attribute list for the next move.
+
+        Returns:
+            bool: False if the board cannot lead to a solution.
+        """
+        unplacedMask = self.segmentIndex.completedMask & ~placedMask
+        tilesLeft = unplacedMask.bit_count()
+        if not self.movesRemaining[moveIndex] <= tilesLeft <= self.maxTilesRemaining[moveIndex]:
+            return False
+        
+        # segments are sorted by bound, so the first playable one with an empty square has the highest bound
+        for segment in self.segmentsByBound:
+            if segment.mask & unplacedMask and not segment.flankMask & placedMask:
+                return self.scoreBounds[segment.move] >= self.maxTargetRemaining[moveIndex]
+        return self.movesRemaining[moveIndex] == 0
+
+    def traceback(self, limit: int = None, timeout: float = None) -> list[deque[tuple[tuple[int, int], tuple[int, int]]]] | None:
         """
         Main function to start the traceback process.
         Finds all possible combinations of moves that lead to the completed game state as specified
         in the board csv and scores txt files. 
 
+        Args:
+            limit (int, optional): Maximum number of move sequences to find. Defaults to None (find all).
+            timeout (float, optional): Seconds after which the search stops. Defaults to None (no time limit).
+
         Returns:
             list[deque[tuple[tuple[int, int], tuple[int, int]]]] | None: List of deques, each containing a sequence of tuples representing
             moves made in the game using two pairs of ints to represent the start and end coordinates of each move. Returns None
             if no valid sequence of moves is found.
         """
-        moveList = self.tracebackRecursive(self.currentBoard, 0)
+        moveList = [deque(moveSeq) for moveSeq in self.iterTraceback(limit, timeout)]
         if not moveList:
             print(self.FAILURE_MESSAGE)
             return
@@ -36,194 +261,475 @@ class ScrabbleTraceback(ScrabbleGame):
         
         return moveList
 
+    def iterTraceback(self, limit: int = None, timeout: float = None) -> Iterator[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]:
+        """
+        Generator version of traceback that yields each sequence of moves as soon as it is found, so callers that only need
+        the first reconstruction do not wait for the whole search. If the timeout is reached, the generator stops and
+        the timedOut attribute is set to True.
+
+        Args:
+            limit (int, optional): Maximum number of move sequences to yield. Defaults to None (yield all).
+            timeout (float, optional): Seconds after which the search stops. Defaults to None (no time limit).
+
+        Yields:
+            tuple[tuple[tuple[int, int], tuple[int, int]], ...]: Sequence of moves, each represented as a tuple of two pairs of ints
+            for the start and end coordinates of the move.
+        """
+        # Results are only valid for the current game data, so start each traceback with an empty memo
+        self.memo.clear()
+        self.timedOut = False
+        self.searchStopped = False
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        if self.stats is not None:
+            self.stats.reset()
+        
+        if limit is not None and limit <= 0:
+            return
+        
+        # Moves are applied to and undone on a working copy of the board during the search
+        board = self.startSearch()
+        found = 0
+        for moveSeq in self.tracebackRecursive(board, 0):
+            yield moveSeq
+            found += 1
+            if limit is not None and found >= limit:
+                return
+
+    def solutionDag(self, timeout: float = None, keepEdges: bool = True) -> SolutionDag:
+        """
+        Searches the whole game and returns every reconstruction as a shared-suffix DAG instead of a list of sequences,
+        so memory grows with the number of states searched rather than the number of solutions. Sequences can then be
+        enumerated, indexed or sampled from the DAG on demand. If the timeout is reached, the DAG holds what was found
+        and its complete attribute is False.
+
+        Args:
+            timeout (float, optional): Seconds after which the search stops. Defaults to None (no time limit).
+            keepEdges (bool, optional): Store the moves between states. Defaults to True.
+
+        Returns:
+            SolutionDag: States and moves of every reconstruction found.
+        """
+        self.timedOut = False
+        self.searchStopped = False
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        if self.stats is not None:
+            self.stats.reset()
+        
+        dag = SolutionDag(keepEdges)
+        board = self.startSearch()
+        dag.root = (self.boardFingerprint(board), 0)
+        self.dagRecursive(board, 0, dag)
+        dag.complete = not self.searchStopped
+        return dag
+
+    def countSolutions(self, timeout: float = None) -> int:
+        """
+        Counts the valid reconstructions of the game without materializing them (see solutionDag).
+
+        Args:
+            timeout (float, optional): Seconds after which the search stops, in which case the count is a lower bound
+            and the timedOut attribute is True. Defaults to None (no time limit).
+
+        Returns:
+            int: Number of sequences of moves that lead to the completed game.
+        """
+        return self.solutionDag(timeout, keepEdges=False).count()
+
+    def firstSolution(self, timeout: float = None, moveOrdering: Callable = FIRST_SOLUTION_ORDERING) -> tuple[tuple[tuple[int, int], tuple[int, int]], ...] | None:
+        """
+        Searches for a single reconstruction, trying the moves of each node in the given order so the search heads
+        for the most constrained, most likely moves first.
+
+        Args:
+            timeout (float, optional): Seconds after which the search stops. Defaults to None (no time limit).
+            moveOrdering (Callable, optional): Move ordering to use for this search (see move_ordering). Defaults to
+                FIRST_SOLUTION_ORDERING.
+
+        Returns:
+            tuple[tuple[tuple[int, int], tuple[int, int]], ...] | None: The first sequence of moves found, or None if there
+            is none (or the search timed out).
+        """
+        previousOrdering = self.moveOrdering
+        self.moveOrdering = moveOrdering
+        try:
+            return next(self.iterTraceback(1, timeout), None)
+        finally:
+            self.moveOrdering = previousOrdering
+
+    def parallelTraceback(self, workers: int = None, splitDepth: int = 1, limit: int = None, timeout: float = None) -> list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]:
+        """
+        Runs the traceback over a pool of worker processes. The first splitDepth moves are expanded in this process and the
+        subtree below each of them is searched by a worker. Results are merged in the order of the expanded moves, so they
+        do not depend on which worker finishes first. Once limit sequences are found, the remaining workers are stopped.
+
+        Args:
+            workers (int, optional): Number of worker processes. Defaults to None (one per CPU).
+            splitDepth (int, optional): Number of moves expanded before handing subtrees to workers. Defaults to 1.
+            limit (int, optional): Maximum number of move sequences to find. Defaults to None (find all).
+            timeout (float, optional): Seconds after which the search stops. Defaults to None (no time limit).
+
+        Returns:
+            list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]: Sequences of moves found, each move represented as
+            a tuple of two pairs of ints for its start and end coordinates.
+        """
+        return parallel_traceback.parallelTraceback(self, workers, splitDepth, limit, timeout)
+
+    def iterativeTraceback(self, checkpointFile: str = None, checkpointInterval: float = 60.0, limit: int = None, timeout: float = None) -> list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]:
+        """
+        Runs the traceback with an explicit stack instead of recursion, periodically writing the search frontier and the
+        solutions found so far to a checkpoint file. A search that is stopped or killed can be continued with resumeTraceback.
+
+        Args:
+            checkpointFile (str, optional): JSON file to write checkpoints to. Defaults to None (no checkpoints).
+            checkpointInterval (float, optional): Seconds between checkpoints. Defaults to 60.0.
+            limit (int, optional): Maximum number of move sequences to find. Defaults to None (find all).
+            timeout (float, optional): Seconds after which the search stops. Defaults to None (no time limit).
+
+        Returns:
+            list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]: Sequences of moves found, each move represented as
+            a tuple of two pairs of ints for its start and end coordinates.
+        """
+        return iterative_traceback.iterativeTraceback(self, checkpointFile, checkpointInterval, limit, timeout)
+
+    def resumeTraceback(self, checkpointFile: str, checkpointInterval: float = 60.0, limit: int = None, timeout: float = None) -> list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]:
+        """
+        Continues a search from a checkpoint written by iterativeTraceback, for the same game.
+
+        Args:
+            checkpointFile (str): JSON file to resume from, which keeps receiving checkpoints.
+            checkpointInterval (float, optional): Seconds between checkpoints. Defaults to 60.0.
+            limit (int, optional): Maximum number of move sequences to find, counting those in the checkpoint. Defaults to None (find all).
+            timeout (float, optional): Seconds after which the search stops. Defaults to None (no time limit).
+
+        Returns:
+            list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]: Sequences of moves found, including those in the checkpoint.
+        """
+        return iterative_traceback.iterativeTraceback(self, checkpointFile, checkpointInterval, limit, timeout, resume=True)
+
+    def bidirectionalTraceback(self, meetIndex: int = None, limit: int = None, timeout: float = None) -> list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]:
+        """
+        Runs the traceback from both ends. Moves are taken back one at a time from the completed board, each one a run
+        of tiles whose removal leaves a connected board and whose score matches the scores entry, down to meetIndex.
+        The forward search then plays the first meetIndex moves and joins the boards it reaches on their fingerprints,
+        so each half only searches about half of the moves.
+
+        Args:
+            meetIndex (int, optional): Move index where the searches meet. Defaults to None (half of the moves).
+            limit (int, optional): Maximum number of move sequences to find. Defaults to None (find all).
+            timeout (float, optional): Seconds after which the search stops. Defaults to None (no time limit).
+
+        Returns:
+            list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]: Sequences of moves found, each move represented as
+            a tuple of two pairs of ints for its start and end coordinates.
+        """
+        return bidirectional_traceback.bidirectionalTraceback(self, meetIndex, limit, timeout)
+
+    def startSearch(self, board: list[list[str]] = None) -> list[list[str]]:
+        """
+        Sets up the state kept in step with the board during a search: the bag of tiles left, the cross-word scores and,
+        if useScoreTable is set, the table of segment scores. Moves must then be applied with playSearchMove and undone with takeBackSearchMove.
+
+        Args:
+            board (list[list[str]], optional): Board to search from. Defaults to a copy of the current board.
+
+        Returns:
+            list[list[str]]: The board to search on.
+        """
+        if board is None:
+            board = [row[:] for row in self.currentBoard]
+        self.searchBag = self.getRemainingBag(board)
+        self.crossScores = CrossScoreTable(self, board)
+        self.scoreTable = SegmentScoreTable(self, board) if self.useScoreTable else None
+        return board
+
+    def playSearchMove(self, move: tuple[tuple[int, int], tuple[int, int]], board: list[list[str]]) -> list[tuple]:
+        """
+        Applies a move to the board being searched, updating the bag of tiles left, the cross-word scores and the score
+        table.
+
+        Args:
+            move (tuple[tuple[int, int], tuple[int, int]]): Start and end coordinates of the move.
+            board (list[list[str]]): Board set up with startSearch.
+
+        Returns:
+            list[tuple]: Coordinates of the tiles placed, to pass to takeBackSearchMove.
+        """
+        _, tilesPlayed = self.applyMove(move[0], move[1], board, self.searchBag, self.crossScores)
+        if self.scoreTable is not None:
+            self.scoreTable.applyMove(tilesPlayed, board)
+        return tilesPlayed
+
+    def takeBackSearchMove(self, tilesPlayed: list[tuple], board: list[list[str]]) -> None:
+        """
+        Undoes the last move applied with playSearchMove.
+
+        Args:
+            tilesPlayed (list[tuple]): Coordinates of the tiles placed by the move.
+            board (list[list[str]]): Board set up with startSearch.
+        """
+        self.undoMove(tilesPlayed, board, self.searchBag, self.crossScores)
+        if self.scoreTable is not None:
+            self.scoreTable.undoMove()
+
+    def searchExpired(self) -> bool:
+        """
+        Checks whether the current search should stop, either because it has run past its deadline (recorded in the
+        timedOut attribute) or because the stop event has been set.
+
+        Returns:
+            bool: True if the search should stop.
+        """
+        if not self.searchStopped:
+            if self.deadline is not None and time.monotonic() > self.deadline:
+                self.timedOut = True
+                self.searchStopped = True
+            elif self.stopEvent is not None and self.stopEvent.is_set():
+                self.searchStopped = True
+        return self.searchStopped
     
-    def tracebackRecursive(self, board: list[list[str]], moveIndex: int) -> list[deque[tuple[tuple[int, int], tuple[int, int]]]] | None:
+    def tracebackRecursive(self, board: list[list[str]], moveIndex: int) -> Iterator[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]:
         """
-        Given the game board and an index (move number), attempts to find all possible sequences of moves recursively that match the target scores
-        from the moveScores attribute, with the move number used to get the target score. 
+        Given the game board and an index (move number), recursively finds all possible sequences of moves that match the target scores
+        from the moveScores attribute, with the move number used to get the target score. Sequences are yielded as they are found.
 
         Args:
-            board (list[list[str]]): 2d list representing the current state of the board.
+            board (list[list[str]]): 2d list representing the current state of the board. Moves are applied to it in
+            place and undone afterwards, so it is unchanged once the generator finishes or is closed. The board must have
+            been set up with startSearch.
             moveIndex (int): Index of the moveScores attribute list to get the target score for the current move.
 
-        Returns:
-            list[deque[tuple[tuple[int, int], tuple[int, int]]]] | None: List of deques, each containing a sequence of tuples representing
-            moves made in the game using two pairs of ints to represent the start and end coordinates of each move. Returns None
-            if no move is found that matches the target score.
+        Yields:
+            tuple[tuple[tuple[int, int], tuple[int, int]], ...]: Sequence of the remaining moves in the game, each represented
+            as a tuple of two pairs of ints for the start and end coordinates of the move. Nothing is yielded if no move is found
+            that matches the target score.
         """
         # Get the target score
         score: int = self.moveScores[moveIndex]
         
+        stats = self.stats
+        if stats is not None:
+            stats.clockDepth(moveIndex)
+            stats.nodesPerDepth[moveIndex] += 1
+            stats.maybeEmit()
+        
         # Base case:
         # Penultimate move entry should be negative, and should be right after the last move 
         # (this is the deduction for having tiles remaining after the game ends)
         if score < 0:
-            # TODO: check tile bag to see if deduction matches remaining tiles
-            return [deque()]
+            # The deduction must match the value of the tiles left unplayed
+            if self.searchBag.remainingValue == -score:
+                if stats is not None:
+                    stats.clockDepth(None)
+                yield ()
+            return
         
-        # Set used to hold all possible moves for the current board and index
-        moveSet: set[tuple[tuple[int, int], tuple[int, int]]] = set()
+        # Reuse the result if this board has already been searched at this move index
+        # (different move orders often reach the same board)
+        placedMask = self.boardFingerprint(board)
         
-        # List is used for all sequences of moves from the next recursive call
-        moveSeqList: list[deque[tuple[tuple[int, int], tuple[int, int]]]] = []
+        # Join the backward half of a bidirectional search where the two meet
+        if moveIndex == self.meetIndex:
+            if stats is not None:
+                stats.clockDepth(None)
+            yield from self.meetFrontier.get(placedMask, ())
+            return
         
-        # Check for all squares that are either the starting coordinates or tiles on the board
-        # (this is where moves can be build from)
-        for i in range(len(board)):
-            for j in range(len(board[0])):
-                if (i, j) == self.START_COORDS or self.isTile(board[i][j]):
-                    # search for all valid moves and add them to the moveSet
-                    moveSet.update(self.searchMoves((i, j), board, score))
+        memoKey = (placedMask, moveIndex)
+        memoSuffixes = self.memo.get(memoKey)
+        if memoSuffixes is not None:
+            if stats is not None:
+                stats.memoHits += 1
+                stats.clockDepth(None)
+            yield from memoSuffixes
+            return
         
-        # Return None if no moves are found (end of recursive branch)
-        if not moveSet:
+        # Prune boards that cannot be completed before scoring any segment
+        if not self.isFeasible(placedMask, moveIndex):
+            if stats is not None:
+                stats.nodesPruned += 1
+            self.memo.store(memoKey, ())
             return
         
-        for move in moveSet:
+        if self.searchExpired():
+            return
+        
+        # List of all sequences of moves found from this board, stored in the memo once the search of it is complete
+        moveSeqList: list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]] = []
+        
+        # Set of all possible moves for the current board and index
+        moveSet: set[tuple[tuple[int, int], tuple[int, int]]] = self.searchMoves(board, score, placedMask)
+        if stats is not None:
+            # each move is scored again when it is applied
+            stats.countPlayCalls += len(moveSet)
+        
+        moves = self.moveOrdering(self, board, moveIndex, moveSet) if self.moveOrdering is not None else moveSet
+        for move in moves:
             # Recursive call:
-            # Get the next board by using countPlay and call the function for the next move index
-            nextMoveList: list[deque[tuple[tuple[int, int], tuple[int, int]]]] = self.tracebackRecursive(self.countPlay(move[0], move[1], board, False, True)[1], moveIndex + 1)
-            # No possible moves found after the current move
-            # (end of recursive branch)
-            if not nextMoveList: 
-                continue
-            # Prepend the current move to each deque in nextMoveList and add the deque to the moveSeqList
-            for moveDeque in nextMoveList:
-                moveDeque.appendleft(move)
-                moveSeqList.append(moveDeque)
-            
-        return moveSeqList
+            # Play the move on the board, search from the next move index, then take the move back
+            tilesPlayed = self.playSearchMove(move, board)
+            try:
+                # Prepend the current move to each sequence found after it
+                for nextMoveSeq in self.tracebackRecursive(board, moveIndex + 1):
+                    if stats is not None:
+                        stats.clockDepth(moveIndex)
+                    moveSeq = (move,) + nextMoveSeq
+                    moveSeqList.append(moveSeq)
+                    # The clock stops while the consumer holds the sequence, and the deepest node resumes it
+                    if stats is not None:
+                        stats.clockDepth(None)
+                    yield moveSeq
+            finally:
+                if stats is not None:
+                    stats.clockDepth(moveIndex)
+                self.takeBackSearchMove(tilesPlayed, board)
+        
+        # A search that was stopped early is incomplete, so it must not be reused
+        if not self.searchStopped:
+            self.memo.store(memoKey, tuple(moveSeqList))
         
         
         
             
                     
             
-    def searchMoves(self, startingCoords: tuple[int, int], board: list[list[str]], targetScore: int, isAdjacent: bool = False) -> set[tuple[tuple[int, int], tuple[int, int]]]:
+    def dagRecursive(self, board: list[list[str]], moveIndex: int, dag: SolutionDag) -> int:
         """
-        Searches for all possible moves that can be made from the given starting coordinates on the current board
-        that result in the target score. Also searches for parallel plays if isAdjacent is False.
+        Searches the board in the same way as tracebackRecursive, but records each state in the DAG with the moves that
+        lead to states with solutions instead of building the sequences. The DAG doubles as the memo of the search.
+
+        Args:
+            board (list[list[str]]): 2d list representing the current state of the board, set up with startSearch.
+            moveIndex (int): Index of the moveScores attribute list to get the target score for the current move.
+            dag (SolutionDag): DAG to record states in.
+
+        Returns:
+            int: Number of sequences of the remaining moves from this board.
+        """
+        score: int = self.moveScores[moveIndex]
+        
+        stats = self.stats
+        if stats is not None:
+            stats.clockDepth(moveIndex)
+            stats.nodesPerDepth[moveIndex] += 1
+            stats.maybeEmit()
+        
+        placedMask = self.boardFingerprint(board)
+        node = (placedMask, moveIndex)
+        if score < 0:
+            return dag.addTerminal(node, self.searchBag.remainingValue == -score)
+        
+        if node in dag:
+            if stats is not None:
+                stats.memoHits += 1
+            return dag.count(node)
+        
+        if not self.isFeasible(placedMask, moveIndex):
+            if stats is not None:
+                stats.nodesPruned += 1
+            return dag.addNode(node, [])
+        
+        if self.searchExpired():
+            return 0
+        
+        moveSet = self.searchMoves(board, score, placedMask)
+        if stats is not None:
+            stats.countPlayCalls += len(moveSet)
+        
+        edges = []
+        for move in moveSet:
+            tilesPlayed = self.playSearchMove(move, board)
+            try:
+                self.dagRecursive(board, moveIndex + 1, dag)
+                if stats is not None:
+                    stats.clockDepth(moveIndex)
+                edges.append((move, (self.boardFingerprint(board), moveIndex + 1)))
+            finally:
+                self.takeBackSearchMove(tilesPlayed, board)
+        
+        return dag.addNode(node, edges)
+
+    def searchMoves(self, board: list[list[str]], targetScore: int, placedMask: int = None) -> set[tuple[tuple[int, int], tuple[int, int]]]:
+        """
+        Searches for all moves that can be played on the current board that result in the target score. Candidate
+        moves come from the segment index of the completed game, filtered down to the segments that are playable
+        on this board (see SegmentIndex.candidates). During a search with a score table for this board, the segments worth
+        the target score are looked up in the table instead of being scored. Otherwise, with batch scoring on, every candidate is
+        scored in one vectorized pass (see batch_scoring.BatchScorer). Failing both, segments are skipped without scoring if their score bound is below
+        the target, if they would place more than 7 tiles, or if they would place 7 tiles (a bingo) for a score under 50.
 
         Args:
-            startingCoords (tuple[int, int]): Coordinates to start searching for moves from (any move found will use this tile).
             board (list[list[str]]): 2d list representing current board state.
             targetScore (int): Score to match for moves found.
-            isAdjacent (bool, optional): Whether the current call is adjacent to the original starting coords. Defaults to False.
+            placedMask (int, optional): Fingerprint of the board, if already computed. Defaults to None.
 
         Returns:
             set[tuple[tuple[int, int], tuple[int, int]]]: Set of moves, each represented as a tuple of two pairs of ints, 
             where each pair represents the start and end coordinates of the move.
         """
-        # individual vars for starting coords for convenience and readability
-        xBase, yBase = startingCoords
+        # Set to hold moves found
+        movesPlayedSet = set()
         
-        # bounds default to starting coords
-        leftBound = xBase
-        rightBound = xBase
+        if placedMask is None:
+            placedMask = self.boardFingerprint(board)
         
-        upperBound = yBase
-        lowerBound = yBase
+        # The score table of the running search already knows which segments are worth the target score
+        if self.scoreTable is not None and self.scoreTable.placedMask == placedMask:
+            segments = self.segmentIndex.segments
+            scoring = self.scoreTable.segmentsScoring(targetScore)
+            for i in scoring:
+                if self.segmentIndex.isCandidate(segments[i], placedMask):
+                    movesPlayedSet.add(segments[i].move)
+            if self.stats is not None:
+                self.stats.searchMovesCalls += 1
+                # segments are scored as moves are applied, so the candidates scored are those read from the table
+                self.stats.candidatesScored += len(scoring)
+                self.stats.candidatesMatched += len(movesPlayedSet)
+            return movesPlayedSet
         
-        # Get the location set of tiles yet to be played and the location set of tiles played in completed game
-        antiBoardSet = self.getTileSet(self.makeAntiBoard(board))
-        completedGameSet = self.getTileSet(self.completedGame)
+        # Every candidate is scored at once when NumPy is available
+        if self.useBatchScoring and BatchScorer is not None:
+            batchScorer = self.getBatchScorer()
+            placed = batchScorer.placedSquares(placedMask)
+            candidateIndices = batchScorer.candidates(placed)
+            scores, tilesPlaced = batchScorer.scoreSegments(placed, candidateIndices)
+            matched = (scores == targetScore) & (tilesPlaced <= (7 if targetScore >= 50 else 6))
+            segments = self.segmentIndex.segments
+            movesPlayedSet = {segments[i].move for i in candidateIndices[matched].tolist()}
+            if self.stats is not None:
+                self.stats.searchMovesCalls += 1
+                self.stats.candidatesScored += len(candidateIndices)
+                self.stats.candidatesMatched += len(movesPlayedSet)
+            return movesPlayedSet
         
-        # Set to hold moves found
-        movesPlayedSet = set()            
-        
-        # Check for left edge of board
-        if xBase == 0:
-            leftBound = 0
-        else:
-            # Loop to the left to find the left bound for the move
-            for i in range(xBase - 1, -1, -1):
-                if (i, yBase) in antiBoardSet:
-                    leftBound = i
-                if not (i, yBase) in completedGameSet:
-                    break
-        
-        # Check for right edge of board
-        if xBase == len(board) - 1:
-            rightBound = len(board) - 1
-        else:
-            # Loop to the right to find the right bound for the move
-            for i in range(xBase + 1, len(board)):
-                if (i, yBase) in antiBoardSet:
-                    rightBound = i
-                if not (i, yBase) in completedGameSet:
-                    break
-        
-        # Use bounds to find all horizontal moves
-        for i in range(leftBound, rightBound):
-            for j in range(i + 1, rightBound + 1):
-                # Both tiles must either be in antiBoardSet or be already on the board
-                if (i, yBase) not in antiBoardSet or (j, yBase) not in antiBoardSet and i != xBase and j != xBase:
-                    continue
-                # Base must be within the start and end of the move
-                if not (i <= xBase <= j):
-                    continue
-                # Calculate score and compare to target score
-                # If the score matches, add the move to the set of moves played
-                resultingScore = self.countPlay((i, yBase), (j, yBase), board)
-                if resultingScore == targetScore and ((i, yBase), (j, yBase)) not in movesPlayedSet:
-                    movesPlayedSet.add(((i, yBase), (j, yBase)))
-        
-        # vertical moves
-        
-        # Check for upper edge of board
-        if yBase == 0:
-            upperBound = 0
-        else:
-            # Loop to the top to find the upper bound for the move
-            for i in range(yBase - 1, -1, -1):
-                if (xBase, i) in antiBoardSet:
-                    upperBound = i
-                if not (xBase, i) in completedGameSet:
-                    break
-        
-        # Check for lower edge of board
-        if yBase == len(board[0]) + 1:
-            upperBound = len(board[0]) + 1    
-        else:
-            # Loop to the bottom to find the lower bound for the move
-            for i in range(yBase + 1, len(board[0])):
-                if (xBase, i) in antiBoardSet:
-                    lowerBound = i
-                if not (xBase, i) in completedGameSet:
-                    break
-            
-        for i in range(upperBound, lowerBound):
-            for j in range(i + 1, lowerBound + 1):
-                # Same logic as horizontal moves
-                if ((xBase, i) not in antiBoardSet or (xBase, j) not in antiBoardSet) and i != yBase and j != yBase:
-                    continue
-                if not (i <= yBase <= j):
-                    continue
-                resultingScore = self.countPlay((xBase, i), (xBase, j), board)
-                if resultingScore == targetScore and ((xBase, i), (xBase, j)) not in movesPlayedSet:
-                    movesPlayedSet.add(((xBase, i), (xBase, j)))
-        
-        # check for parallel plays for one square adjacent to the original starting coords
-        if not isAdjacent:
-            # Check for adjacent squares in every direction
-            if xBase > 0 and not self.isTile(board[xBase - 1][yBase]):
-                leftMoveSet = self.searchMoves((xBase - 1, yBase), board, targetScore, True)
-                movesPlayedSet.update(leftMoveSet)
-            if xBase < len(board) - 1 and not self.isTile(board[xBase + 1][yBase]):
-                rightMoveSet = self.searchMoves((xBase + 1, yBase), board, targetScore, True)
-                movesPlayedSet.update(rightMoveSet)
-            if yBase > 0 and not self.isTile(board[xBase][yBase - 1]):
-                upMoveSet = self.searchMoves((xBase, yBase - 1), board, targetScore, True)
-                movesPlayedSet.update(upMoveSet)
-            if yBase < len(board[0]) - 1 and not self.isTile(board[xBase][yBase + 1]):
-                downMoveSet = self.searchMoves((xBase, yBase + 1), board, targetScore, True)
-                movesPlayedSet.update(downMoveSet)
+        # Cross-word scores can only be read if they follow this board
+        crossScores = self.crossScores if self.crossScores is not None and self.crossScores.board is board else None
+        candidates = self.segmentIndex.candidates(placedMask)
+        scored = 0
+        for segment in candidates:
+            if self.scoreBounds[segment.move] < targetScore:
+                continue
+            tilesPlaced = (segment.mask & ~placedMask).bit_count()
+            if tilesPlaced > 7 or (tilesPlaced == 7 and targetScore < 50):
+                continue
+            # Calculate score and compare to target score
+            # If the score matches, add the move to the set of moves played
+            scored += 1
+            if self.scorePlay(segment.move[0], segment.move[1], board, False, crossScores) == targetScore:
+                movesPlayedSet.add(segment.move)
+        
+        if self.stats is not None:
+            self.stats.searchMovesCalls += 1
+            self.stats.countPlayCalls += scored
+            self.stats.candidatesScored += scored
+            self.stats.candidatesMatched += len(movesPlayedSet)
+            self.stats.candidatesPruned += len(candidates) - scored
         
         return movesPlayedSet
         
     
             
-moves = [
+if __name__ == "__main__":
+    moves = [
         ((7,2),(7,8)),
         ((5,9),(8,9)),
         ((4,10),(6,10)),
@@ -251,28 +757,28 @@ moves = [
         ((9,9),(9,11)),
         ((11,3),(11,5)),
         ((0,9),(0,11)),    
-    ]    
+    ]
 
-traceback = ScrabbleTraceback()
+    traceback = ScrabbleTraceback()
 
-traceback.setBoardAndScores("scores1.txt", "tileInfo.json", "board.csv", "Game1.csv")
+    traceback.setBoardAndScores("scores1.txt", "tileInfo.json", "board.csv", "Game1.csv")
 
-# for move in moves[:3]:
-#     v1 = traceback.countPlay(*move)
-#     print(v1)
+    # for move in moves[:3]:
+    #     v1 = traceback.countPlay(*move)
+    #     print(v1)
 
 
 
-# for row in traceback.currentBoard:
-#     print(row)
+    # for row in traceback.currentBoard:
+    #     print(row)
 
-traceback.traceback()
+    traceback.traceback()
 
-# print(traceback.moveScores)
+    # print(traceback.moveScores)
 
-# score, board = traceback.countPlay((7, 2), (7, 8), returnTilesPlayed=False, returnBoard=True)
-# print(score)
-# for row in board:
-#     print(row)
+    # score, board = traceback.countPlay((7, 2), (7, 8), returnTilesPlayed=False, returnBoard=True)
+    # print(score)
+    # for row in board:
+    #     print(row)
 
-# print(traceback.searchMoves((7,7), traceback.currentBoard, 70))
\ No newline at end of file
+    # print(traceback.searchMoves(traceback.currentBoard, 70))
\ No newline at end of file
@@ -0,0 +1,191 @@
+import json
+import os
+import time
+
+CHECKPOINT_VERSION = 1
+
+
+def writeCheckpoint(checkpointFile: str, game, path: list, frames: list[dict], solutions: list[tuple], finished: bool) -> None:
+    """
+    Writes the search frontier and the solutions found so far to a JSON checkpoint file. The file is replaced atomically,
+    so a process killed while writing leaves the previous checkpoint intact.
+
+    Args:
+        checkpointFile (str): Path of the checkpoint file.
+        game (ScrabbleTraceback): Game being searched.
+        path (list): Moves applied to reach the top frame.
+        frames (list[dict]): Stack of frames, one per move applied plus the root.
+        solutions (list[tuple]): Move sequences found so far.
+        finished (bool): Whether the search has explored the whole tree.
+    """
+    checkpoint = {
+        "version": CHECKPOINT_VERSION,
+        "moveScores": game.moveScores,
+        "completedGame": game.completedGame,
+        "finished": finished,
+        "path": path,
+        "frames": frames,
+        "solutions": solutions,
+    }
+    tempFile = f"{checkpointFile}.tmp"
+    with open(tempFile, "w", encoding='utf-8') as file:
+        json.dump(checkpoint, file)
+    os.replace(tempFile, checkpointFile)
+
+
+def loadCheckpoint(checkpointFile: str, game) -> dict:
+    """
+    Reads a checkpoint file written by writeCheckpoint, converting moves back to tuples.
+
+    Args:
+        checkpointFile (str): Path of the checkpoint file.
+        game (ScrabbleTraceback): Game being searched, which must match the game the checkpoint was written for.
+
+    Returns:
+        dict: Checkpoint with path, frames, solutions and finished keys.
+    """
+    with open(checkpointFile, "r", encoding='utf-8') as file:
+        checkpoint = json.load(file)
+
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version in {checkpointFile}")
+    if checkpoint["moveScores"] != game.moveScores or checkpoint["completedGame"] != game.completedGame:
+        raise ValueError(f"Checkpoint {checkpointFile} was written for a different game")
+
+    def toMove(move: list) -> tuple[tuple[int, int], tuple[int, int]]:
+        return tuple(move[0]), tuple(move[1])
+
+    checkpoint["path"] = [toMove(move) for move in checkpoint["path"]]
+    for frame in checkpoint["frames"]:
+        frame["pending"] = [toMove(move) for move in frame["pending"]]
+    checkpoint["solutions"] = [tuple(toMove(move) for move in solution) for solution in checkpoint["solutions"]]
+    return checkpoint
+
+
+def iterativeTraceback(game, checkpointFile: str = None, checkpointInterval: float = 60.0, limit: int = None,
+                       timeout: float = None, resume: bool = False) -> list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]:
+    """
+    Runs the traceback with an explicit stack instead of recursion (see ScrabbleTraceback.iterativeTraceback). Each frame
+    of the stack holds a move index and the moves still to try there, and the moves applied so far form the path down
+    the stack. Frames are searched in the same way as tracebackRecursive, with the same memo, pruning and deduction
+    check, and moves are tried in sorted order so a resumed search continues exactly where it stopped.
+
+    Args:
+        game (ScrabbleTraceback): Game to search.
+        checkpointFile (str, optional): File to write checkpoints to (and resume from). Defaults to None (no checkpoints).
+        checkpointInterval (float, optional): Seconds between checkpoints. Defaults to 60.0.
+        limit (int, optional): Maximum number of move sequences to find. Defaults to None (find all).
+        timeout (float, optional): Seconds after which the search stops. Defaults to None (no time limit).
+        resume (bool, optional): Continue from the checkpoint file instead of starting over. Defaults to False.
+
+    Returns:
+        list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]: Move sequences found, including those found before
+        resuming.
+    """
+    game.memo.clear()
+    game.timedOut = False
+    game.searchStopped = False
+    game.deadline = time.monotonic() + timeout if timeout is not None else None
+    stats = game.stats
+    if stats is not None:
+        stats.reset()
+
+    board = game.startSearch()
+    # coordinates of the tiles placed by each move on the path, used to undo them
+    tilesPlayedStack = []
+
+    if resume:
+        checkpoint = loadCheckpoint(checkpointFile, game)
+        path, frames, solutions = checkpoint["path"], checkpoint["frames"], checkpoint["solutions"]
+        if checkpoint["finished"]:
+            return solutions[:limit] if limit is not None else solutions
+        for move in path:
+            tilesPlayedStack.append(game.playSearchMove(move, board))
+    else:
+        path = []
+        solutions = []
+        frames = []
+        enterState(game, board, 0, path, frames, solutions)
+
+    nextCheckpoint = time.monotonic() + checkpointInterval if checkpointFile else None
+
+    while frames:
+        if limit is not None and len(solutions) >= limit:
+            break
+        if game.searchExpired():
+            break
+        if nextCheckpoint is not None and time.monotonic() >= nextCheckpoint:
+            writeCheckpoint(checkpointFile, game, path, frames, solutions, False)
+            nextCheckpoint = time.monotonic() + checkpointInterval
+        if stats is not None:
+            stats.maybeEmit()
+
+        frame = frames[-1]
+        if not frame["pending"]:
+            # every move from this board has been tried, so its result is complete
+            frames.pop()
+            suffixes = tuple(solution[len(path):] for solution in solutions[frame["solutionsAtEntry"]:])
+            game.memo.store((game.boardFingerprint(board), frame["moveIndex"]), suffixes)
+            if path:
+                path.pop()
+                game.takeBackSearchMove(tilesPlayedStack.pop(), board)
+            continue
+
+        move = frame["pending"].pop()
+        path.append(move)
+        tilesPlayedStack.append(game.playSearchMove(move, board))
+        if not enterState(game, board, frame["moveIndex"] + 1, path, frames, solutions):
+            path.pop()
+            game.takeBackSearchMove(tilesPlayedStack.pop(), board)
+
+    # the checkpoint keeps every solution found, since a memo hit can add several past the limit at once
+    if checkpointFile:
+        writeCheckpoint(checkpointFile, game, path, frames, solutions, not frames)
+    return solutions[:limit] if limit is not None else solutions
+
+
+def enterState(game, board: list[list[str]], moveIndex: int, path: list, frames: list[dict], solutions: list[tuple]) -> bool:
+    """
+    Handles reaching a board at a move index: records solutions for the deduction entry or a memo hit, prunes infeasible
+    boards, and otherwise pushes a frame with the moves to try.
+
+    Args:
+        game (ScrabbleTraceback): Game being searched.
+        board (list[list[str]]): Board reached.
+        moveIndex (int): Index of the moveScores attribute list for the next move.
+        path (list): Moves applied to reach the board.
+        frames (list[dict]): Stack of frames.
+        solutions (list[tuple]): Move sequences found so far.
+
+    Returns:
+        bool: True if a frame was pushed, False if the board is already fully handled.
+    """
+    stats = game.stats
+    if stats is not None:
+        stats.nodesPerDepth[moveIndex] += 1
+
+    score = game.moveScores[moveIndex]
+    if score < 0:
+        # the deduction must match the value of the tiles left unplayed
+        if game.searchBag.remainingValue == -score:
+            solutions.append(tuple(path))
+        return False
+
+    placedMask = game.boardFingerprint(board)
+    memoSuffixes = game.memo.get((placedMask, moveIndex))
+    if memoSuffixes is not None:
+        if stats is not None:
+            stats.memoHits += 1
+        solutions.extend(tuple(path) + suffix for suffix in memoSuffixes)
+        return False
+
+    if not game.isFeasible(placedMask, moveIndex):
+        if stats is not None:
+            stats.nodesPruned += 1
+        game.memo.store((placedMask, moveIndex), ())
+        return False
+
+    # pending moves are popped from the end, so sort in reverse to try them in sorted order
+    pending = sorted(game.searchMoves(board, score, placedMask), reverse=True)
+    frames.append({"moveIndex": moveIndex, "pending": pending, "solutionsAtEntry": len(solutions)})
+    return True
@@ -0,0 +1,335 @@
+import argparse
+import csv
+from typing import NamedTuple
+
+from ScrabbleGame import ScrabbleGame
+from gaddag import Gaddag, SEPARATOR_LABEL
+
+BLANK = "_"
+BLANK_CODE = ord(BLANK)
+# cross-checks are bitmasks over tile codes (ord of the letter), so a square with no tiles next to it across the play
+# allows every letter
+ALL_LETTERS = sum(1 << code for code in range(ord("A"), ord("Z") + 1))
+# characters of each tile code as a letter, and as the letter a blank stands for
+UPPER = [chr(code) for code in range(128)]
+LOWER = [chr(code).lower() for code in range(128)]
+
+
+class Play(NamedTuple):
+    """A legal play for a rack on a board, with its score."""
+    move: tuple[tuple[int, int], tuple[int, int]]
+    # main word formed, with the letters of blanks in lowercase
+    word: str
+    # squares the play places a tile on, with the tile as written on the board ('_' for a blank)
+    tiles: tuple[tuple[tuple[int, int], str], ...]
+    score: int
+
+
+class MoveGenerator:
+    """
+    Generates every legal play for a rack on a live board, using a GADDAG of the word list: plays are built outward
+    from each anchor square (an empty square next to a tile, or the starting square on an empty board), first leftward
+    then rightward, so only prefixes of words are ever tried. Each square's cross-check (the letters that make a valid
+    word across the play) and cross-word sum are found once per board. Plays are scored as they are built with the rules
+    of ScrabbleGame.scorePlay, from the premium layout compiled by ScrabbleGame.getCompactLayout. Blanks on the board
+    are stored as '_' without the letter they stand for, so they match any letter.
+    """
+
+    def __init__(self, game: ScrabbleGame, gaddag: Gaddag, startCoords: tuple[int, int] = None):
+        """
+        Args:
+            game (ScrabbleGame): Game providing the empty board layout, tile values and current board.
+            gaddag (Gaddag): GADDAG of the word list.
+            startCoords (tuple[int, int], optional): Coordinates of the starting square. Defaults to None (the starting
+                square of the game's board layout).
+        """
+        self.game = game
+        self.gaddag = gaddag
+        self.startCoords = startCoords
+
+    def generate(self, rack: str | list[str], board: list[list[str]] = None) -> list[Play]:
+        """
+        Args:
+            rack (str | list[str]): Tiles on the rack, with '_' for a blank.
+            board (list[list[str]], optional): Board to play on. Defaults to the current board of the game.
+
+        Returns:
+            list[Play]: Every legal play, each once (a play through a blank on the board that spells several words is
+            listed with the first of them).
+        """
+        if board is None:
+            board = self.game.currentBoard
+        # number of each tile on the rack, by tile code
+        rackCounts = [0] * 128
+        for tile in rack:
+            rackCounts[ord(tile.upper())] += 1
+
+        height, width = len(board), len(board[0])
+        isTile = self.game.isTile
+        emptyBoard = not any(isTile(tile) for row in board for tile in row)
+        plays = []
+        for vert in (False, True):
+            numLines, lineLength = (width, height) if vert else (height, width)
+            for line in range(numLines):
+                squares = [(i, line) if vert else (line, i) for i in range(lineLength)]
+                self.generateLine(board, squares, vert, rackCounts, emptyBoard, plays)
+        # plays through a blank on the board are found once for each letter the blank can stand for
+        return list({(play.move, play.tiles): play for play in reversed(plays)}.values())[::-1]
+
+    def bestPlays(self, rack: str | list[str], count: int = 10, board: list[list[str]] = None) -> list[Play]:
+        """
+        Args:
+            rack (str | list[str]): Tiles on the rack, with '_' for a blank.
+            count (int, optional): Number of plays to return. Defaults to 10.
+            board (list[list[str]], optional): Board to play on. Defaults to the current board of the game.
+
+        Returns:
+            list[Play]: Highest scoring plays, best first.
+        """
+        return sorted(self.generate(rack, board), key=lambda play: (-play.score, play.move, play.word))[:count]
+
+    def applyPlay(self, play: Play, board: list[list[str]] = None) -> None:
+        """
+        Places the tiles of a play on a board.
+
+        Args:
+            play (Play): Play to apply.
+            board (list[list[str]], optional): Board to place the tiles on. Defaults to the current board of the game.
+        """
+        if board is None:
+            board = self.game.currentBoard
+        for (x, y), tile in play.tiles:
+            board[x][y] = tile
+
+    def crossCheck(self, board: list[list[str]], x: int, y: int, vert: bool) -> tuple[int, int | None]:
+        """
+        Finds the letters that can go on an empty square given the tiles next to it along one orientation.
+
+        Args:
+            board (list[list[str]]): Board to play on.
+            x (int): Row of the square.
+            y (int): Column of the square.
+            vert (bool): Orientation of the cross word (True for vertical).
+
+        Returns:
+            tuple[int, int | None]: Bitmask of the allowed letters (bit ord(letter) for each), and the unmodified score
+            of the tiles next to the square (None if there are none, in which case every letter is allowed).
+        """
+        isTile = self.game.isTile
+        tileValues = self.game.tileValues
+        dx, dy = (1, 0) if vert else (0, 1)
+        before, after = [], []
+        for direction, tiles in ((-1, before), (1, after)):
+            i, j = x + direction * dx, y + direction * dy
+            while 0 <= i < len(board) and 0 <= j < len(board[0]) and isTile(board[i][j]):
+                tiles.append(board[i][j])
+                i, j = i + direction * dx, j + direction * dy
+        if not before and not after:
+            return ALL_LETTERS, None
+
+        # the cross word reversed is the path of the word ending on its last letter: the tiles after the square from
+        # the far end, the letter on the square, the tiles before it from the near end, then the separator
+        gaddag = self.gaddag
+        mask = 0
+        for node in self.followTiles([0], reversed(after)):
+            for label, child in gaddag.edges(node):
+                if label == SEPARATOR_LABEL or mask >> label & 1:
+                    continue
+                for end in self.followTiles([child], before):
+                    separatorNode = gaddag.child(end, SEPARATOR_LABEL)
+                    if separatorNode >= 0 and gaddag.terminals[separatorNode]:
+                        mask |= 1 << label
+                        break
+        return mask, sum(tileValues[tile] for tile in before + after)
+
+    def followTiles(self, nodes: list[int], tiles) -> list[int]:
+        """
+        Args:
+            nodes (list[int]): GADDAG nodes to start from.
+            tiles (Iterable[str]): Tiles to follow, a blank ('_') following every letter.
+
+        Returns:
+            list[int]: Nodes reached.
+        """
+        gaddag = self.gaddag
+        for tile in tiles:
+            if tile == BLANK:
+                nodes = [child for node in nodes for label, child in gaddag.edges(node) if label != SEPARATOR_LABEL]
+            else:
+                nodes = [child for child in (gaddag.child(node, ord(tile)) for node in nodes) if child >= 0]
+            if not nodes:
+                break
+        return nodes
+
+    def generateLine(self, board: list[list[str]], squares: list[tuple[int, int]], vert: bool, rackCounts: list[int],
+                     emptyBoard: bool, plays: list[Play]) -> None:
+        """
+        Adds the plays along one row or column.
+
+        Args:
+            board (list[list[str]]): Board to play on.
+            squares (list[tuple[int, int]]): Coordinates of the squares of the line, in order.
+            vert (bool): True if the line is a column.
+            rackCounts (list[int]): Number of each tile on the rack by tile code (ord of the tile), updated while plays are
+                built and restored after.
+            emptyBoard (bool): True if the board has no tiles, in which case plays must cover the starting square.
+            plays (list[Play]): List to add the plays found to.
+        """
+        game = self.game
+        isTile = game.isTile
+        tileValues = game.tileValues
+        layout = game.getCompactLayout()
+        width = layout.width
+        gaddag = self.gaddag
+        labels, targets, firstEdges, terminals = gaddag.labels, gaddag.targets, gaddag.firstEdges, gaddag.terminals
+        blankValue = tileValues.get(BLANK, 0)
+        # value of each letter by tile code
+        letterValues = [tileValues.get(chr(code), 0) for code in range(128)]
+        length = len(squares)
+
+        tiles = [board[x][y] if isTile(board[x][y]) else None for x, y in squares]
+        if emptyBoard:
+            anchors = [coords == (self.startCoords or layout.startCoords) for coords in squares]
+        else:
+            anchors = [
+                tiles[i] is None and any(
+                    0 <= x + dx < len(board) and 0 <= y + dy < len(board[0]) and isTile(board[x + dx][y + dy])
+                    for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                )
+                for i, (x, y) in enumerate(squares)
+            ]
+        if not any(anchors):
+            return
+
+        crossMasks = [0] * length
+        crossSums: list[int | None] = [None] * length
+        letterMultipliers = [layout.letterMultipliers[x * width + y] for x, y in squares]
+        wordMultipliers = [layout.wordMultipliers[x * width + y] for x, y in squares]
+        for i, (x, y) in enumerate(squares):
+            if tiles[i] is None:
+                crossMasks[i], crossSums[i] = self.crossCheck(board, x, y, not vert)
+        # a single tile with tiles next to it along the row is played as a row, so columns skip it
+        rowNeighbours = [
+            vert and ((y > 0 and isTile(board[x][y - 1])) or (y < len(board[0]) - 1 and isTile(board[x][y + 1])))
+            for x, y in squares
+        ]
+
+        # letter on each square of the play being built and the tiles placed so far, as (position, tile)
+        letters = [""] * length
+        placed: list[tuple[int, str]] = []
+
+        def record(start: int, end: int, mainSum: int, multiplier: int, crossTotal: int) -> None:
+            if not placed or (len(placed) == 1 and rowNeighbours[placed[0][0]]):
+                return
+            bingo = 50 if len(placed) > 6 else 0
+            plays.append(Play(
+                (squares[start], squares[end]),
+                "".join(letters[start:end + 1]),
+                tuple(sorted((squares[position], tile) for position, tile in placed)),
+                mainSum * multiplier + crossTotal + bingo,
+            ))
+
+        rackSize = sum(rackCounts)
+        rackCodes = [code for code in range(len(rackCounts)) if rackCounts[code] and code != BLANK_CODE]
+
+        def extend(position: int, node: int, anchor: int, start: int, leftward: bool,
+                   mainSum: int, multiplier: int, crossTotal: int) -> None:
+            # fills the square at position from a node, then moves on leftward (until the separator) or rightward
+            first, last = firstEdges[node], firstEdges[node + 1]
+            tile = tiles[position]
+            if tile is not None:
+                # a tile on the board is read as is, a blank following every letter
+                if tile == BLANK:
+                    steps = [(targets[i], LOWER[labels[i]], 0, blankValue, 1, 0) for i in range(first, last)
+                             if labels[i] != SEPARATOR_LABEL]
+                else:
+                    i = labels.find(ord(tile), first, last)
+                    steps = [(targets[i], tile, 0, tileValues[tile], 1, 0)] if i >= 0 else []
+            else:
+                # rack tiles must pass the square's cross-check; without a blank, only the letters on the rack are
+                # looked up, otherwise every edge is a candidate
+                crossMask = crossMasks[position]
+                if rackCounts[BLANK_CODE]:
+                    found = [(i, code) for i in range(first, last) for code in (labels[i], BLANK_CODE)
+                             if crossMask >> labels[i] & 1 and rackCounts[code]]
+                else:
+                    found = [(i, code) for i, code in ((labels.find(code, first, last), code) for code in rackCodes
+                             if rackCounts[code] and crossMask >> code & 1) if i >= 0]
+                crossSum = crossSums[position]
+                letterMultiplier = letterMultipliers[position]
+                wordMultiplier = wordMultipliers[position]
+                steps = []
+                for i, code in found:
+                    label = labels[i]
+                    value = (blankValue if code == BLANK_CODE else letterValues[label]) * letterMultiplier
+                    crossScore = 0 if crossSum is None else wordMultiplier * (value + crossSum)
+                    steps.append((targets[i], LOWER[label] if code == BLANK_CODE else UPPER[label], code, value,
+                                  wordMultiplier, crossScore))
+
+            for nextNode, letter, code, value, wordMultiplier, crossScore in steps:
+                letters[position] = letter
+                if code:
+                    rackCounts[code] -= 1
+                    placed.append((position, UPPER[code]))
+                nextSum, nextMultiplier, nextCross = mainSum + value, multiplier * wordMultiplier, crossTotal + crossScore
+
+                if leftward:
+                    # the play can take in the square before this one, or start here and go right from the anchor
+                    before = position - 1
+                    if before >= 0 and tiles[before] is not None:
+                        extend(before, nextNode, anchor, 0, True, nextSum, nextMultiplier, nextCross)
+                    else:
+                        i = labels.find(SEPARATOR_LABEL, firstEdges[nextNode], firstEdges[nextNode + 1])
+                        if i >= 0:
+                            after = anchor + 1
+                            if after >= length or tiles[after] is None:
+                                if terminals[targets[i]] and after - position > 1:
+                                    record(position, after - 1, nextSum, nextMultiplier, nextCross)
+                                if after < length and len(placed) < rackSize:
+                                    extend(after, targets[i], 0, position, False, nextSum, nextMultiplier, nextCross)
+                            else:
+                                extend(after, targets[i], 0, position, False, nextSum, nextMultiplier, nextCross)
+                        # squares before the anchor that are anchors themselves start their own plays
+                        if before >= 0 and not anchors[before] and len(placed) < rackSize:
+                            extend(before, nextNode, anchor, 0, True, nextSum, nextMultiplier, nextCross)
+                else:
+                    after = position + 1
+                    if after >= length or tiles[after] is None:
+                        if terminals[nextNode]:
+                            record(start, position, nextSum, nextMultiplier, nextCross)
+                        if after < length and len(placed) < rackSize:
+                            extend(after, nextNode, 0, start, False, nextSum, nextMultiplier, nextCross)
+                    else:
+                        extend(after, nextNode, 0, start, False, nextSum, nextMultiplier, nextCross)
+
+                if code:
+                    placed.pop()
+                    rackCounts[code] += 1
+
+        for anchor in range(length):
+            if anchors[anchor] and rackSize:
+                extend(anchor, 0, anchor, 0, True, 0, 1, 0)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List the highest scoring plays for a rack on a board.")
+    parser.add_argument("gaddag", help="GADDAG file built from a word list (see gaddag.py)")
+    parser.add_argument("rack", help="tiles on the rack, with _ for a blank")
+    parser.add_argument("--position", default=None, help="CSV file of the tiles on the board (default: empty board)")
+    parser.add_argument("--board", default="board.csv", help="empty board layout CSV file")
+    parser.add_argument("--tiles", default="tileInfo.json", help="tile info JSON file")
+    parser.add_argument("--top", type=int, default=10, help="number of plays to list")
+    args = parser.parse_args()
+
+    game = ScrabbleGame()
+    game.setBoardAndScores(None, args.tiles, args.board)
+    game.currentBoard = [row[:] for row in game.emptyBoard]
+    if args.position:
+        with open(args.position, newline="", encoding='utf-8-sig') as positionFile:
+            for x, row in enumerate(csv.reader(positionFile)):
+                for y, tile in enumerate(row):
+                    if ScrabbleGame.isTile(tile):
+                        game.currentBoard[x][y] = tile
+
+    generator = MoveGenerator(game, Gaddag.load(args.gaddag))
+    for play in generator.bestPlays(args.rack, args.top):
+        print(f"{play.score:4d}  {play.word:15s}  {play.move[0]} -> {play.move[1]}")
@@ -0,0 +1,156 @@
+from typing import Callable
+
+Move = tuple[tuple[int, int], tuple[int, int]]
+
+# a heuristic maps the moves found at a search node to sort keys, lower keys being tried first
+Heuristic = Callable[[object, list[list[str]], int, set[Move]], dict[Move, float]]
+
+
+class MoveOrdering:
+    """
+    Orders the moves tried at each node of the traceback search, so the moves most likely to lead to a solution are
+    tried first. Moves are sorted by the keys of each heuristic in turn, then by the move itself, so the order never
+    depends on set iteration order. Set an ordering as the moveOrdering attribute of a ScrabbleTraceback; any callable
+    with the same signature as __call__ can be used instead.
+    """
+
+    def __init__(self, *heuristics: Heuristic):
+        """
+        Args:
+            *heuristics (Heuristic): Functions taking the game, the board, the move index and the moves found, and
+                returning a sort key for each move. Earlier heuristics take precedence.
+        """
+        self.heuristics = heuristics
+
+    def __call__(self, game, board: list[list[str]], moveIndex: int, moves: set[Move]) -> list[Move]:
+        """
+        Args:
+            game (ScrabbleTraceback): Game being searched.
+            board (list[list[str]]): Board of the node, set up with startSearch.
+            moveIndex (int): Index of the moveScores attribute list for the moves.
+            moves (set[Move]): Moves matching the target score.
+
+        Returns:
+            list[Move]: The moves in the order to try them.
+        """
+        if len(moves) < 2:
+            return list(moves)
+        keys = [heuristic(game, board, moveIndex, moves) for heuristic in self.heuristics]
+        return sorted(moves, key=lambda move: (*(key[move] for key in keys), move))
+
+
+def newSquaresMask(game, placedMask: int, move: Move) -> int:
+    """
+    Args:
+        game (ScrabbleTraceback): Game being searched.
+        placedMask (int): Bitmask of the squares holding a tile.
+        move (Move): Start and end coordinates of the move.
+
+    Returns:
+        int: Bitmask of the squares the move places a tile on.
+    """
+    segment = game.segmentIndex.segmentsByMove.get(move)
+    if segment is not None:
+        return segment.mask & ~placedMask
+    (startX, startY), (endX, endY) = sorted(move)
+    mask = 0
+    for x in range(startX, endX + 1):
+        for y in range(startY, endY + 1):
+            mask |= game.segmentIndex.bit((x, y))
+    return mask & ~placedMask
+
+
+def forcedSquares(game, board: list[list[str]], moveIndex: int, moves: set[Move]) -> dict[Move, float]:
+    """
+    Prefers moves covering forced squares: squares still to fill that only one segment can fill any more (segments
+    whose flank squares hold a tile can never be played again). That segment has to be played at some point, so a
+    move covering the square is likely the right one.
+
+    Returns:
+        dict[Move, float]: Minus the number of forced squares each move covers.
+    """
+    placedMask = game.boardFingerprint(board)
+    unplacedMask = game.segmentIndex.completedMask & ~placedMask
+    seenOnce = 0
+    seenTwice = 0
+    for segment in game.segmentIndex.segments:
+        if segment.flankMask & placedMask:
+            continue
+        fills = segment.mask & unplacedMask
+        if not 0 < fills.bit_count() <= 7:
+            continue
+        seenTwice |= seenOnce & fills
+        seenOnce |= fills
+    forcedMask = seenOnce & ~seenTwice
+    return {move: -(newSquaresMask(game, placedMask, move) & forcedMask).bit_count() for move in moves}
+
+
+def uniqueMatches(game, board: list[list[str]], moveIndex: int, moves: set[Move]) -> dict[Move, float]:
+    """
+    Prefers unique-score matches: moves that no other move matching the target competes with for their squares. When
+    several overlapping moves match, at most one of them can be right at this index.
+
+    Returns:
+        dict[Move, float]: Number of other matching moves placing a tile on a square of each move.
+    """
+    placedMask = game.boardFingerprint(board)
+    newMasks = {move: newSquaresMask(game, placedMask, move) for move in moves}
+    return {move: sum(1 for other in moves if other != move and newMasks[other] & newMasks[move]) for move in moves}
+
+
+def childMoveCounts(game, board: list[list[str]], moveIndex: int, moves: set[Move]) -> dict[Move, int]:
+    """
+    Plays each move and counts the moves matching the next target score, which is 0 for a board that cannot be
+    completed and 1 for a final board whose deduction matches.
+
+    Args:
+        game (ScrabbleTraceback): Game being searched.
+        board (list[list[str]]): Board of the node, set up with startSearch.
+        moveIndex (int): Index of the moveScores attribute list for the moves.
+        moves (set[Move]): Moves matching the target score.
+
+    Returns:
+        dict[Move, int]: Number of moves matching the next target after each move.
+    """
+    counts = {}
+    nextScore = game.moveScores[moveIndex + 1]
+    for move in moves:
+        tilesPlayed = game.playSearchMove(move, board)
+        try:
+            placedMask = game.boardFingerprint(board)
+            if nextScore < 0:
+                counts[move] = int(game.searchBag.remainingValue == -nextScore)
+            elif not game.isFeasible(placedMask, moveIndex + 1):
+                counts[move] = 0
+            else:
+                counts[move] = len(game.searchMoves(board, nextScore, placedMask))
+        finally:
+            game.takeBackSearchMove(tilesPlayed, board)
+    return counts
+
+
+def fewestSegments(game, board: list[list[str]], moveIndex: int, moves: set[Move]) -> dict[Move, float]:
+    """
+    Prefers branches where the next target is matched by the fewest segments, so the search commits to the most
+    constrained continuation. Branches with no continuation come last.
+
+    Returns:
+        dict[Move, float]: Number of moves matching the next target after each move (infinite for none).
+    """
+    return {move: count or float("inf") for move, count in childMoveCounts(game, board, moveIndex, moves).items()}
+
+
+def failFirst(game, board: list[list[str]], moveIndex: int, moves: set[Move]) -> dict[Move, float]:
+    """
+    Fail-first ordering: tries the branches with the fewest continuations first, dead ends included, so failing
+    branches are ruled out before the search goes deep into the others.
+
+    Returns:
+        dict[Move, float]: Number of moves matching the next target after each move.
+    """
+    return childMoveCounts(game, board, moveIndex, moves)
+
+
+# heuristics tuned for finding a first solution quickly
+FIRST_SOLUTION_ORDERING = MoveOrdering(forcedSquares, uniqueMatches, fewestSegments)
+FAIL_FIRST_ORDERING = MoveOrdering(failFirst)
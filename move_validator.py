@@ -0,0 +1,262 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Iterable, Iterator, TextIO
+
+from ScrabbleGame import ScrabbleGame
+from compact_board import CODE_TILES, CompactBoard
+from tile_bag import TileBag
+
+Move = tuple[tuple[int, int], tuple[int, int]]
+
+
+class MoveValidator:
+    """
+    Replays claimed move sequences against the scores of their games, without searching. The board layout and each
+    tile info file are read once, and every game is replayed in place on one compact board (see CompactBoard), so
+    checking a game costs one scoring pass per move. A move must be a straight run of squares that places at least one
+    tile of the completed game, is the whole run of tiles along its line, and covers or touches a tile already placed
+    (the first move must cover the starting square instead), the same conditions as SegmentIndex.candidates. After the
+    moves, the deduction entry of the scores must match the value of the tiles left in the bag, as in the traceback
+    search.
+    """
+
+    def __init__(self, boardFile: str = "board.csv", tileFile: str = "tileInfo.json"):
+        """
+        Args:
+            boardFile (str, optional): CSV file containing the empty board layout. Defaults to "board.csv".
+            tileFile (str, optional): Tile info JSON file for games that do not name one. Defaults to "tileInfo.json".
+        """
+        self.boardFile = boardFile
+        self.tileFile = tileFile
+        # game object and full tile bag for each tile info file, read on first use
+        self.games: dict[str, ScrabbleGame] = {}
+        self.bags: dict[str, TileBag] = {}
+
+    def getGame(self, tileFile: str = None) -> ScrabbleGame:
+        """
+        Args:
+            tileFile (str, optional): Tile info JSON file. Defaults to None (the validator's tile info file).
+
+        Returns:
+            ScrabbleGame: Game object with the board layout and the tile info read, shared by every game using them.
+        """
+        tileFile = tileFile or self.tileFile
+        if tileFile not in self.games:
+            game = ScrabbleGame()
+            game.setEmptyBoard(self.boardFile)
+            game.setTileInfo(tileFile)
+            self.games[tileFile] = game
+            self.bags[tileFile] = TileBag(game.tileCounts, game.tileValues)
+        return self.games[tileFile]
+
+    def validate(self, completedGame: list[list[str]], moveScores: list[int], moves: Iterable[Move], tileFile: str = None) -> dict:
+        """
+        Replays a move sequence and checks each move against its score.
+
+        Args:
+            completedGame (list[list[str]]): 2d list of the completed board.
+            moveScores (list[int]): Score of each move, then the deduction and bonus entries (as in scores1.txt).
+            moves (Iterable[Move]): Start and end coordinates of each move, in order.
+            tileFile (str, optional): Tile info JSON file of the game. Defaults to None (the validator's tile info file).
+
+        Returns:
+            dict: The status ("valid" or "mismatch"), the number of moves replayed, and for a mismatch, the first one:
+            its index in the scores, the move, the reason ("score", "illegal", "extra_move", "missing_move" or
+            "deduction"), the expected and actual scores and the tiles the move placed as [x, y, tile].
+        """
+        game = self.getGame(tileFile)
+        game.setGameData(moveScores, completedGame)
+        layout = game.getCompactLayout()
+        board = CompactBoard(layout)
+        bag = self.bags[tileFile or self.tileFile].copy()
+
+        index = 0
+        for move in moves:
+            move = (tuple(move[0]), tuple(move[1]))
+            if index >= len(moveScores) or moveScores[index] < 0:
+                return mismatch(index, move, "extra_move", None, None)
+
+            problem = checkMove(board, move)
+            if problem:
+                return mismatch(index, move, "illegal", moveScores[index], -1, problem=problem)
+            score, tilesPlayed = board.applyMove(*move)
+            if score < 0:
+                return mismatch(index, move, "illegal", moveScores[index], -1,
+                                problem="covers a square that is empty on the completed board")
+            tiles = [[*divmod(i, layout.width), CODE_TILES[layout.completedTiles[i]]] for i in tilesPlayed]
+            if score != moveScores[index]:
+                return mismatch(index, move, "score", moveScores[index], score, tiles)
+            for tile in tiles:
+                bag.remove(tile[2])
+            index += 1
+
+        if index < len(moveScores):
+            if moveScores[index] >= 0:
+                return mismatch(index, None, "missing_move", moveScores[index], None)
+            if bag.remainingValue != -moveScores[index]:
+                return mismatch(index, None, "deduction", moveScores[index], -bag.remainingValue)
+        return {"status": "valid", "moves": index}
+
+    def validateFiles(self, gameFile: str, scoresFile: str, moves: Iterable[Move], tileFile: str = None) -> dict:
+        """
+        Args:
+            gameFile (str): CSV file containing the completed board.
+            scoresFile (str): TXT file containing scores for each move.
+            moves (Iterable[Move]): Start and end coordinates of each move, in order.
+            tileFile (str, optional): Tile info JSON file of the game. Defaults to None (the validator's tile info file).
+
+        Returns:
+            dict: Result of validate.
+        """
+        game = self.getGame(tileFile)
+        game.setScores(scoresFile)
+        game.setCompletedGame(gameFile)
+        return self.validate(game.completedGame, game.moveScores, moves, tileFile)
+
+
+def checkMove(board: CompactBoard, move: Move) -> str | None:
+    """
+    Checks that a move is a straight run on the board that is the whole run of tiles along its line, places a tile,
+    and connects to the tiles already placed (or covers the starting square on an empty board).
+
+    Args:
+        board (CompactBoard): Board before the move.
+        move (Move): Start and end coordinates of the move.
+
+    Returns:
+        str | None: Why the move cannot be played, or None if it can.
+    """
+    layout = board.layout
+    tiles = board.tiles
+    (startX, startY), (endX, endY) = move
+    if not (0 <= startX <= endX < layout.height and 0 <= startY <= endY < layout.width):
+        return "not on the board, or ends before it starts"
+    if startX != endX and startY != endY:
+        return "not a straight line"
+
+    vert = startX != endX
+    step, crossStep = (layout.width, 1) if vert else (1, layout.width)
+    # position along the line, and across it, of the first square
+    along, across = (startX, startY) if vert else (startY, startX)
+    lineLength, crossLength = (layout.height, layout.width) if vert else (layout.width, layout.height)
+    first = startX * layout.width + startY
+    last = endX * layout.width + endY
+    squares = range(first, last + 1, step)
+
+    if (along > 0 and tiles[first - step]) or (along + len(squares) < lineLength and tiles[last + step]):
+        return "the tiles on the board extend the word past its ends"
+    if all(tiles[i] for i in squares):
+        return "places no tiles"
+
+    if not any(tiles):
+        startIndex = layout.startCoords[0] * layout.width + layout.startCoords[1]
+        if startIndex not in squares:
+            return "does not cover the starting square"
+        return None
+    touching = list(squares)
+    if across > 0:
+        touching += [i - crossStep for i in squares]
+    if across < crossLength - 1:
+        touching += [i + crossStep for i in squares]
+    if not any(tiles[i] for i in touching):
+        return "does not connect to the tiles on the board"
+    return None
+
+
+def mismatch(index: int, move: Move | None, reason: str, expected: int | None, actual: int | None,
+             tiles: list[list] = None, problem: str = None) -> dict:
+    """
+    Returns:
+        dict: Result of MoveValidator.validate for a game whose first mismatch is at the given score index.
+    """
+    first = {
+        "index": index,
+        "move": [list(move[0]), list(move[1])] if move else None,
+        "reason": reason,
+        "expected": expected,
+        "actual": actual,
+        "tiles": tiles or [],
+    }
+    if problem:
+        first["problem"] = problem
+    return {"status": "mismatch", "moves": index, "mismatch": first}
+
+
+def iterMoveManifest(manifestFile: str) -> Iterator[dict]:
+    """
+    Reads a JSON Lines manifest one game at a time. Each line is an object with "game" (completed board CSV), "scores"
+    and "moves" (list of [[startX, startY], [endX, endY]]) keys, and optional "tiles" (tile info JSON) and "name" keys,
+    as in batch_traceback.loadManifest. Relative paths are taken from the manifest's directory.
+
+    Args:
+        manifestFile (str): Path of the manifest.
+
+    Yields:
+        dict: Game with name, gameFile, scoresFile, tileFile (None if not given) and moves keys.
+    """
+    directory = os.path.dirname(os.path.abspath(manifestFile))
+    with open(manifestFile, "r", encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            gameFile = os.path.join(directory, entry["game"])
+            yield {
+                "name": entry.get("name", os.path.splitext(os.path.basename(gameFile))[0]),
+                "gameFile": gameFile,
+                "scoresFile": os.path.join(directory, entry["scores"]),
+                "tileFile": os.path.join(directory, entry["tiles"]) if entry.get("tiles") else None,
+                "moves": entry["moves"],
+            }
+
+
+def validateGames(games: Iterable[dict], output: TextIO, boardFile: str = "board.csv", tileFile: str = "tileInfo.json") -> dict[str, int]:
+    """
+    Validates the move sequences of many games, writing one JSON line per game to the output as it is checked. Games
+    are read one at a time, so memory does not grow with the number of games.
+
+    Args:
+        games (Iterable[dict]): Games with name, gameFile, scoresFile, moves and optionally tileFile keys (see
+            iterMoveManifest).
+        output (TextIO): Stream to write the results to.
+        boardFile (str, optional): CSV file containing the empty board layout. Defaults to "board.csv".
+        tileFile (str, optional): Tile info JSON file for games that do not name one. Defaults to "tileInfo.json".
+
+    Returns:
+        dict[str, int]: Number of games with each status ("valid", "mismatch" or "error").
+    """
+    validator = MoveValidator(boardFile, tileFile)
+    statusCounts = {}
+    for game in games:
+        result = {"name": game["name"]}
+        try:
+            result.update(validator.validateFiles(game["gameFile"], game["scoresFile"], game["moves"], game.get("tileFile")))
+        except Exception as error:
+            result.update({"status": "error", "error": f"{type(error).__name__}: {error}"})
+        statusCounts[result["status"]] = statusCounts.get(result["status"], 0) + 1
+        output.write(json.dumps(result) + "\n")
+    output.flush()
+    return statusCounts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check claimed move sequences against the scores of their games, "
+                                                 "writing one JSON line per game.")
+    parser.add_argument("manifest", help='JSON Lines manifest of games with "game", "scores" and "moves" keys')
+    parser.add_argument("--board", default="board.csv", help="empty board layout CSV file")
+    parser.add_argument("--tiles", default="tileInfo.json", help="tile info JSON file for games that do not name one")
+    parser.add_argument("--output", default=None, help="JSON Lines file to write the results to (default: stdout)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    outputFile = open(args.output, "w", encoding='utf-8') if args.output else sys.stdout
+    try:
+        counts = validateGames(iterMoveManifest(args.manifest), outputFile, args.board, args.tiles)
+    finally:
+        if args.output:
+            outputFile.close()
+    print(", ".join(f"{count} {status}" for status, count in sorted(counts.items())) +
+          f" in {time.perf_counter() - start:.2f}s", file=sys.stderr)
@@ -0,0 +1,337 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+from itertools import chain, repeat
+
+from ScrabbleGame import ScrabbleGame
+from board_layout import BoardLayout
+from compact_board import CODE_TILES, TILE_CODES, EMPTY
+
+MAGIC = b"SCRB"
+FORMAT_VERSION = 1
+
+# magic, format version, board height and width, scores per record, number of records, offset of the metadata
+HEADER = struct.Struct("<4sHBBHIQ")
+
+# completed games are decoded with a translation table from tile codes to characters, empty squares becoming 'x'
+DECODE_TABLE = bytes(ord(tile) if code else ord("x") for code, tile in enumerate(CODE_TILES)) + bytes(256 - len(CODE_TILES))
+
+
+def recordStruct(height: int, width: int, maxScores: int) -> struct.Struct:
+    """
+    Args:
+        height (int): Number of rows of the board.
+        width (int): Number of columns of the board.
+        maxScores (int): Number of score slots in each record.
+
+    Returns:
+        struct.Struct: Layout of one game record: a tile code per square, the premium layout ID, the tile set ID,
+        the number of scores used and the score slots.
+    """
+    return struct.Struct(f"<{height * width}sHHH{maxScores}h")
+
+
+class PackedCorpusWriter:
+    """
+    Writes games to a packed corpus file: a header, one fixed-width record per game, and a JSON footer holding the
+    premium layouts and tile sets the records refer to by ID. Layouts and tile sets are stored once however many games
+    use them.
+    """
+
+    def __init__(self, path: str, height: int = 15, width: int = 15, maxScores: int = 64):
+        """
+        Args:
+            path (str): Path of the corpus file to write.
+            height (int, optional): Number of rows of the board. Defaults to 15.
+            width (int, optional): Number of columns of the board. Defaults to 15.
+            maxScores (int, optional): Most scores a game can have, including the deduction entries. Defaults to 64.
+        """
+        self.path = path
+        self.height = height
+        self.width = width
+        self.maxScores = maxScores
+        self.record = recordStruct(height, width, maxScores)
+        self.layouts: list[list[list[str]]] = []
+        self.tileSets: list[dict[str, dict[str, int]]] = []
+        self.recordCount = 0
+        # files already read by addGameFiles, mapped to the ID of their layout or tile set
+        self.layoutFiles: dict[str, int] = {}
+        self.tileFiles: dict[str, int] = {}
+
+        self.file = open(path, "wb")
+        self.file.write(bytes(HEADER.size))
+
+    def __enter__(self) -> "PackedCorpusWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def addLayout(self, emptyBoard: list[list[str]]) -> int:
+        """
+        Args:
+            emptyBoard (list[list[str]]): 2d list of the empty board layout.
+
+        Returns:
+            int: ID of the layout (the existing one if the same layout was already added).
+        """
+        if emptyBoard in self.layouts:
+            return self.layouts.index(emptyBoard)
+        self.layouts.append(emptyBoard)
+        return len(self.layouts) - 1
+
+    def addTileSet(self, tileInfo: dict[str, dict[str, int]]) -> int:
+        """
+        Args:
+            tileInfo (dict[str, dict[str, int]]): Dictionary mapping each tile to a dict with "value" and "count" keys.
+
+        Returns:
+            int: ID of the tile set (the existing one if the same tile set was already added).
+        """
+        if tileInfo in self.tileSets:
+            return self.tileSets.index(tileInfo)
+        self.tileSets.append(tileInfo)
+        return len(self.tileSets) - 1
+
+    def addGame(self, completedGame: list[list[str]], moveScores: list[int], layoutId: int = 0, tileSetId: int = 0) -> int:
+        """
+        Appends a game record.
+
+        Args:
+            completedGame (list[list[str]]): 2d list of the completed board.
+            moveScores (list[int]): Score of each move.
+            layoutId (int, optional): ID of the premium layout (see addLayout). Defaults to 0.
+            tileSetId (int, optional): ID of the tile set (see addTileSet). Defaults to 0.
+
+        Returns:
+            int: Index of the game in the corpus.
+        """
+        if len(completedGame) != self.height or any(len(row) != self.width for row in completedGame):
+            raise ValueError(f"Completed game is not {self.height}x{self.width}")
+        if len(moveScores) > self.maxScores:
+            raise ValueError(f"Game has {len(moveScores)} scores, more than the {self.maxScores} a record holds")
+        if not (0 <= layoutId < len(self.layouts) and 0 <= tileSetId < len(self.tileSets)):
+            raise ValueError(f"Unknown layout ID {layoutId} or tile set ID {tileSetId}")
+
+        tiles = bytes(map(TILE_CODES.get, chain.from_iterable(completedGame), repeat(EMPTY)))
+        scores = list(moveScores) + [0] * (self.maxScores - len(moveScores))
+        self.file.write(self.record.pack(tiles, layoutId, tileSetId, len(moveScores), *scores))
+        self.recordCount += 1
+        return self.recordCount - 1
+
+    def addGameFiles(self, gameFile: str, scoresFile: str, boardFile: str = "board.csv", tileFile: str = "tileInfo.json") -> int:
+        """
+        Converts a game stored as CSV/TXT/JSON files and appends it. Each board and tile info file is only read once.
+
+        Args:
+            gameFile (str): CSV file containing the completed board.
+            scoresFile (str): TXT file containing scores for each move.
+            boardFile (str, optional): CSV file containing the empty board layout. Defaults to "board.csv".
+            tileFile (str, optional): JSON file containing tile values and counts. Defaults to "tileInfo.json".
+
+        Returns:
+            int: Index of the game in the corpus.
+        """
+        game = ScrabbleGame()
+        if boardFile not in self.layoutFiles:
+            game.setEmptyBoard(boardFile)
+            self.layoutFiles[boardFile] = self.addLayout(game.emptyBoard)
+        if tileFile not in self.tileFiles:
+            with open(tileFile, "r", encoding='utf-8') as file:
+                self.tileFiles[tileFile] = self.addTileSet(json.load(file))
+
+        game.setScores(scoresFile)
+        game.setCompletedGame(gameFile)
+        return self.addGame(game.completedGame, game.moveScores, self.layoutFiles[boardFile], self.tileFiles[tileFile])
+
+    def close(self) -> None:
+        """Writes the layouts and tile sets after the records and fills in the header."""
+        if self.file.closed:
+            return
+        metaOffset = self.file.tell()
+        self.file.write(json.dumps({"layouts": self.layouts, "tileSets": self.tileSets}).encode('utf-8'))
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.height, self.width, self.maxScores, self.recordCount, metaOffset))
+        self.file.close()
+
+
+class PackedCorpus:
+    """
+    Read-only view of a packed corpus file written by PackedCorpusWriter. The file is memory-mapped, so opening it only
+    reads the header and the layouts and tile sets; a record is decoded when its game is requested. Games of the corpus
+    share the layout and tile info objects of their IDs instead of each having their own copies.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of the corpus file.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.buffer)
+
+        magic, version, self.height, self.width, self.maxScores, self.recordCount, metaOffset = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a packed game corpus")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported packed corpus version {version} in {path}")
+
+        self.record = recordStruct(self.height, self.width, self.maxScores)
+        self.size = self.height * self.width
+        meta = json.loads(bytes(self.view[metaOffset:]).decode('utf-8'))
+        self.layouts: list[list[list[str]]] = meta["layouts"]
+        self.tileSets: list[dict[str, dict[str, int]]] = meta["tileSets"]
+        # tile values, counts and bag of each tile set, parsed on first use and shared by the games using it
+        self.tileData: dict[int, tuple[dict[str, int], dict[str, int], list[str]]] = {}
+        # compiled board layout of each layout, built on first use and shared by the games using it
+        self.boardLayouts: dict[int, BoardLayout] = {}
+
+    def __len__(self) -> int:
+        return self.recordCount
+
+    def __iter__(self):
+        for i in range(self.recordCount):
+            yield self.game(i)
+
+    def __enter__(self) -> "PackedCorpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.view.release()
+        self.buffer.close()
+
+    def recordOffset(self, i: int) -> int:
+        """
+        Args:
+            i (int): Index of the game.
+
+        Returns:
+            int: Byte offset of the game's record in the file.
+        """
+        if not 0 <= i < self.recordCount:
+            raise IndexError(f"Game index {i} out of range for {self.recordCount} games")
+        return HEADER.size + i * self.record.size
+
+    def tiles(self, i: int) -> bytes:
+        """
+        Args:
+            i (int): Index of the game.
+
+        Returns:
+            bytes: Tile code of each square of the completed board, copied out of the file so it outlives the corpus.
+        """
+        offset = self.recordOffset(i)
+        return self.buffer[offset:offset + self.size]
+
+    def ids(self, i: int) -> tuple[int, int]:
+        """
+        Args:
+            i (int): Index of the game.
+
+        Returns:
+            tuple[int, int]: Premium layout ID and tile set ID of the game.
+        """
+        return struct.unpack_from("<HH", self.buffer, self.recordOffset(i) + self.size)
+
+    def moveScores(self, i: int) -> list[int]:
+        """
+        Args:
+            i (int): Index of the game.
+
+        Returns:
+            list[int]: Score of each move of the game.
+        """
+        offset = self.recordOffset(i) + self.size + 4
+        numScores, = struct.unpack_from("<H", self.buffer, offset)
+        return list(struct.unpack_from(f"<{numScores}h", self.buffer, offset + 2))
+
+    def completedGame(self, i: int) -> list[list[str]]:
+        """
+        Args:
+            i (int): Index of the game.
+
+        Returns:
+            list[list[str]]: 2d list of the completed board, with 'x' for empty squares.
+        """
+        squares = self.tiles(i).translate(DECODE_TABLE).decode('ascii')
+        return [list(squares[x * self.width:(x + 1) * self.width]) for x in range(self.height)]
+
+    def game(self, i: int, game: ScrabbleGame = None) -> ScrabbleGame:
+        """
+        Loads a game of the corpus into a game object, without reading any other file. The game's layout replaces the
+        object's own, so its premiums and starting square are the ones the game was recorded with.
+
+        Args:
+            i (int): Index of the game.
+            game (ScrabbleGame, optional): Object to load the game into, e.g. a ScrabbleTraceback reused across games
+                (its search data is prepared by its setGameData). Defaults to a new ScrabbleGame.
+
+        Returns:
+            ScrabbleGame: The game object.
+        """
+        if game is None:
+            game = ScrabbleGame()
+        layoutId, tileSetId = self.ids(i)
+        if tileSetId not in self.tileData:
+            tileGame = ScrabbleGame()
+            tileGame.setTileInfoData(self.tileSets[tileSetId])
+            self.tileData[tileSetId] = (tileGame.tileValues, tileGame.tileCounts, tileGame.tileBag)
+        if layoutId not in self.boardLayouts:
+            self.boardLayouts[layoutId] = BoardLayout(self.layouts[layoutId])
+        game.setEmptyBoardData(self.layouts[layoutId], self.boardLayouts[layoutId])
+        game.tileValues, game.tileCounts, game.tileBag = self.tileData[tileSetId]
+        game.setGameData(self.moveScores(i), self.completedGame(i))
+        return game
+
+
+def packGames(games: list[dict], path: str, boardFile: str = "board.csv", tileFile: str = "tileInfo.json", maxScores: int = 64) -> int:
+    """
+    Converts games stored as files to a packed corpus.
+
+    Args:
+        games (list[dict]): Games with gameFile and scoresFile keys, and optionally tileFile (see batch_traceback.iterGames).
+        path (str): Path of the corpus file to write.
+        boardFile (str, optional): CSV file containing the empty board layout. Defaults to "board.csv".
+        tileFile (str, optional): Tile info JSON file for games that do not name one. Defaults to "tileInfo.json".
+        maxScores (int, optional): Most scores a game can have. Defaults to 64.
+
+    Returns:
+        int: Number of games written.
+    """
+    layout = ScrabbleGame()
+    layout.setEmptyBoard(boardFile)
+    with PackedCorpusWriter(path, len(layout.emptyBoard), len(layout.emptyBoard[0]), maxScores) as writer:
+        for game in games:
+            writer.addGameFiles(game["gameFile"], game["scoresFile"], boardFile, game.get("tileFile") or tileFile)
+        return writer.recordCount
+
+
+if __name__ == "__main__":
+    from batch_traceback import iterGames
+
+    parser = argparse.ArgumentParser(description="Convert games to a packed corpus file, or describe one.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    packParser = subparsers.add_parser("pack", help="convert a directory or JSON Lines manifest of games")
+    packParser.add_argument("source", help="directory of <name>.csv / <name>_scores.txt games, or JSON Lines manifest")
+    packParser.add_argument("output", help="corpus file to write")
+    packParser.add_argument("--board", default="board.csv", help="empty board layout CSV file")
+    packParser.add_argument("--tiles", default="tileInfo.json", help="tile info JSON file for games that do not name one")
+    packParser.add_argument("--max-scores", type=int, default=64, help="most scores a game can have")
+    infoParser = subparsers.add_parser("info", help="describe a corpus file")
+    infoParser.add_argument("corpus", help="corpus file to read")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        count = packGames(list(iterGames(args.source)), args.output, args.board, args.tiles, args.max_scores)
+        print(f"{count} games written to {os.path.abspath(args.output)}")
+    else:
+        with PackedCorpus(args.corpus) as corpus:
+            print(f"{len(corpus)} games, {corpus.height}x{corpus.width} board, {len(corpus.layouts)} layouts, "
+                  f"{len(corpus.tileSets)} tile sets, {corpus.record.size} bytes per record")
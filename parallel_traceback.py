@@ -0,0 +1,131 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+# Game searched by this worker process, set by initWorker when the process starts
+workerGame = None
+
+
+def expandPrefixes(game, board: list[list[str]], moveIndex: int, depth: int) -> list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]:
+    """
+    Expands the first moves of the search, returning every sequence of up to depth moves that matches the target scores.
+    Sequences shorter than depth end at the deduction entry (they are already complete games). Moves are expanded in
+    sorted order so the result does not depend on set iteration order.
+
+    Args:
+        game (ScrabbleTraceback): Game being searched.
+        board (list[list[str]]): 2d list representing the current state of the board (unchanged afterwards).
+        moveIndex (int): Index of the moveScores attribute list for the next move.
+        depth (int): Number of moves to expand.
+
+    Returns:
+        list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]: Move sequences to search below.
+    """
+    if depth == 0 or game.moveScores[moveIndex] < 0:
+        return [()]
+
+    prefixes = []
+    for move in sorted(game.searchMoves(board, game.moveScores[moveIndex])):
+        _, tilesPlayed = game.applyMove(move[0], move[1], board)
+        prefixes.extend((move,) + prefix for prefix in expandPrefixes(game, board, moveIndex + 1, depth - 1))
+        game.undoMove(tilesPlayed, board)
+    return prefixes
+
+
+def initWorker(game, stopEvent) -> None:
+    """
+    Stores the game searched by this worker process. The game keeps its memo between subtrees, since entries only
+    depend on the board and move index.
+
+    Args:
+        game (ScrabbleTraceback): Game being searched.
+        stopEvent (multiprocessing.Event): Event set by the parent process to stop all workers.
+    """
+    global workerGame
+    workerGame = game
+    workerGame.stopEvent = stopEvent
+
+
+def searchSubtree(prefix: tuple, limit: int = None, deadline: float = None) -> tuple[list[tuple], bool, dict | None]:
+    """
+    Searches for all move sequences starting with the given moves.
+
+    Args:
+        prefix (tuple): Moves played before the subtree.
+        limit (int, optional): Maximum number of move sequences to find. Defaults to None (find all).
+        deadline (float, optional): time.time() after which the search stops. Defaults to None (no time limit).
+
+    Returns:
+        tuple[list[tuple], bool, dict | None]: Complete move sequences found (including the prefix), whether the search
+        timed out, and the search stats (see SearchStats.toDict) if they are enabled.
+    """
+    game = workerGame
+    game.timedOut = False
+    game.searchStopped = False
+    # deadlines are passed as wall clock time, since monotonic clocks are not comparable between processes
+    game.deadline = time.monotonic() + deadline - time.time() if deadline is not None else None
+    if game.stats is not None:
+        game.stats.reset()
+
+    board = game.startSearch()
+    for move in prefix:
+        game.playSearchMove(move, board)
+
+    moveSeqs = []
+    for moveSeq in game.tracebackRecursive(board, len(prefix)):
+        moveSeqs.append(prefix + moveSeq)
+        if limit is not None and len(moveSeqs) >= limit:
+            break
+    return moveSeqs, game.timedOut, game.stats.toDict() if game.stats is not None else None
+
+
+def parallelTraceback(game, workers: int = None, splitDepth: int = 1, limit: int = None, timeout: float = None) -> list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]:
+    """
+    Runs the traceback of a game over a process pool (see ScrabbleTraceback.parallelTraceback). Sets the timedOut
+    attribute of the game if the search ran out of time. If stats are enabled on the game, they are reset and the
+    stats of every worker are merged into them.
+
+    Args:
+        game (ScrabbleTraceback): Game to search.
+        workers (int, optional): Number of worker processes. Defaults to None (one per CPU).
+        splitDepth (int, optional): Number of moves expanded before handing subtrees to workers. Defaults to 1.
+        limit (int, optional): Maximum number of move sequences to find. Defaults to None (find all).
+        timeout (float, optional): Seconds after which the search stops. Defaults to None (no time limit).
+
+    Returns:
+        list[tuple[tuple[tuple[int, int], tuple[int, int]], ...]]: Move sequences found, in order of their first moves.
+    """
+    deadline = time.time() + timeout if timeout is not None else None
+    game.timedOut = False
+    if game.stats is not None:
+        game.stats.reset()
+
+    board = [row[:] for row in game.currentBoard]
+    prefixes = expandPrefixes(game, board, 0, splitDepth)
+
+    context = multiprocessing.get_context()
+    stopEvent = context.Event()
+    moveSeqs = []
+
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=initWorker, initargs=(game, stopEvent)) as executor:
+        futures = [executor.submit(searchSubtree, prefix, limit, deadline) for prefix in prefixes]
+        try:
+            # collect in prefix order so the merged result is deterministic
+            for future in futures:
+                remaining = max(0, deadline - time.time()) if deadline is not None else None
+                subtreeSeqs, timedOut, subtreeStats = future.result(timeout=remaining)
+                game.timedOut = game.timedOut or timedOut
+                if subtreeStats is not None:
+                    game.stats.merge(subtreeStats)
+                moveSeqs.extend(subtreeSeqs)
+                if limit is not None and len(moveSeqs) >= limit:
+                    del moveSeqs[limit:]
+                    break
+        except FutureTimeoutError:
+            game.timedOut = True
+        finally:
+            # stop running subtrees and drop queued ones
+            stopEvent.set()
+            executor.shutdown(cancel_futures=True)
+
+    return moveSeqs
@@ -0,0 +1,69 @@
+from segment_index import SegmentIndex
+
+Move = tuple[tuple[int, int], tuple[int, int]]
+
+
+class PlacementDag:
+    """
+    Order constraints between the squares and segments of a completed game, derived once from the completed board.
+    Every board reached by legal moves is one connected group through the starting square, so the tile on a square
+    can only be placed once every square on all paths to it from the starting square (its dominators) holds a tile.
+    A segment is played after the dominators of its squares outside it, and before the squares flanking it, since the
+    word played must be the whole run of tiles. Segments that would need a flank square placed before them can never
+    be played. Squares are stored as bitmasks in the layout of SegmentIndex.
+    """
+
+    def __init__(self, segmentIndex: SegmentIndex):
+        """
+        Args:
+            segmentIndex (SegmentIndex): Index of the segments of the completed game.
+        """
+        self.segmentIndex = segmentIndex
+
+        # squares that hold a tile no later than each square (indexed as x * width + y), not including the square itself
+        self.dominators: list[int] = [0] * (segmentIndex.height * segmentIndex.width)
+        for square in segmentIndex.squares(segmentIndex.completedMask):
+            remainingMask = segmentIndex.completedMask & ~(1 << square)
+            for cutOff in segmentIndex.squares(remainingMask & ~segmentIndex.reachableMask(remainingMask)):
+                self.dominators[cutOff] |= 1 << square
+
+        # squares that hold a tile before each segment is played, and squares that must still be empty when it is
+        self.requiredMasks: dict[Move, int] = {}
+        self.blockedMasks: dict[Move, int] = {}
+        for segment in segmentIndex.segments:
+            requiredMask = 0
+            for square in segmentIndex.squares(segment.mask):
+                requiredMask |= self.dominators[square]
+            self.requiredMasks[segment.move] = requiredMask & ~segment.mask
+            self.blockedMasks[segment.move] = segment.flankMask
+
+        # segments that must be played both after and before the same square
+        self.deadMoves: set[Move] = {
+            move for move, requiredMask in self.requiredMasks.items() if requiredMask & self.blockedMasks[move]
+        }
+
+    def dependencies(self, coords: tuple[int, int]) -> list[tuple[int, int]]:
+        """
+        Args:
+            coords (tuple[int, int]): Coordinates of a square (x, y).
+
+        Returns:
+            list[tuple[int, int]]: Coordinates of the squares whose tiles are placed no later than the tile on the square.
+        """
+        width = self.segmentIndex.width
+        return [divmod(square, width) for square in self.segmentIndex.squares(self.dominators[coords[0] * width + coords[1]])]
+
+    def allows(self, move: Move, placedMask: int) -> bool:
+        """
+        Args:
+            move (Move): Start and end coordinates of a segment.
+            placedMask (int): Bitmask of the squares holding a tile.
+
+        Returns:
+            bool: False if playing the segment on the board breaks an order constraint.
+        """
+        return (
+            move not in self.deadMoves
+            and not self.requiredMasks[move] & ~placedMask
+            and not self.blockedMasks[move] & placedMask
+        )
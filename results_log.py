@@ -0,0 +1,267 @@
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+import zipfile
+from typing import Iterator
+from xml.sax.saxutils import escape
+
+from ScrabbleGame import ScrabbleGame
+
+Move = tuple[tuple[int, int], tuple[int, int]]
+
+# columns of the results log, following gameLog.xlsx, with one row per move of each reconstruction logged
+LOG_COLUMNS = ["Game", "Solution", "Move number", "PlayerID", "Letters played", "Points", "Starting x", "Ending x",
+               "Starting y", "Ending y", "Tiles played", "Search stats"]
+
+# start and end of the sheet XML, around the rows of the spool file
+SHEET_START = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+               '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>\n')
+SHEET_END = "</sheetData></worksheet>\n"
+
+# parts of the workbook other than its sheet, which never change
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def moveDetails(game: ScrabbleGame, moveSeq: list[Move]) -> list[dict]:
+    """
+    Replays a move sequence with countPlay on the game's current board, from the empty board, to find the score and
+    tiles of each move. The current board is restored afterwards.
+
+    Args:
+        game (ScrabbleGame): Game the moves were reconstructed for.
+        moveSeq (list[Move]): Start and end coordinates of each move.
+
+    Returns:
+        list[dict]: The move, its score and the tiles it placed (as [x, y, tile]) for each move.
+    """
+    currentBoard = game.currentBoard
+    game.currentBoard = [row[:] for row in game.emptyBoard]
+    try:
+        details = []
+        for move in moveSeq:
+            score, tilesPlayed = game.countPlay(tuple(move[0]), tuple(move[1]), returnTilesPlayed=True)
+            details.append({
+                "move": [list(move[0]), list(move[1])],
+                "score": score,
+                "tiles": [[x, y, game.currentBoard[x][y]] for x, y in tilesPlayed],
+            })
+        return details
+    finally:
+        game.currentBoard = currentBoard
+
+
+def logRows(result: dict) -> Iterator[list]:
+    """
+    Args:
+        result (dict): Result of a game with its name, and the move details of each reconstruction in a moveDetails key
+            (see moveDetails and batch_traceback.searchGame). Search stats, if any, are in a stats key.
+
+    Yields:
+        list: Row of the log for each move, in LOG_COLUMNS order. The search stats are only on each game's first row.
+    """
+    stats = json.dumps(result["stats"]) if result.get("stats") is not None else ""
+    for solution, details in enumerate(result.get("moveDetails", ()), 1):
+        for moveNumber, detail in enumerate(details, 1):
+            (startX, startY), (endX, endY) = detail["move"]
+            yield [
+                result["name"],
+                solution,
+                moveNumber,
+                # players alternate, the first move being player 1's
+                2 - moveNumber % 2,
+                "".join(tile for _, _, tile in detail["tiles"]).lower(),
+                detail["score"],
+                startX,
+                endX,
+                startY,
+                endY,
+                " ".join(f"{x},{y}" for x, y, _ in detail["tiles"]),
+                stats if solution == 1 and moveNumber == 1 else "",
+            ]
+
+
+class CsvResultSink:
+    """Appends the moves of each game logged to a CSV file, writing the header only when the file is new."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): CSV file to append to (created if missing).
+        """
+        self.path = path
+        self.file = open(path, "a", newline="", encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        if self.file.tell() == 0:
+            self.writer.writerow(LOG_COLUMNS)
+            self.file.flush()
+
+    def __enter__(self) -> "CsvResultSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def addResult(self, result: dict) -> None:
+        """
+        Args:
+            result (dict): Result of a game (see logRows). It is on disk once this returns.
+        """
+        self.writer.writerows(logRows(result))
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def xlsxRow(values: list) -> str:
+    """
+    Args:
+        values (list): Cell values (numbers or strings).
+
+    Returns:
+        str: Sheet XML of a row holding the values, on one line.
+    """
+    cells = []
+    for value in values:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c><v>{value}</v></c>")
+        elif value != "":
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{escape(str(value))}</t></is></c>')
+        else:
+            cells.append("<c/>")
+    return f"<row>{''.join(cells)}</row>\n"
+
+
+class XlsxResultSink:
+    """
+    Appends the moves of each game logged to an XLSX workbook with one sheet. An XLSX file is a zip archive that cannot
+    be appended to in place, so rows are appended as sheet XML to a spool file next to the workbook (<path>.rows) as
+    each game is logged, and the workbook is rebuilt once, on close, by streaming the spool into a new archive. Neither
+    step holds more than one game's rows in memory, and rows logged by a run that did not close are kept in the spool
+    for the next one. Strings are stored inline, so there is no shared string table to grow.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): XLSX file to append to (created if missing).
+
+        Raises:
+            ValueError: If the workbook exists without a spool file (e.g. a workbook maintained by hand), which would
+                be overwritten.
+        """
+        self.path = path
+        self.spoolPath = f"{path}.rows"
+        if os.path.exists(path) and not os.path.exists(self.spoolPath):
+            raise ValueError(f"{path} was not written by a results log (no {self.spoolPath}), so it cannot be appended to")
+        self.spool = open(self.spoolPath, "a", encoding='utf-8')
+        if self.spool.tell() == 0:
+            self.spool.write(xlsxRow(LOG_COLUMNS))
+            self.spool.flush()
+
+    def __enter__(self) -> "XlsxResultSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def addResult(self, result: dict) -> None:
+        """
+        Args:
+            result (dict): Result of a game (see logRows). It is in the spool file once this returns.
+        """
+        self.spool.writelines(xlsxRow(row) for row in logRows(result))
+        self.spool.flush()
+
+    def close(self) -> None:
+        """Writes the workbook from the spool file, replacing the previous one only once it is complete."""
+        if self.spool.closed:
+            return
+        self.spool.close()
+        tempPath = f"{self.path}.tmp"
+        with zipfile.ZipFile(tempPath, "w", zipfile.ZIP_DEFLATED) as workbook:
+            for name, data in XLSX_PARTS.items():
+                workbook.writestr(name, data)
+            with workbook.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet, \
+                    open(self.spoolPath, "rb") as spool:
+                sheet.write(SHEET_START.encode())
+                shutil.copyfileobj(spool, sheet)
+                sheet.write(SHEET_END.encode())
+        os.replace(tempPath, self.path)
+
+
+def openResultSink(path: str) -> CsvResultSink | XlsxResultSink:
+    """
+    Args:
+        path (str): Log file to append to, as XLSX if it ends in .xlsx and as CSV otherwise.
+
+    Returns:
+        CsvResultSink | XlsxResultSink: Sink appending to the file.
+    """
+    if path.lower().endswith(".xlsx"):
+        return XlsxResultSink(path)
+    return CsvResultSink(path)
+
+
+if __name__ == "__main__":
+    from game_traceback import ScrabbleTraceback
+
+    parser = argparse.ArgumentParser(description="Reconstruct a game and append its move sequences to a CSV or XLSX log.")
+    parser.add_argument("log", help="log file to append to (.xlsx for a workbook, CSV otherwise)")
+    parser.add_argument("--game", default="Game1.csv", help="completed board CSV file")
+    parser.add_argument("--scores", default="scores1.txt", help="scores TXT file")
+    parser.add_argument("--board", default="board.csv", help="empty board layout CSV file")
+    parser.add_argument("--tiles", default="tileInfo.json", help="tile info JSON file")
+    parser.add_argument("--name", default=None, help="name of the game in the log (default: the board file name)")
+    parser.add_argument("--limit", type=int, default=None, help="most move sequences to log")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds allowed for the search")
+    args = parser.parse_args()
+
+    traceback = ScrabbleTraceback(args.scores, args.tiles, args.board, args.game)
+    stats = traceback.enableStats()
+    moveSeqs = list(traceback.iterTraceback(args.limit, args.timeout))
+    with openResultSink(args.log) as sink:
+        sink.addResult({
+            "name": args.name or os.path.splitext(os.path.basename(args.game))[0],
+            "moveDetails": [moveDetails(traceback, moveSeq) for moveSeq in moveSeqs],
+            "stats": stats.toDict(),
+        })
+    print(f"{len(moveSeqs)} move sequences logged to {os.path.abspath(args.log)}", file=sys.stderr)
@@ -0,0 +1,103 @@
+class SegmentScoreTable:
+    """
+    Score of every open segment on the board being searched, indexed by score so the segments worth a target score are a
+    dictionary lookup. When a move is applied, only the segments whose influence mask (their own squares and the
+    perpendicular runs through them) contains a new tile are rescored, and undoing the move restores the previous scores.
+    """
+
+    def __init__(self, game, board: list[list[str]]):
+        """
+        Args:
+            game (ScrabbleTraceback): Game being searched, with its segment index prepared.
+            board (list[list[str]]): 2d list representing the board the search starts from.
+        """
+        self.game = game
+        self.segmentIndex = game.segmentIndex
+        self.segments = game.segmentIndex.segments
+        self.placedMask = game.boardFingerprint(board)
+        self.rescored = 0
+
+        # score of each segment (None if it cannot be played any more) and the segments with each score
+        self.scores: list[int | None] = [None] * len(self.segments)
+        self.byScore: dict[int, set[int]] = {}
+        for i in range(len(self.segments)):
+            self.setScore(i, self.scoreSegment(i, board))
+
+        # for each applied move, the squares it filled and the previous scores of the segments it changed
+        self.undoStack: list[tuple[int, list[tuple[int, int | None]]]] = []
+
+    def scoreSegment(self, i: int, board: list[list[str]]) -> int | None:
+        """
+        Args:
+            i (int): Index of the segment.
+            board (list[list[str]]): 2d list representing the board the table is for.
+
+        Returns:
+            int | None: Score of playing the segment on the board, or None if it has a placed flank square, has no empty
+            square left or would place more than 7 tiles.
+        """
+        segment = self.segments[i]
+        # a segment with a placed flank square stays unplayable until the move placing it is undone
+        if segment.flankMask & self.placedMask or not 0 < (segment.mask & ~self.placedMask).bit_count() <= 7:
+            return None
+        self.rescored += 1
+        crossScores = self.game.crossScores
+        if crossScores is not None and crossScores.board is not board:
+            crossScores = None
+        return self.game.scorePlay(segment.move[0], segment.move[1], board, False, crossScores)
+
+    def setScore(self, i: int, score: int | None) -> None:
+        """
+        Args:
+            i (int): Index of the segment.
+            score (int | None): New score of the segment.
+        """
+        oldScore = self.scores[i]
+        if oldScore == score:
+            return
+        if oldScore is not None:
+            segments = self.byScore[oldScore]
+            segments.discard(i)
+            if not segments:
+                del self.byScore[oldScore]
+        self.scores[i] = score
+        if score is not None:
+            self.byScore.setdefault(score, set()).add(i)
+
+    def applyMove(self, tilesPlayed: list[tuple[int, int]], board: list[list[str]]) -> None:
+        """
+        Rescores the segments affected by a move that has just been applied to the board.
+
+        Args:
+            tilesPlayed (list[tuple[int, int]]): Coordinates of the tiles placed by the move.
+            board (list[list[str]]): 2d list representing the board after the move.
+        """
+        width = self.segmentIndex.width
+        newMask = 0
+        dirty = set()
+        for x, y in tilesPlayed:
+            newMask |= 1 << (x * width + y)
+            dirty.update(self.segmentIndex.segmentsBySquare[x * width + y])
+        self.placedMask |= newMask
+
+        changes = [(i, self.scores[i]) for i in dirty]
+        for i in dirty:
+            self.setScore(i, self.scoreSegment(i, board))
+        self.undoStack.append((newMask, changes))
+
+    def undoMove(self) -> None:
+        """Restores the scores from before the last move applied."""
+        newMask, changes = self.undoStack.pop()
+        self.placedMask &= ~newMask
+        for i, score in changes:
+            self.setScore(i, score)
+
+    def segmentsScoring(self, targetScore: int) -> set[int]:
+        """
+        Args:
+            targetScore (int): Score to look up.
+
+        Returns:
+            set[int]: Indices of the open segments worth exactly the target score (not all of them may be playable).
+        """
+        return self.byScore.get(targetScore, set())
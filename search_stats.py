@@ -0,0 +1,113 @@
+import json
+import time
+from collections import Counter, defaultdict
+from typing import Callable
+
+
+class SearchStats:
+    """
+    Counters describing a traceback search: nodes visited and time spent per move index, move generation and scoring
+    calls, candidates scored and matched, memo hits and prunes. Can be exported as JSON and emitted periodically while
+    a long search runs.
+
+    The time of a move index is the wall time spent in the search nodes at that index, including move generation,
+    applying and taking back moves and memo stores, but not the time spent in the nodes below them or by the consumer
+    of the move sequences, so the times of all move indices add up to the time of the search. Candidates found with a
+    score table are counted as scored when their score is read from it.
+    """
+
+    def __init__(self, emitInterval: float = None, emitCallback: Callable[[str], None] = None):
+        """
+        Args:
+            emitInterval (float, optional): Seconds between periodic emissions during a search. Defaults to None (never emit).
+            emitCallback (Callable[[str], None], optional): Function receiving the JSON stats on each emission. Defaults to print.
+        """
+        self.emitInterval = emitInterval
+        self.emitCallback = emitCallback or print
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears all counters and restarts the clock."""
+        self.nodesPerDepth: Counter[int] = Counter()
+        self.timePerDepth: defaultdict[int, float] = defaultdict(float)
+        self.searchMovesCalls = 0
+        self.countPlayCalls = 0
+        self.candidatesScored = 0
+        self.candidatesMatched = 0
+        self.candidatesPruned = 0
+        self.memoHits = 0
+        self.nodesPruned = 0
+        # move index whose nodes are running and the time it started running (see clockDepth)
+        self.clockIndex: int | None = None
+        self.clockStart = 0.0
+        self.startTime = time.monotonic()
+        self.nextEmit = self.startTime + self.emitInterval if self.emitInterval else None
+
+    def clockDepth(self, moveIndex: int | None) -> None:
+        """
+        Adds the time since the last call to the move index that was running, and starts timing another one.
+
+        Args:
+            moveIndex (int | None): Move index of the search node taking over, or None if the search is handing control
+                to the consumer of its move sequences.
+        """
+        now = time.perf_counter()
+        if self.clockIndex is not None:
+            self.timePerDepth[self.clockIndex] += now - self.clockStart
+        self.clockIndex = moveIndex
+        self.clockStart = now
+
+    def maybeEmit(self) -> None:
+        """Emits the stats if the emit interval has passed since the last emission."""
+        if self.nextEmit is not None and time.monotonic() >= self.nextEmit:
+            self.emitCallback(self.toJson())
+            self.nextEmit = time.monotonic() + self.emitInterval
+
+    def merge(self, other: dict) -> None:
+        """
+        Adds the counters of another search (e.g. from a worker process) to these.
+
+        Args:
+            other (dict): Stats exported with toDict.
+        """
+        for depth, nodes in other["nodesPerDepth"].items():
+            self.nodesPerDepth[int(depth)] += nodes
+        for depth, seconds in other["timePerDepth"].items():
+            self.timePerDepth[int(depth)] += seconds
+        for name in ("searchMovesCalls", "countPlayCalls", "candidatesScored", "candidatesMatched",
+                     "candidatesPruned", "memoHits", "nodesPruned"):
+            setattr(self, name, getattr(self, name) + other[name])
+
+    def toDict(self) -> dict:
+        """
+        Returns:
+            dict: All counters, with per depth counters keyed by move index, and the seconds elapsed since the last reset.
+        """
+        return {
+            "elapsed": time.monotonic() - self.startTime,
+            "nodes": sum(self.nodesPerDepth.values()),
+            "nodesPerDepth": dict(sorted(self.nodesPerDepth.items())),
+            "timePerDepth": dict(sorted(self.timePerDepth.items())),
+            "searchMovesCalls": self.searchMovesCalls,
+            "countPlayCalls": self.countPlayCalls,
+            "candidatesScored": self.candidatesScored,
+            "candidatesMatched": self.candidatesMatched,
+            "candidatesPruned": self.candidatesPruned,
+            "memoHits": self.memoHits,
+            "nodesPruned": self.nodesPruned,
+        }
+
+    def toJson(self) -> str:
+        """
+        Returns:
+            str: The stats from toDict as a JSON string.
+        """
+        return json.dumps(self.toDict())
+
+    def writeJson(self, statsFile: str) -> None:
+        """
+        Args:
+            statsFile (str): Path of the JSON file to write the stats to.
+        """
+        with open(statsFile, "w", encoding='utf-8') as file:
+            json.dump(self.toDict(), file, indent=4)
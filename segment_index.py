@@ -0,0 +1,268 @@
+from typing import NamedTuple
+from ScrabbleGame import ScrabbleGame
+
+
+class Segment(NamedTuple):
+    """
+    A horizontal or vertical run of squares in the completed game that could have been played as one move.
+    Squares are stored as bitmasks, with square (x, y) as bit x * width + y (the same layout as
+    ScrabbleGame.boardFingerprint).
+    """
+    move: tuple[tuple[int, int], tuple[int, int]]
+    mask: int
+    flankMask: int
+    touchMask: int
+    # squares whose tiles can change the score of the segment: its own squares and the perpendicular runs through them
+    influenceMask: int
+
+
+class SegmentIndex:
+    """
+    Index of every candidate segment of a completed game, built once so that move generation for a board
+    state is a filter over bitmasks instead of a scan of the board.
+    """
+
+    def __init__(self, completedGame: list[list[str]], startCoords: tuple[int, int]):
+        """
+        Args:
+            completedGame (list[list[str]]): 2d list representing the completed board.
+            startCoords (tuple[int, int]): Coordinates of the starting square (the first move must cover it).
+        """
+        self.height = len(completedGame)
+        self.width = len(completedGame[0])
+        self.startMask = self.bit(startCoords)
+        
+        # masks used to shift a set of squares to its neighbours without wrapping around the board's edges
+        self.firstColumnMask = sum(self.bit((i, 0)) for i in range(self.height))
+        self.lastColumnMask = sum(self.bit((i, self.width - 1)) for i in range(self.height))
+        # neighbours of each square (indexed as x * width + y)
+        self.neighbourMasks = [self.neighbourMask((i, j)) for i in range(self.height) for j in range(self.width)]
+
+        # bitmask of every square holding a tile in the completed game
+        self.completedMask = 0
+        for i in range(self.height):
+            for j in range(self.width):
+                if self.isCompleted(completedGame, i, j):
+                    self.completedMask |= self.bit((i, j))
+
+        # bitmask of the run of tiles through each square along each orientation (keyed by square and True for vertical)
+        self.runMasks: dict[tuple[tuple[int, int], bool], int] = {}
+        for i in range(self.height):
+            self.addLineRuns(completedGame, [(i, j) for j in range(self.width)], False)
+        for j in range(self.width):
+            self.addLineRuns(completedGame, [(i, j) for i in range(self.height)], True)
+
+        self.segments: list[Segment] = []
+        for i in range(self.height):
+            self.addLineSegments(completedGame, [(i, j) for j in range(self.width)], False)
+        for j in range(self.width):
+            self.addLineSegments(completedGame, [(i, j) for i in range(self.height)], True)
+
+        self.indexSegments()
+
+    def indexSegments(self) -> None:
+        """Builds the lookups of the segments by move and by square, which must follow the segments list."""
+        self.segmentsByMove: dict[tuple[tuple[int, int], tuple[int, int]], Segment] = {segment.move: segment for segment in self.segments}
+
+        # indices of the segments whose influence mask covers each square
+        self.segmentsBySquare: list[list[int]] = [[] for _ in range(self.height * self.width)]
+        for i, segment in enumerate(self.segments):
+            for square in self.squares(segment.influenceMask):
+                self.segmentsBySquare[square].append(i)
+
+    def removeSegments(self, moves: set[tuple[tuple[int, int], tuple[int, int]]]) -> None:
+        """
+        Drops segments that can never be played (see placement_dag.PlacementDag), so no search scores them.
+
+        Args:
+            moves (set[tuple[tuple[int, int], tuple[int, int]]]): Start and end coordinates of the segments to drop.
+        """
+        self.segments = [segment for segment in self.segments if segment.move not in moves]
+        self.indexSegments()
+
+    def addLineRuns(self, completedGame: list[list[str]], line: list[tuple[int, int]], vert: bool) -> None:
+        """
+        Records the run of tiles each square of a row or column belongs to.
+
+        Args:
+            completedGame (list[list[str]]): 2d list representing the completed board.
+            line (list[tuple[int, int]]): Coordinates of the squares of the row or column, in order.
+            vert (bool): True if the line is a column.
+        """
+        run = []
+        for coords in line + [None]:
+            if coords is not None and self.isCompleted(completedGame, *coords):
+                run.append(coords)
+                continue
+            runMask = 0
+            for runCoords in run:
+                runMask |= self.bit(runCoords)
+            for runCoords in run:
+                self.runMasks[(runCoords, vert)] = runMask
+            run = []
+
+    def addLineSegments(self, completedGame: list[list[str]], line: list[tuple[int, int]], vert: bool) -> None:
+        """
+        Adds every segment of two or more squares lying within a run of tiles on one row or column.
+
+        Args:
+            completedGame (list[list[str]]): 2d list representing the completed board.
+            line (list[tuple[int, int]]): Coordinates of the squares of the row or column, in order.
+            vert (bool): True if the line is a column.
+        """
+        for start in range(len(line)):
+            if not self.isCompleted(completedGame, *line[start]):
+                continue
+            mask = self.bit(line[start])
+            touchMask = self.neighbourMask(line[start])
+            influenceMask = mask | self.runMasks[(line[start], not vert)]
+            for end in range(start + 1, len(line)):
+                if not self.isCompleted(completedGame, *line[end]):
+                    break
+                mask |= self.bit(line[end])
+                touchMask |= self.neighbourMask(line[end])
+                influenceMask |= self.bit(line[end]) | self.runMasks[(line[end], not vert)]
+
+                # squares directly before and after the segment in its own line
+                flankMask = 0
+                if start > 0:
+                    flankMask |= self.bit(line[start - 1])
+                if end < len(line) - 1:
+                    flankMask |= self.bit(line[end + 1])
+
+                self.segments.append(Segment(
+                    (line[start], line[end]),
+                    mask,
+                    flankMask & self.completedMask,
+                    touchMask & self.completedMask & ~mask,
+                    influenceMask,
+                ))
+
+    def candidates(self, placedMask: int) -> list[Segment]:
+        """
+        Returns the segments that can be played as the next move on a board. A segment qualifies if it covers at
+        least one square that is still empty, is not directly extended by a tile already on the board (the word
+        played must be the whole run of tiles), and connects to a placed tile (on an empty board, covers the start
+        square instead, see connects).
+
+        Args:
+            placedMask (int): Bitmask of squares that already have a tile (see ScrabbleGame.boardFingerprint).
+
+        Returns:
+            list[Segment]: Segments playable as the next move.
+        """
+        return [segment for segment in self.segments if self.isCandidate(segment, placedMask)]
+
+    def isCandidate(self, segment: Segment, placedMask: int) -> bool:
+        """
+        Checks a single segment against the conditions of candidates.
+
+        Args:
+            segment (Segment): Segment to check.
+            placedMask (int): Bitmask of squares that already have a tile.
+
+        Returns:
+            bool: True if the segment can be played as the next move.
+        """
+        return bool(
+            segment.mask & ~placedMask
+            and not segment.flankMask & placedMask
+            and self.connects(segment, placedMask)
+        )
+
+    def connects(self, segment: Segment, placedMask: int) -> bool:
+        """
+        Args:
+            segment (Segment): Segment to check.
+            placedMask (int): Bitmask of squares that already have a tile.
+
+        Returns:
+            bool: True if the segment covers the start square on an empty board, or covers or touches a placed tile
+            otherwise.
+        """
+        if not placedMask:
+            return bool(segment.mask & self.startMask)
+        return bool((segment.mask | segment.touchMask) & placedMask)
+
+    def bit(self, coords: tuple[int, int]) -> int:
+        """
+        Args:
+            coords (tuple[int, int]): Coordinates of a square (x, y).
+
+        Returns:
+            int: Bitmask with only the given square set.
+        """
+        return 1 << (coords[0] * self.width + coords[1])
+
+    def squares(self, mask: int) -> list[int]:
+        """
+        Args:
+            mask (int): Bitmask of squares.
+
+        Returns:
+            list[int]: Indices (x * width + y) of the squares in the mask.
+        """
+        squares = []
+        while mask:
+            lowest = mask & -mask
+            squares.append(lowest.bit_length() - 1)
+            mask ^= lowest
+        return squares
+
+    def isConnected(self, mask: int) -> bool:
+        """
+        Checks that a set of squares covers the starting square and forms one orthogonally connected group, as every
+        board reached by legal moves does.
+
+        Args:
+            mask (int): Bitmask of squares.
+
+        Returns:
+            bool: True if every square of the mask can be reached from the starting square within the mask.
+        """
+        return self.reachableMask(mask) == mask
+
+    def reachableMask(self, mask: int) -> int:
+        """
+        Args:
+            mask (int): Bitmask of squares.
+
+        Returns:
+            int: Bitmask of the squares of the mask that can be reached from the starting square within the mask (0 if
+            the mask does not cover the starting square).
+        """
+        reached = mask & self.startMask
+        while reached:
+            grown = reached | (
+                (reached << self.width) | (reached >> self.width)
+                | ((reached << 1) & ~self.firstColumnMask) | ((reached >> 1) & ~self.lastColumnMask)
+            ) & mask
+            if grown == reached:
+                break
+            reached = grown
+        return reached
+
+    def neighbourMask(self, coords: tuple[int, int]) -> int:
+        """
+        Args:
+            coords (tuple[int, int]): Coordinates of a square (x, y).
+
+        Returns:
+            int: Bitmask of the squares orthogonally adjacent to the given square.
+        """
+        x, y = coords
+        mask = 0
+        if x > 0:
+            mask |= self.bit((x - 1, y))
+        if x < self.height - 1:
+            mask |= self.bit((x + 1, y))
+        if y > 0:
+            mask |= self.bit((x, y - 1))
+        if y < self.width - 1:
+            mask |= self.bit((x, y + 1))
+        return mask
+
+    @staticmethod
+    def isCompleted(completedGame: list[list[str]], x: int, y: int) -> bool:
+        """Checks if a square holds a tile in the completed game."""
+        return ScrabbleGame.isTile(completedGame[x][y])
@@ -0,0 +1,177 @@
+import random
+from typing import Iterator
+
+# a state of the search: board fingerprint and index of the next move
+Node = tuple[int, int]
+Move = tuple[tuple[int, int], tuple[int, int]]
+
+
+class SolutionDag:
+    """
+    All reconstructions of a game stored as a directed acyclic graph with shared suffixes. Nodes are search states
+    (board fingerprint and move index) and edges are moves, so move orders that reach the same board share everything
+    after it, and memory grows with the number of states rather than the number of solutions. Each node keeps the number
+    of paths from it to the end of the game, which gives the number of solutions without enumerating them and lets
+    paths be indexed or sampled uniformly.
+    """
+
+    def __init__(self, keepEdges: bool = True):
+        """
+        Args:
+            keepEdges (bool, optional): Store the moves between states. Without them, the DAG only counts solutions
+                (see ScrabbleTraceback.countSolutions). Defaults to True.
+        """
+        self.keepEdges = keepEdges
+        self.root: Node | None = None
+        # number of paths from each state searched to the end of the game (0 for dead ends)
+        self.counts: dict[Node, int] = {}
+        # moves from each state with at least one path, in sorted order, with the state each of them leads to
+        self.edges: dict[Node, list[tuple[Move, Node]]] = {}
+        # False if the search stopped before exploring every state, in which case counts are lower bounds
+        self.complete = True
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __contains__(self, node: Node) -> bool:
+        return node in self.counts
+
+    def addNode(self, node: Node, edges: list[tuple[Move, Node]]) -> int:
+        """
+        Records a state once every move from it has been searched.
+
+        Args:
+            node (Node): Board fingerprint and move index of the state.
+            edges (list[tuple[Move, Node]]): Moves from the state that lead to a recorded state, with that state.
+
+        Returns:
+            int: Number of paths from the state to the end of the game.
+        """
+        edges = [edge for edge in sorted(edges) if self.counts.get(edge[1])]
+        count = sum(self.counts[child] for _, child in edges)
+        self.counts[node] = count
+        if self.keepEdges and edges:
+            self.edges[node] = edges
+        return count
+
+    def addTerminal(self, node: Node, valid: bool) -> int:
+        """
+        Records a state at the deduction entry, which ends one path if the deduction matches the tiles left.
+
+        Args:
+            node (Node): Board fingerprint and move index of the state.
+            valid (bool): Whether the deduction matches.
+
+        Returns:
+            int: 1 if the state ends a path, otherwise 0.
+        """
+        self.counts[node] = int(valid)
+        return self.counts[node]
+
+    def count(self, node: Node = None) -> int:
+        """
+        Args:
+            node (Node, optional): State to count from. Defaults to the root.
+
+        Returns:
+            int: Number of paths from the state to the end of the game.
+        """
+        if node is None:
+            node = self.root
+        return self.counts.get(node, 0)
+
+    def numEdges(self) -> int:
+        """
+        Returns:
+            int: Number of moves stored, which is the memory the DAG needs besides its states.
+        """
+        return sum(len(edges) for edges in self.edges.values())
+
+    def paths(self, node: Node = None) -> Iterator[tuple[Move, ...]]:
+        """
+        Enumerates the paths from a state lazily, in sorted move order.
+
+        Args:
+            node (Node, optional): State to start from. Defaults to the root.
+
+        Yields:
+            tuple[Move, ...]: Sequence of moves to the end of the game.
+        """
+        self.requireEdges()
+        if node is None:
+            node = self.root
+        if not self.count(node):
+            return
+        if node not in self.edges:
+            yield ()
+            return
+
+        # explicit stack of the edges left to follow from each state on the current path
+        path: list[Move] = []
+        stack = [iter(self.edges[node])]
+        while stack:
+            edge = next(stack[-1], None)
+            if edge is None:
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+            move, child = edge
+            path.append(move)
+            if child in self.edges:
+                stack.append(iter(self.edges[child]))
+            else:
+                # a state with paths and no moves is the end of the game
+                yield tuple(path)
+                path.pop()
+
+    def path(self, index: int, node: Node = None) -> tuple[Move, ...]:
+        """
+        Finds the path at a given position in the order of paths, without enumerating the ones before it.
+
+        Args:
+            index (int): Position of the path, from 0 to count(node) - 1.
+            node (Node, optional): State to start from. Defaults to the root.
+
+        Returns:
+            tuple[Move, ...]: Sequence of moves to the end of the game.
+        """
+        self.requireEdges()
+        if node is None:
+            node = self.root
+        if not 0 <= index < self.count(node):
+            raise IndexError(f"Path index {index} out of range for {self.count(node)} paths")
+
+        path = []
+        while node in self.edges:
+            for move, child in self.edges[node]:
+                childCount = self.counts[child]
+                if index < childCount:
+                    path.append(move)
+                    node = child
+                    break
+                index -= childCount
+        return tuple(path)
+
+    def sample(self, rng: random.Random = None, node: Node = None) -> tuple[Move, ...]:
+        """
+        Draws a path uniformly at random.
+
+        Args:
+            rng (random.Random, optional): Random number generator. Defaults to the random module.
+            node (Node, optional): State to start from. Defaults to the root.
+
+        Returns:
+            tuple[Move, ...]: Sequence of moves to the end of the game.
+        """
+        rng = rng or random
+        if node is None:
+            node = self.root
+        if not self.count(node):
+            raise ValueError("No path to sample from")
+        return self.path(rng.randrange(self.count(node)), node)
+
+    def requireEdges(self) -> None:
+        """Raises a ValueError if the DAG was built without its edges."""
+        if not self.keepEdges:
+            raise ValueError("Paths are not available from a count-only solution DAG")
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from conftest import ROOT
+from game_traceback import ScrabbleTraceback
+
+pytest.importorskip("numpy")
+
+
+def test_batch_candidates_match_segment_index():
+    traceback = ScrabbleTraceback(os.path.join(ROOT, "scores1.txt"), os.path.join(ROOT, "tileInfo.json"),
+                                  os.path.join(ROOT, "board.csv"), os.path.join(ROOT, "Game1.csv"))
+    batchScorer = traceback.getBatchScorer()
+    segments = traceback.segmentIndex.segments
+    board = traceback.startSearch()
+
+    for move in (None, ((7, 2), (7, 8))):
+        if move is not None:
+            traceback.playSearchMove(move, board)
+        placedMask = traceback.boardFingerprint(board)
+        batchCandidates = {segments[i].move for i in batchScorer.candidates(batchScorer.placedSquares(placedMask)).tolist()}
+        assert batchCandidates == {segment.move for segment in traceback.segmentIndex.candidates(placedMask)}
@@ -0,0 +1,28 @@
+import os
+
+from conftest import ROOT
+from move_validator import MoveValidator
+
+GAME_FILE = os.path.join(ROOT, "Game1.csv")
+SCORES_FILE = os.path.join(ROOT, "scores1.txt")
+
+
+def makeValidator() -> MoveValidator:
+    return MoveValidator(os.path.join(ROOT, "board.csv"), os.path.join(ROOT, "tileInfo.json"))
+
+
+def test_opening_must_cover_start_square():
+    # ((6, 6), (6, 7)) is next to the starting square (7, 7) without covering it
+    result = makeValidator().validateFiles(GAME_FILE, SCORES_FILE, [((6, 6), (6, 7))])
+
+    assert result["status"] == "mismatch"
+    assert result["mismatch"]["reason"] == "illegal"
+    assert result["mismatch"]["problem"] == "does not cover the starting square"
+
+
+def test_opening_covering_start_square_is_checked_for_score():
+    result = makeValidator().validateFiles(GAME_FILE, SCORES_FILE, [((7, 2), (7, 8))])
+
+    assert result["status"] == "mismatch"
+    assert result["mismatch"]["reason"] == "missing_move"
+    assert result["moves"] == 1
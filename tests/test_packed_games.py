@@ -0,0 +1,53 @@
+import csv
+import os
+
+from conftest import ROOT
+from game_traceback import ScrabbleTraceback
+from packed_games import PackedCorpus, packGames
+
+GAME = {"gameFile": os.path.join(ROOT, "Game1.csv"), "scoresFile": os.path.join(ROOT, "scores1.txt")}
+BOARD_FILE = os.path.join(ROOT, "board.csv")
+TILE_FILE = os.path.join(ROOT, "tileInfo.json")
+FIRST_MOVE = ((7, 2), (7, 8))
+
+
+def test_corpus_game_scores_like_file_game(tmp_path):
+    path = str(tmp_path / "games.scrb")
+    packGames([GAME], path, BOARD_FILE, TILE_FILE)
+    fileGame = ScrabbleTraceback(GAME["scoresFile"], TILE_FILE, BOARD_FILE, GAME["gameFile"])
+
+    with PackedCorpus(path) as corpus:
+        game = corpus.game(0)
+        assert game.boardLayout.startCoords == fileGame.boardLayout.startCoords
+        assert game.countPlay(*FIRST_MOVE) == fileGame.moveScores[0]
+
+
+def test_corpus_game_replaces_layout_of_reused_game(tmp_path):
+    # a layout with no premium squares, starting in the corner
+    plainBoard = str(tmp_path / "plain.csv")
+    with open(plainBoard, "w", newline="", encoding="utf-8") as file:
+        csv.writer(file).writerows([["s"] + ["x"] * 14] + [["x"] * 15 for _ in range(14)])
+    path = str(tmp_path / "games.scrb")
+    packGames([GAME], path, plainBoard, TILE_FILE)
+
+    traceback = ScrabbleTraceback(GAME["scoresFile"], TILE_FILE, BOARD_FILE, GAME["gameFile"])
+    with PackedCorpus(path) as corpus:
+        corpus.game(0, traceback)
+    assert traceback.boardLayout.startCoords == (0, 0)
+    assert traceback.segmentIndex.startMask == 1
+    # the first move scores its tiles (and the bingo for 7 of them) without the premium squares of board.csv
+    score, tilesPlayed = traceback.scorePlay(*FIRST_MOVE, traceback.startSearch(), True)
+    assert len(tilesPlayed) == 7
+    assert score == sum(traceback.tileValues[traceback.completedGame[x][y]] for x, y in tilesPlayed) + 50
+    assert traceback.getCompactLayout().startCoords == (0, 0)
+
+
+def test_tiles_outlive_corpus(tmp_path):
+    path = str(tmp_path / "games.scrb")
+    packGames([GAME], path, BOARD_FILE, TILE_FILE)
+
+    with PackedCorpus(path) as corpus:
+        tiles = corpus.tiles(0)
+        completedGame = corpus.completedGame(0)
+    assert len(tiles) == len(completedGame) * len(completedGame[0])
+    assert bytes(tiles).count(0) == sum(row.count("x") for row in completedGame)
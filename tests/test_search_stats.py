@@ -0,0 +1,38 @@
+import os
+import time
+
+from conftest import ROOT
+from game_traceback import ScrabbleTraceback
+
+
+def makeTraceback() -> ScrabbleTraceback:
+    return ScrabbleTraceback(os.path.join(ROOT, "scores1.txt"), os.path.join(ROOT, "tileInfo.json"),
+                             os.path.join(ROOT, "board.csv"), os.path.join(ROOT, "Game1.csv"))
+
+
+def test_time_per_depth_leaves_out_the_consumer():
+    traceback = makeTraceback()
+    stats = traceback.enableStats()
+    pause = 0.05
+    moveSeqs = []
+    for moveSeq in traceback.iterTraceback():
+        moveSeqs.append(moveSeq)
+        time.sleep(pause)
+
+    timePerDepth = stats.toDict()["timePerDepth"]
+    # every move index searched, including the deduction check after the last move, is timed
+    assert sorted(timePerDepth) == list(range(len(moveSeqs[0]) + 1))
+    assert 0 < sum(timePerDepth.values()) < stats.toDict()["elapsed"] - pause * len(moveSeqs)
+
+
+def test_score_table_lookups_count_as_scored():
+    counts = {}
+    for useScoreTable in (True, False):
+        traceback = makeTraceback()
+        traceback.useScoreTable = useScoreTable
+        stats = traceback.enableStats()
+        traceback.countSolutions()
+        counts[useScoreTable] = stats.toDict()
+
+    assert counts[True]["candidatesMatched"] == counts[False]["candidatesMatched"]
+    assert counts[True]["candidatesMatched"] <= counts[True]["candidatesScored"] < counts[False]["candidatesScored"]
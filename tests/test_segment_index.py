@@ -0,0 +1,16 @@
+import os
+
+from conftest import ROOT
+from game_traceback import ScrabbleTraceback
+
+
+def test_first_move_candidates_cover_start_square():
+    traceback = ScrabbleTraceback(os.path.join(ROOT, "scores1.txt"), os.path.join(ROOT, "tileInfo.json"),
+                                  os.path.join(ROOT, "board.csv"), os.path.join(ROOT, "Game1.csv"))
+    segmentIndex = traceback.segmentIndex
+    candidates = segmentIndex.candidates(0)
+
+    assert candidates
+    assert all(segment.mask & segmentIndex.startMask for segment in candidates)
+    # segments only next to the start square are left out
+    assert ((8, 6), (8, 7)) not in {segment.move for segment in candidates}
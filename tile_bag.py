@@ -0,0 +1,102 @@
+from array import array
+from compact_board import TILE_CODES
+
+# one slot per tile: letters A-Z, then the blank ('_')
+NUM_SLOTS = len(TILE_CODES)
+
+
+class TileBag:
+    """
+    Multiset of the tiles not yet placed on the board, stored as a count per tile. Placing or taking back a tile is O(1),
+    and the total value of the remaining tiles is kept up to date as tiles move.
+    """
+
+    def __init__(self, tileCounts: dict[str, int], tileValues: dict[str, int]):
+        """
+        Args:
+            tileCounts (dict[str, int]): Dictionary mapping tile characters to how many of them the full bag holds.
+            tileValues (dict[str, int]): Dictionary mapping tile characters to their values.
+        """
+        # tiles are kept in the order of tileCounts so toList matches the order of ScrabbleGame.tileBag
+        self.tileOrder = [tile for tile in tileCounts if tile in TILE_CODES]
+        self.counts = array('i', [0] * NUM_SLOTS)
+        self.values = array('i', [0] * NUM_SLOTS)
+        for tile in self.tileOrder:
+            self.counts[TILE_CODES[tile] - 1] = tileCounts[tile]
+            self.values[TILE_CODES[tile] - 1] = tileValues.get(tile, 0)
+
+        self.size = sum(self.counts)
+        self.remainingValue = sum(count * value for count, value in zip(self.counts, self.values))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def copy(self) -> "TileBag":
+        bag = TileBag.__new__(TileBag)
+        bag.tileOrder = self.tileOrder
+        bag.counts = array('i', self.counts)
+        bag.values = self.values
+        bag.size = self.size
+        bag.remainingValue = self.remainingValue
+        return bag
+
+    def count(self, tile: str) -> int:
+        """
+        Args:
+            tile (str): Tile character.
+
+        Returns:
+            int: Number of the tile left in the bag.
+        """
+        return max(self.counts[TILE_CODES[tile] - 1], 0)
+
+    def remove(self, tile: str) -> None:
+        """
+        Takes a tile out of the bag (it has been placed on the board). Tiles placed beyond the number in the full bag
+        are tracked as a negative count, so taking them back restores the bag exactly, but they never reduce the size
+        or value of the bag below zero.
+
+        Args:
+            tile (str): Tile character.
+        """
+        slot = TILE_CODES[tile] - 1
+        if self.counts[slot] > 0:
+            self.size -= 1
+            self.remainingValue -= self.values[slot]
+        self.counts[slot] -= 1
+
+    def add(self, tile: str) -> None:
+        """
+        Puts a tile back in the bag (it has been taken back off the board).
+
+        Args:
+            tile (str): Tile character.
+        """
+        slot = TILE_CODES[tile] - 1
+        self.counts[slot] += 1
+        if self.counts[slot] > 0:
+            self.size += 1
+            self.remainingValue += self.values[slot]
+
+    def removeTiles(self, tiles) -> None:
+        """
+        Args:
+            tiles (Iterable[str]): Tile characters placed on the board.
+        """
+        for tile in tiles:
+            self.remove(tile)
+
+    def addTiles(self, tiles) -> None:
+        """
+        Args:
+            tiles (Iterable[str]): Tile characters taken back off the board.
+        """
+        for tile in tiles:
+            self.add(tile)
+
+    def toList(self) -> list[str]:
+        """
+        Returns:
+            list[str]: Tiles left in the bag, with duplicates to represent quantities.
+        """
+        return [tile for tile in self.tileOrder for _ in range(self.counts[TILE_CODES[tile] - 1])]
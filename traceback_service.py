@@ -0,0 +1,557 @@
+import argparse
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+from batch_traceback import searchGame
+from board_layout import BoardLayout
+from game_traceback import ScrabbleTraceback
+
+# Game searched by this worker process and the stop flag of each dispatch slot, set by initServiceWorker when the
+# process starts
+workerGame = None
+workerStopFlags = None
+
+# largest request body accepted, in bytes
+MAX_BODY_SIZE = 1 << 24
+
+# finished jobs kept for status queries by default, oldest evicted first (completed results stay in the on-disk cache)
+MAX_FINISHED_JOBS = 10000
+
+# statuses of jobs that have finished, successfully or not
+FINISHED_STATUSES = {"solved", "no_solution", "timeout", "error", "cancelled"}
+
+
+class SlotStopEvent:
+    """
+    Stop event of one dispatch slot of the service, read from flags shared with the service process. Only is_set is
+    needed by ScrabbleTraceback.searchExpired, and reading a shared byte is cheap enough to do at every search node.
+    """
+
+    def __init__(self, flags, slot: int):
+        """
+        Args:
+            flags (multiprocessing.RawArray): Stop flag of each slot.
+            slot (int): Slot of the job being run.
+        """
+        self.flags = flags
+        self.slot = slot
+
+    def is_set(self) -> bool:
+        return bool(self.flags[self.slot])
+
+
+def initServiceWorker(boardFile: str, tileFile: str, stopFlags) -> None:
+    """
+    Reads the board layout and default tile info once for this worker process, so jobs only bring their own game.
+
+    Args:
+        boardFile (str): CSV file containing the empty board layout.
+        tileFile (str): Default tile info JSON file.
+        stopFlags (multiprocessing.RawArray): Stop flag of each dispatch slot.
+    """
+    global workerGame, workerStopFlags
+    workerGame = ScrabbleTraceback(None, tileFile, boardFile, None)
+    workerGame.enableStats()
+    workerStopFlags = stopFlags
+
+
+def warmUp() -> int:
+    """
+    Returns:
+        int: ID of the worker process, once its initializer has run.
+    """
+    return os.getpid()
+
+
+def runJob(payload: dict, slot: int) -> dict:
+    """
+    Reconstructs the game of one job in a worker process.
+
+    Args:
+        payload (dict): Job inputs with board, scores, tiles, maxMoves and timeout keys (see TracebackService.submit).
+        slot (int): Dispatch slot of the job, whose stop flag cancels the search.
+
+    Returns:
+        dict: Result of the search (see batch_traceback.searchGame), or an error status and message.
+    """
+    game = workerGame
+    game.stopEvent = SlotStopEvent(workerStopFlags, slot)
+    try:
+        game.setTileInfoData(payload["tiles"])
+        game.setGameData(payload["scores"], payload["board"])
+        return searchGame(game, payload["timeout"], payload["maxMoves"])
+    except Exception as error:
+        return {"status": "error", "error": f"{type(error).__name__}: {error}"}
+    finally:
+        game.stopEvent = None
+
+
+class ResultCache:
+    """
+    Results of finished searches on disk, one JSON file per key under a two-character fan-out directory. Files are
+    written to a temporary name and renamed, so a reader never sees a partial result.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Directory holding the cache (created if missing).
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> dict | None:
+        """
+        Args:
+            key (str): Hash of the job inputs.
+
+        Returns:
+            dict | None: Cached result, or None if there is none (or it cannot be read).
+        """
+        try:
+            with open(self.path(key), "r", encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, result: dict) -> None:
+        """
+        Args:
+            key (str): Hash of the job inputs.
+            result (dict): Result to store.
+        """
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tempPath = f"{path}.{os.getpid()}.tmp"
+        with open(tempPath, "w", encoding='utf-8') as file:
+            json.dump(result, file)
+        os.replace(tempPath, path)
+
+
+class Job:
+    """A submitted reconstruction: its inputs, status, result and timings."""
+
+    def __init__(self, jobId: str, key: str, name: str, payload: dict):
+        """
+        Args:
+            jobId (str): ID of the job.
+            key (str): Hash of the job inputs, used as the cache key.
+            name (str): Name given by the client.
+            payload (dict): Inputs sent to the worker (see runJob).
+        """
+        self.id = jobId
+        self.key = key
+        self.name = name
+        self.payload = payload
+        self.status = "queued"
+        self.result = None
+        self.cached = False
+        self.cancelRequested = False
+        self.slot = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.done = asyncio.Event()
+
+    def finish(self, status: str, result: dict = None) -> None:
+        self.status = status
+        self.result = result
+        self.finished = time.time()
+        self.done.set()
+
+    def toDict(self, includeResult: bool = True) -> dict:
+        """
+        Args:
+            includeResult (bool, optional): Include the solutions found and the search stats. Defaults to True.
+
+        Returns:
+            dict: ID, name, key and status of the job, its timings in seconds and, if finished, its result.
+        """
+        now = time.time()
+        job = {
+            "id": self.id,
+            "name": self.name,
+            "key": self.key,
+            "status": self.status,
+            "cached": self.cached,
+            "queueSeconds": (self.started or self.finished or now) - self.submitted,
+            "runSeconds": (self.finished or now) - self.started if self.started else None,
+        }
+        if self.result is not None:
+            job["solutions"] = self.result.get("solutions")
+            if "error" in self.result:
+                job["error"] = self.result["error"]
+            if includeResult:
+                job["moves"] = self.result.get("moves")
+                job["stats"] = self.result.get("stats")
+        return job
+
+
+class TracebackService:
+    """
+    Long-running reconstruction service. Jobs are queued and dispatched to a pool of warm worker processes that have
+    the board layout and tile info already read, at most one job per worker at a time, so each running job has a
+    dispatch slot whose shared stop flag cancels it. Finished searches are cached on disk by a hash of their inputs,
+    so an identical game returns at once, and a game submitted again while its first job is still queued or running
+    joins that job. Only the most recent finished jobs are kept for status queries; an evicted job is no longer found
+    by its ID, but resubmitting its game returns the cached result.
+    """
+
+    def __init__(self, cacheDir: str, boardFile: str = "board.csv", tileFile: str = "tileInfo.json", workers: int = None,
+                 timeout: float = None, maxFinishedJobs: int = MAX_FINISHED_JOBS):
+        """
+        Args:
+            cacheDir (str): Directory of the result cache.
+            boardFile (str, optional): CSV file containing the empty board layout. Defaults to "board.csv".
+            tileFile (str, optional): Tile info JSON file for jobs that do not send one. Defaults to "tileInfo.json".
+            workers (int, optional): Number of worker processes. Defaults to None (one per CPU).
+            timeout (float, optional): Seconds allowed for jobs that do not set one. Defaults to None (no time limit).
+            maxFinishedJobs (int, optional): Number of finished jobs kept for status queries. Defaults to
+                MAX_FINISHED_JOBS.
+        """
+        self.boardFile = boardFile
+        self.tileFile = tileFile
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.cache = ResultCache(cacheDir)
+
+        self.emptyBoard = BoardLayout.fromFile(boardFile).emptyBoard
+        with open(tileFile, "r", encoding='utf-8') as file:
+            self.defaultTiles = json.load(file)
+
+        self.jobs: dict[str, Job] = {}
+        # IDs of the finished jobs still in jobs, oldest first
+        self.finishedJobs: deque[str] = deque()
+        self.maxFinishedJobs = maxFinishedJobs
+        self.jobsEvicted = 0
+        # unfinished jobs by input hash, so resubmissions join them
+        self.activeJobs: dict[str, Job] = {}
+        self.cacheHits = 0
+        self.queue = None
+        self.executor = None
+        self.stopFlags = None
+        self.dispatchers = []
+
+    async def start(self) -> None:
+        """Starts the worker processes (waiting until each has read the layout) and the dispatch slots."""
+        context = multiprocessing.get_context()
+        self.stopFlags = context.RawArray("b", self.workers)
+        self.executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=initServiceWorker,
+                                            initargs=(self.boardFile, self.tileFile, self.stopFlags))
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, warmUp) for _ in range(self.workers)))
+        self.queue = asyncio.Queue()
+        self.dispatchers = [asyncio.create_task(self.dispatch(slot)) for slot in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stops the running jobs and the worker processes."""
+        for slot in range(self.workers):
+            self.stopFlags[slot] = 1
+        for task in self.dispatchers:
+            task.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        self.executor.shutdown(cancel_futures=True)
+
+    def parseInputs(self, request: dict) -> dict:
+        """
+        Checks and normalizes the inputs of a job request.
+
+        Args:
+            request (dict): Request with "board" (completed board as rows of cells, or CSV text) and "scores" (list of
+                scores, or whitespace-separated text) keys, and optional "tiles" (tile info, as in tileInfo.json),
+                "maxMoves" (move sequences to return, default 1) and "timeout" (seconds) keys.
+
+        Raises:
+            ValueError: If an input is missing or malformed.
+
+        Returns:
+            dict: Inputs sent to the worker (see runJob).
+        """
+        board = request.get("board")
+        if isinstance(board, str):
+            board = [row for row in csv.reader(io.StringIO(board.lstrip("\ufeff"))) if row]
+        if not isinstance(board, list) or not all(isinstance(row, list) for row in board):
+            raise ValueError("board must be a list of rows or CSV text")
+        board = [[str(cell) for cell in row] for row in board]
+        if [len(row) for row in board] != [len(row) for row in self.emptyBoard]:
+            raise ValueError("board does not match the size of the board layout")
+
+        scores = request.get("scores")
+        if isinstance(scores, str):
+            scores = scores.split()
+        if not isinstance(scores, list) or not scores:
+            raise ValueError("scores must be a list of scores or whitespace-separated text")
+        scores = [int(score) for score in scores]
+
+        tiles = request.get("tiles") or self.defaultTiles
+        if not isinstance(tiles, dict) or not all(isinstance(info, dict) and {"value", "count"} <= info.keys() for info in tiles.values()):
+            raise ValueError('tiles must map each tile to its "value" and "count"')
+
+        timeout = request.get("timeout", self.timeout)
+        return {
+            "board": board,
+            "scores": scores,
+            "tiles": tiles,
+            "maxMoves": int(request.get("maxMoves", 1)),
+            "timeout": float(timeout) if timeout is not None else None,
+        }
+
+    def inputKey(self, payload: dict) -> str:
+        """
+        Args:
+            payload (dict): Inputs of a job (see parseInputs).
+
+        Returns:
+            str: SHA-256 of everything the result depends on: the board layout, the game, the tile info and the number
+            of move sequences returned. The timeout is left out, since only complete searches are cached.
+        """
+        inputs = {key: payload[key] for key in ("board", "scores", "tiles", "maxMoves")}
+        inputs["layout"] = self.emptyBoard
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+    def submit(self, request: dict) -> Job:
+        """
+        Queues a job, unless its result is cached or an identical job is already queued or running.
+
+        Args:
+            request (dict): Job request (see parseInputs), with an optional "name" key.
+
+        Raises:
+            ValueError: If an input is missing or malformed.
+
+        Returns:
+            Job: The new job (finished at once on a cache hit), or the identical job already queued or running.
+        """
+        payload = self.parseInputs(request)
+        key = self.inputKey(payload)
+        if key in self.activeJobs:
+            return self.activeJobs[key]
+
+        job = Job(uuid.uuid4().hex, key, str(request.get("name", "")), payload)
+        self.jobs[job.id] = job
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cacheHits += 1
+            job.cached = True
+            job.started = job.submitted
+            self.finishJob(job, cached["status"], cached)
+        else:
+            self.activeJobs[key] = job
+            self.queue.put_nowait(job)
+        return job
+
+    def cancel(self, job: Job) -> None:
+        """
+        Cancels a job: a queued job is dropped, and a running job's search is stopped through its slot's stop flag.
+
+        Args:
+            job (Job): Job to cancel. Finished jobs are left as they are.
+        """
+        if job.status in FINISHED_STATUSES:
+            return
+        job.cancelRequested = True
+        if job.status == "queued":
+            self.activeJobs.pop(job.key, None)
+            self.finishJob(job, "cancelled")
+        elif job.slot is not None:
+            self.stopFlags[job.slot] = 1
+
+    async def dispatch(self, slot: int) -> None:
+        """
+        Runs queued jobs one at a time on a worker process, using one dispatch slot.
+
+        Args:
+            slot (int): Slot whose stop flag cancels the running job.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            if job.status != "queued":
+                continue
+            self.stopFlags[slot] = 0
+            job.slot = slot
+            job.status = "running"
+            job.started = time.time()
+            try:
+                result = await loop.run_in_executor(self.executor, runJob, job.payload, slot)
+            except Exception as error:
+                result = {"status": "error", "error": f"{type(error).__name__}: {error}"}
+            finally:
+                job.slot = None
+                self.activeJobs.pop(job.key, None)
+
+            if job.cancelRequested:
+                self.finishJob(job, "cancelled", result)
+            else:
+                if result["status"] in ("solved", "no_solution"):
+                    self.cache.put(job.key, result)
+                self.finishJob(job, result["status"], result)
+
+    def finishJob(self, job: Job, status: str, result: dict = None) -> None:
+        """
+        Finishes a job, evicting the oldest finished jobs beyond maxFinishedJobs.
+
+        Args:
+            job (Job): Job that finished.
+            status (str): Final status of the job.
+            result (dict, optional): Result of the search. Defaults to None.
+        """
+        job.finish(status, result)
+        self.finishedJobs.append(job.id)
+        while len(self.finishedJobs) > self.maxFinishedJobs:
+            del self.jobs[self.finishedJobs.popleft()]
+            self.jobsEvicted += 1
+
+    def serviceStats(self) -> dict:
+        """
+        Returns:
+            dict: Number of workers, jobs queued, jobs kept by status, jobs evicted and cache hits.
+        """
+        statusCounts = {}
+        for job in self.jobs.values():
+            statusCounts[job.status] = statusCounts.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "jobs": dict(sorted(statusCounts.items())),
+            "evicted": self.jobsEvicted,
+            "cacheHits": self.cacheHits,
+        }
+
+    async def handleRequest(self, method: str, path: str, body: bytes) -> tuple[int, object]:
+        """
+        Routes an API request:
+
+            POST   /jobs            submit a job (see parseInputs); add ?wait=1 to answer once it has finished
+            GET    /jobs            list the jobs, without their results
+            GET    /jobs/<id>       status, timings, result and search stats of a job
+            DELETE /jobs/<id>       cancel a job
+            GET    /stats           service counters
+
+        Args:
+            method (str): HTTP method.
+            path (str): Request path, with its query string.
+            body (bytes): Request body (JSON for POST).
+
+        Returns:
+            tuple[int, object]: HTTP status code and JSON response.
+        """
+        path, _, query = path.partition("?")
+        parts = [part for part in path.split("/") if part]
+
+        if parts == ["stats"] and method == "GET":
+            return HTTPStatus.OK, self.serviceStats()
+        if parts == ["jobs"] and method == "GET":
+            return HTTPStatus.OK, [job.toDict(includeResult=False) for job in self.jobs.values()]
+        if parts == ["jobs"] and method == "POST":
+            try:
+                job = self.submit(json.loads(body or b"{}"))
+            except (ValueError, TypeError, AttributeError) as error:
+                return HTTPStatus.BAD_REQUEST, {"error": str(error)}
+            if "wait=1" in query.split("&"):
+                await job.done.wait()
+            return HTTPStatus.OK if job.status in FINISHED_STATUSES else HTTPStatus.ACCEPTED, job.toDict()
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return HTTPStatus.NOT_FOUND, {"error": f"no job {parts[1]}"}
+            if method == "GET":
+                return HTTPStatus.OK, job.toDict()
+            if method == "DELETE":
+                self.cancel(job)
+                return HTTPStatus.OK, job.toDict(includeResult=False)
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not allowed on {path}"}
+        return HTTPStatus.NOT_FOUND, {"error": f"no route for {method} {path}"}
+
+    async def handleConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves one HTTP/1.1 request on a connection, then closes it.
+
+        Args:
+            reader (asyncio.StreamReader): Stream of the request.
+            writer (asyncio.StreamWriter): Stream of the response.
+        """
+        try:
+            try:
+                method, path, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := (await reader.readline()).decode("latin-1").strip()):
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length < 0:
+                    raise ValueError(f"negative Content-Length {length}")
+            except ValueError:
+                status, response = HTTPStatus.BAD_REQUEST, {"error": "malformed request"}
+            else:
+                if length > MAX_BODY_SIZE:
+                    status, response = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "request body too large"}
+                else:
+                    status, response = await self.handleRequest(method.upper(), path, await reader.readexactly(length))
+
+            data = json.dumps(response).encode()
+            writer.write(
+                f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1") + data
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, socketPath: str = None) -> None:
+        """
+        Starts the service and serves the API until cancelled.
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): TCP port to listen on. Defaults to 8765.
+            socketPath (str, optional): Unix socket to listen on instead of TCP. Defaults to None.
+        """
+        await self.start()
+        try:
+            if socketPath:
+                server = await asyncio.start_unix_server(self.handleConnection, socketPath)
+            else:
+                server = await asyncio.start_server(self.handleConnection, host, port)
+            print(f"Serving on {socketPath or f'http://{host}:{port}'} with {self.workers} workers", file=sys.stderr)
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve game reconstructions over a local HTTP API, with a warm worker "
+                                                 "pool and an on-disk result cache.")
+    parser.add_argument("--cache", default=".traceback_cache", help="directory of the result cache")
+    parser.add_argument("--board", default="board.csv", help="empty board layout CSV file")
+    parser.add_argument("--tiles", default="tileInfo.json", help="tile info JSON file for jobs that do not send one")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds allowed for jobs that do not set one")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on")
+    parser.add_argument("--socket", default=None, help="Unix socket to listen on instead of TCP")
+    parser.add_argument("--max-jobs", type=int, default=MAX_FINISHED_JOBS, help="finished jobs kept for status queries")
+    args = parser.parse_args()
+
+    service = TracebackService(args.cache, args.board, args.tiles, args.workers, args.timeout, args.max_jobs)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    """
+    Bounded memo for the traceback search. Maps a search state (board fingerprint and move index) to the
+    result of searching from that state, so that subtrees reached through different move orders are only
+    explored once. Entries are evicted least recently used first once the stored size exceeds the limit.
+    """
+
+    def __init__(self, maxSize: int = 200000):
+        """
+        Args:
+            maxSize (int, optional): Maximum total size of stored entries, where each entry costs one plus the
+            number of moves it stores. Defaults to 200000.
+        """
+        self.maxSize = maxSize
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.table: OrderedDict[tuple[int, int], tuple[tuple[tuple[tuple[int, int], tuple[int, int]], ...], ...]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        return key in self.table
+
+    def get(self, key: tuple[int, int]) -> tuple[tuple[tuple[tuple[int, int], tuple[int, int]], ...], ...] | None:
+        """
+        Looks up the stored result for a search state and marks it as recently used.
+
+        Args:
+            key (tuple[int, int]): Board fingerprint and move index of the state.
+
+        Returns:
+            tuple | None: Tuple of solution suffixes (empty for a dead end), or None if the state is not stored.
+        """
+        suffixes = self.table.get(key)
+        if suffixes is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.table.move_to_end(key)
+        return suffixes
+
+    def store(self, key: tuple[int, int], suffixes: tuple[tuple[tuple[tuple[int, int], tuple[int, int]], ...], ...]) -> None:
+        """
+        Stores the result of searching from a state, evicting the least recently used entries if the table is full.
+        Results larger than the whole table are not stored.
+
+        Args:
+            key (tuple[int, int]): Board fingerprint and move index of the state.
+            suffixes (tuple): Tuple of move sequences completing the game from the state (empty for a dead end).
+        """
+        entrySize = self.entrySize(suffixes)
+        if entrySize > self.maxSize:
+            return
+
+        if key in self.table:
+            self.size -= self.entrySize(self.table.pop(key))
+
+        self.table[key] = suffixes
+        self.size += entrySize
+
+        # evict oldest entries until the table fits again
+        while self.size > self.maxSize:
+            _, evicted = self.table.popitem(last=False)
+            self.size -= self.entrySize(evicted)
+
+    def clear(self) -> None:
+        """Removes all entries and resets the hit and miss counters."""
+        self.table.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def entrySize(suffixes: tuple) -> int:
+        """
+        Size an entry counts against maxSize.
+
+        Args:
+            suffixes (tuple): Stored solution suffixes.
+
+        Returns:
+            int: One plus the total number of moves in the suffixes.
+        """
+        return 1 + sum(len(suffix) for suffix in suffixes)